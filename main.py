@@ -6,33 +6,47 @@ from routes.branchRoutes import branchRoutesBp
 from routes.attendanceRoutes import attendanceBp
 from routes.historyRoutes import historyRoutesBp
 from routes.annualRequestRoutes import annualRequestBp
+from routes.metricsRoutes import metricsBp
 from marshmallow import ValidationError
+from utils.config import Config
+from utils.indexes import ensureAllIndexes
+from utils.clockLog import clockEventLog
+from utils.jwtHandler import loadCurrentUser
+from utils.logger import setupLogging
+from utils.metrics import initMetrics
+from service.attendanceService import AttendanceService
+import logging
+
+setupLogging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+if Config.METRICS_ENABLED:
+    initMetrics(app)
+    if not Config.METRICS_TOKEN:
+        logger.warning("METRICS_ENABLED is set without METRICS_TOKEN, /metrics stays disabled")
+# token cookie di-resolve sekali per request ke flask.g, dipakai @require_roles
+app.before_request(loadCurrentUser)
 
 @app.errorhandler(ValidationError)
 def handle_validation_error(e):
     errors = getattr(e, "messages", str(e))
-    print("====== [ ERRORS VALIDATION] ======")
-    print(errors)
+    logger.warning("Validation error: %s", errors)
     payloadError = {
         "status": False,
         "message": "Validation error",
         "errors": errors.messages
     }
-    print(payloadError)
     return jsonify(payloadError), 400
 
 @app.errorhandler(ValueError)
 def handle_value_error(e):
-    print("====== [ ERRORS VALUE ] ======")
-    print(e)
+    logger.warning("Value error: %s", e)
     return jsonify({"status": False,"message": "Error " + str(e), "error": str(e)}), 400
     
 @app.errorhandler(Exception)
 def error_handler(e):
-    print("====== [ ERRORS ] ======")
-    print("[ERROR] Unexpected error:", e)
+    logger.error("Unexpected error: %s", e, exc_info=e)
     return jsonify({"status": False,"message": "Error " + str(e), "error": str(e)}), 500
     
 @app.route("/uploads/annualAttachment/<filename>", methods=["GET"])
@@ -48,6 +62,18 @@ app.register_blueprint(employeesBp, url_prefix="/api/employees")
 app.register_blueprint(branchRoutesBp, url_prefix="/api/branch")
 app.register_blueprint(historyRoutesBp, url_prefix="/api/history")
 app.register_blueprint(annualRequestBp, url_prefix="/api/annualRequest")
+app.register_blueprint(metricsBp, url_prefix="")
+
+if Config.ENSURE_INDEXES_ON_STARTUP:
+    try:
+        ensureAllIndexes()
+    except Exception as e:
+        logger.warning("Failed to ensure indexes: %s", e)
+
+if Config.CLOCK_BURST_MODE:
+    # event clock in yang belum masuk database (misal proses sebelumnya mati) langsung diterapkan worker
+    clockEventLog.applyBatch = AttendanceService().applyClockEvents
+    clockEventLog.start()
 
 
 
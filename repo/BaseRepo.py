@@ -1,5 +1,10 @@
 from utils.mongoConnect import mongoConnection
+from pymongo import DESCENDING
 from pymongo.errors import PyMongoError
+from utils.pagination import keysetFilter
+import logging
+
+logger = logging.getLogger(__name__)
 
 class BaseRepo:
     """
@@ -22,12 +27,19 @@ class BaseRepo:
 
     METHODS:
     1. setCollection(entity)           → Set MongoDB collection
-    2. insertData(data, Multi)         → Insert document(s)
-    3. getData(id, query)              → Get single document
-    4. getAllData(query)               → Get multiple documents
-    5. getDataById(id)                 → Get document by _id
+    2. insertData(data, Multi, ordered)→ Insert document(s)
+    3. getData(id, query, projection)  → Get single document
+    4. getAllData(query, projection)   → Get multiple documents
+    5. getDataById(id, projection)     → Get document by _id
     6. updateData(data, id, query...)  → Update document(s)
     7. deleteData(id, query, multi)    → Delete document(s)
+    8. aggregate(pipeline)             → Jalankan aggregation pipeline
+    9. ensureIndexes()                 → Buat index yang dideklarasikan di `indexes`
+    10. explainData(query, sort)       → Query plan (explain) untuk sebuah filter
+    11. getPage(query, limit, after)   → Satu halaman data (keyset pagination)
+    12. iterData(query, projection...) → Generator dokumen (streaming, per batch)
+    13. countData(query)               → Jumlah dokumen (count_documents)
+    14. getDataByIds(ids, projection)  → Banyak dokumen dengan satu query `$in`
 
     ERROR HANDLING:
     - PyMongoError: Database-specific errors
@@ -42,18 +54,30 @@ class BaseRepo:
         def __init__(self):
             super().__init__("employees")
         
+        indexes = [IndexModel([("email", ASCENDING)], unique=True)]
+
         def getByEmail(self, email):
             return self.getData(query={"email": email})
     ```
 
+    INDEXES:
+    Setiap subclass mendeklarasikan index collection-nya di atribut class
+    `indexes` (list pymongo.IndexModel). Index dibuat secara idempotent lewat
+    ensureIndexes() / `python -m utils.indexes`.
+
     NOTES:
     - Query menggunakan MongoDB query syntax
+    - Parameter `projection` (dict MongoDB, contoh {"password": 0} atau
+      {"_id": 1}) membatasi field yang dikirim server; None = semua field
     - Multi=True untuk operasi batch
     - _id otomatis di-remove saat update untuk menghindari error
-    - Semua results dari find() di-convert ke list
+    - getAllData() meng-convert hasil find() ke list (semua dokumen di memori);
+      pakai iterData() / countData() kalau hanya perlu iterasi atau jumlah
 
     =================================================================================
     """
+    indexes = []
+
     def __init__(self ,collection):
         try:
             self.collection = None
@@ -73,10 +97,10 @@ class BaseRepo:
         except Exception as e:
             raise Exception("Failed to set Collection", e)
         
-    def insertData(self, validateData, Multi=False):
+    def insertData(self, validateData, Multi=False, ordered=True):
         try:
             if Multi:
-                resultInsert = self.collection.insert_many(validateData)
+                resultInsert = self.collection.insert_many(validateData, ordered=ordered)
             else :
                 resultInsert = self.collection.insert_one(validateData)
             return resultInsert
@@ -84,32 +108,60 @@ class BaseRepo:
             raise PyMongoError("REPO ERROR : Failed to insert data", e)
         except Exception as e:
             raise Exception("REPO ERROR : Failed to insert data", e)
-    def getData(self, id=None, query=None):
+    def getData(self, id=None, query=None, projection=None):
         try:
             if query != None:
-                result =  self.collection.find_one(query)
-                print("--------- result ------------", result)
+                result =  self.collection.find_one(query, projection)
+                logger.debug("--------- result ------------ %s", result)
                 return result
-            result =  self.collection.find_one({"_id": id})
-            print("--------- result ------------", result)
+            result =  self.collection.find_one({"_id": id}, projection)
+            logger.debug("--------- result ------------ %s", result)
             return result
         except PyMongoError as e:
             raise PyMongoError("REPO ERROR : Failed to insert data", e)
         except Exception as e:
             raise Exception("REPO ERROR : Failed to get data in repo", e)
         
-    def getAllData(self, query=None):
+    def getAllData(self, query=None, projection=None):
         try:
             if query != None:
-                result = self.collection.find(query)
+                result = self.collection.find(query, projection)
                 return list(result)
-            result = self.collection.find({})
+            result = self.collection.find({}, projection)
             return list(result)
         except PyMongoError as e:
             raise PyMongoError("REPO ERROR : Failed to get data", e)
         except Exception as e:
             raise Exception("REPO ERROR : Failed to get data in repo", e)
             
+    def iterData(self, query=None, projection=None, batch_size=100, sort=None, limit=0):
+        """
+        Generator dokumen hasil find(), diambil dari server per `batch_size`.
+
+        Berbeda dengan getAllData(), dokumen tidak dikumpulkan ke list, jadi
+        memori yang dipakai sebatas satu batch. Cursor ditutup otomatis saat
+        generator selesai atau dibuang sebelum habis.
+        """
+        try:
+            cursor = self.collection.find(query or {}, projection, batch_size=batch_size, limit=limit)
+            if sort:
+                cursor = cursor.sort(sort)
+            with cursor:
+                for document in cursor:
+                    yield document
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to get data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to get data in repo", e)
+
+    def countData(self, query=None):
+        try:
+            return self.collection.count_documents(query or {})
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to count data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to count data in repo", e)
+
     def deleteData(self, id=None, multi=False, query=None):
         try:
             if query != None:
@@ -126,7 +178,7 @@ class BaseRepo:
                 return result
             
         except Exception as e:
-            print("Failed to delete data", e)
+            logger.error("Failed to delete data %s", e)
             return False
 
     
@@ -152,9 +204,76 @@ class BaseRepo:
         except Exception as e:
             raise Exception(f"Failed to update data: {e}")
                 
-    def getDataById(self, id):
+    def aggregate(self, pipeline):
+        try:
+            result = self.collection.aggregate(pipeline)
+            return list(result)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to aggregate data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to aggregate data in repo", e)
+
+    def ensureIndexes(self):
+        try:
+            if not self.indexes:
+                return []
+            return self.collection.create_indexes(self.indexes)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to create indexes", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to create indexes in repo", e)
+
+    def explainData(self, query, sort=None):
+        try:
+            cursor = self.collection.find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            return cursor.explain()
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to explain query", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to explain query in repo", e)
+
+    def getPage(self, query=None, limit=50, after=None, sortField="createdAt"):
+        """
+        Ambil satu halaman data, urut descending berdasarkan (sortField, _id).
+
+        Returns:
+            tuple: (list dokumen, (nilai sortField, _id) dokumen terakhir atau
+                   None kalau sudah halaman terakhir)
+        """
+        try:
+            query = keysetFilter(query or {}, sortField, after)
+            cursor = self.collection.find(query).sort([(sortField, DESCENDING), ("_id", DESCENDING)]).limit(limit + 1)
+            data = list(cursor)
+            if len(data) <= limit:
+                return data, None
+            data = data[:limit]
+            return data, (data[-1].get(sortField), data[-1]["_id"])
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to get data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to get data in repo", e)
+
+    def getDataByIds(self, ids, projection=None):
+        """
+        Ambil banyak dokumen sekaligus dengan satu query `$in`.
+
+        Id duplikat dibuang dulu; list kosong langsung dikembalikan tanpa query.
+        """
+        try:
+            ids = list(set(ids))
+            if not ids:
+                return []
+            return list(self.collection.find({"_id": {"$in": ids}}, projection))
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to get data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to get data in repo", e)
+
+    def getDataById(self, id, projection=None):
         try:
-            result = self.collection.find_one({"_id": id})
+            result = self.collection.find_one({"_id": id}, projection)
         except Exception as e:
             raise Exception("Failed to get data {e}")
         return result
@@ -1,5 +1,50 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, UpdateOne
+from pymongo.errors import PyMongoError
+
 class EmployeeRepo(BaseRepo):
+    # projection default untuk data yang akan di-dump ke response:
+    # hash bcrypt `password` tidak perlu ikut dikirim dari database
+    publicProjection = {"password": 0}
+
+    indexes = [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("branchId", ASCENDING), ("role", ASCENDING), ("status", ASCENDING)], name="branch_role_status"),
+    ]
+
     def __init__(self):
         super().__init__("employees")
-    
\ No newline at end of file
+
+    def getDataByIds(self, ids, projection=None):
+        """
+        Sama seperti BaseRepo.getDataByIds, dengan default projection
+        `publicProjection` (tanpa field `password`).
+        """
+        if projection is None:
+            projection = self.publicProjection
+        return super().getDataByIds(ids, projection)
+
+    def incrementCounters(self, increments):
+        """
+        Tambah counter kehadiran (workDays/lateDays) banyak employee sekaligus
+        dengan satu bulk_write.
+
+        Args:
+            increments (dict): {employeeId: {"workDays": 1, "lateDays": 0, ...}}
+
+        Returns:
+            BulkWriteResult | None: None jika tidak ada yang perlu di-update
+        """
+        try:
+            operations = [
+                UpdateOne({"_id": employeeId}, {"$inc": {field: value for field, value in counters.items() if value}})
+                for employeeId, counters in increments.items()
+                if any(counters.values())
+            ]
+            if not operations:
+                return None
+            return self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to update counters", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to update counters in repo", e)
@@ -1,7 +1,241 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import PyMongoError, BulkWriteError
+from validation.attendanceSchema import MANAGER_SHIFT
+
+
+# kode error MongoDB untuk pelanggaran index unik
+DUPLICATE_KEY = 11000
+
+# clockIn/clockOut kosong bisa tersimpan sebagai null atau string kosong
+EMPTY_TIME = [None, ""]
+
+
+def countStatus(status):
+    return {"$sum": {"$cond": [{"$eq": ["$status", status]}, 1, 0]}}
+
+
+SUMMARY_COUNTS = {
+    "presentCount": countStatus("present"),
+    "lateCount": countStatus("late"),
+    "absentCount": countStatus("absent"),
+    "noClockOutCount": {"$sum": "$noClockOut"},
+    "scheduledCount": {"$sum": 1},
+}
+
 
 class AttendanceRepo(BaseRepo):
+    indexes = [
+        # satu dokumen shift per tanggal per branch
+        IndexModel([("branchId", ASCENDING), ("Date", ASCENDING)], name="branch_date_unique", unique=True),
+        IndexModel([("employees.employeeId", ASCENDING), ("Date", ASCENDING)], name="employee_date"),
+    ]
+
     def __init__(self):
         super().__init__("attendances")
-        
-        
\ No newline at end of file
+
+    def getSummary(self, branchIds, startDate, endDate):
+        """
+        Ringkasan kehadiran dihitung di server MongoDB ($unwind + $group).
+
+        Satu dokumen hasil berisi `totals`, `byBranch`, `byEmployee` dan `byShift`,
+        masing-masing dengan jumlah present/late/absent/no clock out/terjadwal.
+        Entry tanpa status dianggap `absent` (sama seperti default schema).
+        Entry manager (shift MANAGER_SHIFT) bukan jadwal kehadiran, jadi tidak dihitung.
+        """
+        pipeline = [
+            {"$match": {"branchId": {"$in": list(branchIds)}, "Date": {"$gte": startDate, "$lt": endDate}}},
+            {"$unwind": "$employees"},
+            {"$match": {"employees.shift": {"$ne": MANAGER_SHIFT}}},
+            {"$project": {
+                "_id": 0,
+                "branchId": 1,
+                "employeeId": "$employees.employeeId",
+                "shift": "$employees.shift",
+                "status": {"$toLower": {"$ifNull": ["$employees.status", "absent"]}},
+                "noClockOut": {"$cond": [
+                    {"$and": [
+                        {"$gt": [{"$ifNull": ["$employees.clockIn", ""]}, ""]},
+                        {"$eq": [{"$ifNull": ["$employees.clockOut", ""]}, ""]},
+                    ]}, 1, 0
+                ]},
+            }},
+            {"$facet": {
+                "totals": [{"$group": {"_id": None, **SUMMARY_COUNTS}}],
+                "byBranch": [
+                    {"$group": {"_id": "$branchId", **SUMMARY_COUNTS}},
+                    {"$sort": {"_id": 1}},
+                ],
+                "byEmployee": [
+                    {"$group": {"_id": {"branchId": "$branchId", "employeeId": "$employeeId"}, **SUMMARY_COUNTS}},
+                    {"$sort": {"_id.branchId": 1, "_id.employeeId": 1}},
+                ],
+                "byShift": [
+                    {"$group": {"_id": {"branchId": "$branchId", "shift": "$shift"}, **SUMMARY_COUNTS}},
+                    {"$sort": {"_id.branchId": 1, "_id.shift": 1}},
+                ],
+            }},
+        ]
+        result = self.aggregate(pipeline)
+        return result[0] if result else {"totals": [], "byBranch": [], "byEmployee": [], "byShift": []}
+
+    def getEmployeeEntry(self, shiftId, employeeId):
+        """Dokumen shift dengan array `employees` hanya berisi entry employee tersebut."""
+        return self.getData(
+            query={"_id": shiftId},
+            projection={"Date": 1, "branchId": 1, "employees": {"$elemMatch": {"employeeId": employeeId}}},
+        )
+
+    def clockInUpdate(self, shiftId, employeeId, clockIn, presentShifts, lateShifts):
+        """(filter, update, arrayFilters) clock in, dipakai clockIn dan applyClockIns."""
+        query = {"_id": shiftId, "employees": {"$elemMatch": {
+            "employeeId": employeeId,
+            "clockIn": {"$in": EMPTY_TIME},
+            "shift": {"$in": list(presentShifts) + list(lateShifts)},
+        }}}
+        update = {"$set": {
+            "employees.$[present].clockIn": clockIn,
+            "employees.$[present].status": "present",
+            "employees.$[late].clockIn": clockIn,
+            "employees.$[late].status": "late",
+        }}
+        arrayFilters = [
+            {"present.employeeId": employeeId, "present.clockIn": {"$in": EMPTY_TIME}, "present.shift": {"$in": list(presentShifts)}},
+            {"late.employeeId": employeeId, "late.clockIn": {"$in": EMPTY_TIME}, "late.shift": {"$in": list(lateShifts)}},
+        ]
+        return query, update, arrayFilters
+
+    def clockIn(self, shiftId, employeeId, clockIn, presentShifts, lateShifts):
+        """
+        Clock in atomik dalam satu find_one_and_update.
+
+        Entry employee hanya di-update kalau belum clock in (`clockIn` null/"")
+        dan shift-nya termasuk shift yang sedang buka. Status ditentukan dari
+        nama shift: `presentShifts` -> present, `lateShifts` -> late.
+        Clock in kedua kali (double submit / request paralel) tidak mengubah
+        apa pun dan mengembalikan None.
+
+        Returns:
+            dict | None: Dokumen shift setelah update, `employees` hanya berisi
+                         entry employee tersebut; None jika tidak ada yang di-update
+        """
+        try:
+            query, update, arrayFilters = self.clockInUpdate(shiftId, employeeId, clockIn, presentShifts, lateShifts)
+            return self.collection.find_one_and_update(
+                query,
+                update,
+                array_filters=arrayFilters,
+                projection={"employees": {"$elemMatch": {"employeeId": employeeId}}},
+                return_document=ReturnDocument.AFTER,
+            )
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to clock in", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to clock in in repo", e)
+
+    def clockOut(self, shiftId, employeeId, clockOut, endedShifts):
+        """
+        Clock out atomik dalam satu find_one_and_update.
+
+        Hanya berhasil kalau employee sudah clock in, belum clock out, dan
+        shift-nya sudah selesai (`endedShifts`). Clock out kedua kali
+        mengembalikan None, jadi counter workDays/lateDays tidak dobel.
+
+        Returns:
+            dict | None: Dokumen shift setelah update (entry employee saja) atau None
+        """
+        try:
+            return self.collection.find_one_and_update(
+                {"_id": shiftId, "employees": {"$elemMatch": {
+                    "employeeId": employeeId,
+                    "clockIn": {"$nin": EMPTY_TIME},
+                    "clockOut": {"$in": EMPTY_TIME},
+                    "shift": {"$in": list(endedShifts)},
+                }}},
+                {"$set": {"employees.$[entry].clockOut": clockOut}},
+                array_filters=[{"entry.employeeId": employeeId, "entry.clockOut": {"$in": EMPTY_TIME}}],
+                projection={"employees": {"$elemMatch": {"employeeId": employeeId}}},
+                return_document=ReturnDocument.AFTER,
+            )
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to clock out", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to clock out in repo", e)
+
+    def applyClockIns(self, events):
+        """
+        Terapkan banyak clock in sekaligus dalam satu bulk_write (ordered=False).
+
+        Setiap event memakai filter/update yang sama dengan clockIn(), jadi
+        event untuk entry yang sudah clock in (duplikat / replay) tidak
+        mengubah apa pun.
+
+        Args:
+            events (list): List dict berisi shiftId, employeeId, clockIn,
+                           presentShifts, lateShifts
+
+        Returns:
+            BulkWriteResult | None: None jika events kosong
+        """
+        operations = []
+        for event in events:
+            query, update, arrayFilters = self.clockInUpdate(
+                event["shiftId"], event["employeeId"], event["clockIn"], event["presentShifts"], event["lateShifts"]
+            )
+            operations.append(UpdateOne(query, update, array_filters=arrayFilters))
+        if not operations:
+            return None
+        try:
+            return self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to apply clock ins", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to apply clock ins in repo", e)
+
+    def insertShifts(self, shifts):
+        """
+        Insert banyak dokumen shift dengan satu insert_many(ordered=False).
+
+        Hari yang sudah punya shift dicari dulu dengan satu query `$in`
+        (branchId, Date), jadi bentrok tetap terdeteksi walau index unik
+        `branch_date_unique` belum dibuat. Index tersebut tetap menjaga
+        insert paralel di antara cek dan insert: dokumen yang ditolak dengan
+        duplicate key juga dilaporkan, dokumen lain tetap masuk. Error selain
+        duplicate key tetap di-raise.
+
+        Returns:
+            list: Error per dokumen yang bentrok ({"index", "code"}), `index`
+                  adalah posisi dokumen di `shifts`
+        """
+        try:
+            existing = {
+                (doc["branchId"], doc["Date"])
+                for doc in self.collection.find(
+                    {
+                        "branchId": {"$in": list({shift["branchId"] for shift in shifts})},
+                        "Date": {"$in": list({shift["Date"] for shift in shifts})},
+                    },
+                    {"branchId": 1, "Date": 1},
+                )
+            }
+            conflicts = [
+                {"index": i, "code": DUPLICATE_KEY}
+                for i, shift in enumerate(shifts)
+                if (shift["branchId"], shift["Date"]) in existing
+            ]
+            skipped = {conflict["index"] for conflict in conflicts}
+            positions = [i for i in range(len(shifts)) if i not in skipped]
+            if not positions:
+                return conflicts
+            try:
+                self.collection.insert_many([shifts[i] for i in positions], ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                    raise PyMongoError("REPO ERROR : Failed to insert shifts", e)
+                conflicts += [dict(error, index=positions[error["index"]]) for error in errors]
+            return sorted(conflicts, key=lambda conflict: conflict["index"])
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to insert shifts", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to insert shifts in repo", e)
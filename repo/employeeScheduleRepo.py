@@ -0,0 +1,128 @@
+from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, DeleteMany, ReplaceOne, UpdateOne
+from pymongo.errors import PyMongoError
+
+# field entry employee di dokumen shift yang ikut disalin ke projection
+ENTRY_FIELDS = ("shift", "clockIn", "clockOut", "status")
+
+
+def scheduleId(shiftId, employeeId):
+    return f"{shiftId}:{employeeId}"
+
+
+class EmployeeScheduleRepo(BaseRepo):
+    """
+    Projection `employeeSchedules`: satu dokumen kecil per employee per shift.
+
+    Sumber datanya tetap dokumen shift di `attendances`; collection ini hanya
+    salinan yang diurutkan per employee supaya jadwal seorang employee bisa
+    dibaca dengan satu range scan di index (employeeId, Date), tanpa membaca
+    array `employees` semua shift.
+
+    Struktur dokumen:
+        {
+            "_id": "<shiftId>:<employeeId>",
+            "shiftId": str, "employeeId": str, "branchId": str, "Date": datetime,
+            "shift": str, "clockIn": str|None, "clockOut": str|None, "status": str
+        }
+    """
+    indexes = [
+        IndexModel([("employeeId", ASCENDING), ("Date", ASCENDING)], name="employee_date"),
+        IndexModel([("shiftId", ASCENDING)], name="shiftId"),
+    ]
+
+    def __init__(self):
+        super().__init__("employeeSchedules")
+
+    def syncShifts(self, shifts):
+        """
+        Samakan projection dengan dokumen shift (setelah insert/update/remove).
+
+        Entry yang ada di shift di-upsert, entry employee yang sudah tidak ada
+        di shift dihapus. Semua shift ditulis dalam satu bulk_write.
+
+        Args:
+            shifts (list): Dokumen shift lengkap (_id, branchId, Date, employees)
+
+        Returns:
+            BulkWriteResult | None: None jika tidak ada shift
+        """
+        operations = []
+        for shift in shifts:
+            employeeIds = []
+            for emp in shift.get("employees", []):
+                employeeIds.append(emp["employeeId"])
+                doc = {
+                    "shiftId": shift["_id"],
+                    "employeeId": emp["employeeId"],
+                    "branchId": shift["branchId"],
+                    "Date": shift["Date"],
+                }
+                doc.update({field: emp.get(field) for field in ENTRY_FIELDS})
+                operations.append(ReplaceOne({"_id": scheduleId(shift["_id"], emp["employeeId"])}, doc, upsert=True))
+            operations.append(DeleteMany({"shiftId": shift["_id"], "employeeId": {"$nin": employeeIds}}))
+        if not operations:
+            return None
+        try:
+            return self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to sync employee schedules", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to sync employee schedules in repo", e)
+
+    def updateEntries(self, updates):
+        """
+        Update field clock in/out beberapa entry sekaligus.
+
+        Args:
+            updates (list): List tuple (shiftId, employeeId, {field: value})
+
+        Returns:
+            BulkWriteResult | None: None jika tidak ada update
+        """
+        operations = [
+            UpdateOne({"_id": scheduleId(shiftId, employeeId)}, {"$set": fields})
+            for shiftId, employeeId, fields in updates
+        ]
+        if not operations:
+            return None
+        try:
+            return self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to update employee schedules", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to update employee schedules in repo", e)
+
+    def getSchedule(self, employeeId, startDate, endDate, branchId=None):
+        """Jadwal employee dengan Date di [startDate, endDate), urut berdasarkan Date."""
+        query = {"employeeId": employeeId, "Date": {"$gte": startDate, "$lt": endDate}}
+        if branchId is not None:
+            query["branchId"] = branchId
+        return list(self.iterData(query=query, sort=[("Date", ASCENDING)]))
+
+    def rebuild(self):
+        """
+        Bangun ulang projection dari semua dokumen `attendances` ($unwind + $merge,
+        jalan di server). Aman dijalankan berkali-kali.
+
+        Returns:
+            int: Jumlah dokumen projection
+        """
+        try:
+            self.collection.database["attendances"].aggregate([
+                {"$unwind": "$employees"},
+                {"$project": {
+                    "_id": {"$concat": ["$_id", ":", "$employees.employeeId"]},
+                    "shiftId": "$_id",
+                    "employeeId": "$employees.employeeId",
+                    "branchId": 1,
+                    "Date": 1,
+                    **{field: {"$ifNull": [f"$employees.{field}", None]} for field in ENTRY_FIELDS},
+                }},
+                {"$merge": {"into": self.collection.name, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+            ])
+            return self.countData()
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to rebuild employee schedules", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to rebuild employee schedules in repo", e)
@@ -1,5 +1,14 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 class HistoryRepo(BaseRepo):
+    # semua index berakhiran (createdAt, _id) descending supaya keyset pagination
+    # getPage() tidak perlu sort di memori
+    indexes = [
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="created"),
+        IndexModel([("employeeId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)], name="employee_created"),
+        IndexModel([("type", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)], name="type_created"),
+    ]
+
     def __init__(self):
         super().__init__("histories")
\ No newline at end of file
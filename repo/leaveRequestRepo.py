@@ -1,7 +1,73 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
 
 class LeaveRequestRepo(BaseRepo):
+    indexes = [
+        # melayani findOverlap(): equality employeeId + status, range startDate
+        IndexModel([("employeeId", ASCENDING), ("status", ASCENDING), ("startDate", ASCENDING)], name="employee_status_start"),
+        # antrian approval (getQueue): equality branchId/requesterRole/status, urut createdAt
+        IndexModel([("branchId", ASCENDING), ("requesterRole", ASCENDING), ("status", ASCENDING),
+                    ("createdAt", DESCENDING), ("_id", DESCENDING)], name="branch_role_status_created"),
+        IndexModel([("requesterRole", ASCENDING), ("status", ASCENDING),
+                    ("createdAt", DESCENDING), ("_id", DESCENDING)], name="role_status_created"),
+    ]
+
     def __init__(self):
         super().__init__("leaveRequests")
-        
-        
\ No newline at end of file
+
+    def findOverlap(self, employeeId, start, end, statuses=("pending", "approved")):
+        """
+        Cari satu request employee (pending/approved) yang rentangnya beririsan
+        dengan [start, end).
+
+        Dua interval beririsan jika `startDate < end` dan `endDate >= start`,
+        jadi cukup satu range query di index employee_status_start, berapa pun
+        jumlah request lama employee tersebut.
+
+        Args:
+            employeeId (str): ID employee
+            start (datetime): Awal rentang (inklusif)
+            end (datetime): Akhir rentang (eksklusif)
+            statuses (tuple): Status request yang dihitung
+
+        Returns:
+            dict | None: Request yang overlap (_id, startDate, endDate) atau None
+        """
+        try:
+            return self.collection.find_one(
+                {
+                    "employeeId": employeeId,
+                    "status": {"$in": list(statuses)},
+                    "startDate": {"$lt": end},
+                    "endDate": {"$gte": start},
+                },
+                {"startDate": 1, "endDate": 1},
+                sort=[("startDate", ASCENDING)],
+            )
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to get data", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to get data in repo", e)
+
+    def backfillRequesterRole(self):
+        """
+        Isi `requesterRole` untuk request lama yang belum punya field tersebut,
+        diambil dari role employee pembuatnya ($lookup + $merge, jalan di server).
+
+        Returns:
+            int: Jumlah request yang masih belum punya requesterRole setelah backfill
+        """
+        try:
+            self.aggregate([
+                {"$match": {"requesterRole": {"$exists": False}}},
+                {"$lookup": {"from": "employees", "localField": "employeeId", "foreignField": "_id", "as": "requester"}},
+                {"$unwind": "$requester"},
+                {"$project": {"_id": 1, "requesterRole": "$requester.role"}},
+                {"$merge": {"into": self.collection.name, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+            ])
+            return self.countData(query={"requesterRole": {"$exists": False}})
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to backfill requesterRole", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to backfill requesterRole in repo", e)
@@ -1,5 +1,13 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING
 
 class SessionRepo(BaseRepo):
+    indexes = [
+        IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+        IndexModel([("jti", ASCENDING)], name="jti", sparse=True),
+        # session otomatis dihapus MongoDB setelah lewat `exp`
+        IndexModel([("exp", ASCENDING)], name="exp_ttl", expireAfterSeconds=0),
+    ]
+
     def __init__(self):
         super().__init__("sessions")
\ No newline at end of file
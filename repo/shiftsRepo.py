@@ -1,6 +1,41 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING
+from utils.cache import TTLCache
+from utils.config import Config
+import pendulum
+
+# definisi shift jarang berubah, jadi disimpan per proses dan di-refresh tiap SHIFT_CACHE_TTL detik
+shiftCache = TTLCache(maxsize=1, ttl=Config.SHIFT_CACHE_TTL)
 
 
 class ShiftsRepo(BaseRepo):
+    indexes = [
+        IndexModel([("shiftName", ASCENDING)], name="shiftName_unique", unique=True),
+    ]
+
     def __init__(self):
-        super().__init__("shifts")  
\ No newline at end of file
+        super().__init__("shifts")
+
+    def getShiftMap(self):
+        """
+        Ambil semua definisi shift dalam bentuk dict {shiftName: shift}.
+
+        Selain field asli (shiftStartTime, shiftEndTime dalam string), setiap shift
+        punya `startTime` dan `endTime` yang sudah di-parse ke pendulum Time, jadi
+        pemanggil tidak perlu parsing ulang. Hasil di-cache per proses; jangan
+        diubah oleh pemanggil.
+        """
+        shifts = shiftCache.get("shifts")
+        if shifts is None:
+            shifts = {}
+            for shift in self.getAllData():
+                shift["startTime"] = pendulum.parse(shift["shiftStartTime"], exact=True)
+                shift["endTime"] = pendulum.parse(shift["shiftEndTime"], exact=True)
+                shifts[shift["shiftName"]] = shift
+            shiftCache.set("shifts", shifts)
+        return shifts
+
+    @staticmethod
+    def invalidateCache():
+        """Hapus cache definisi shift (panggil setelah collection `shifts` diubah)."""
+        shiftCache.clear()
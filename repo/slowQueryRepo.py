@@ -0,0 +1,39 @@
+from repo.BaseRepo import BaseRepo
+from pymongo.errors import PyMongoError, CollectionInvalid
+from utils.config import Config
+
+
+class SlowQueryRepo(BaseRepo):
+    """
+    Capped collection `slowQueries` untuk catatan query lambat (utils/slowQuery.py),
+    plus explain() command yang tertangkap.
+    """
+
+    def __init__(self):
+        super().__init__("slowQueries")
+
+    def ensureIndexes(self):
+        # tidak ada index; yang perlu dipastikan collection-nya capped supaya ukurannya tetap
+        try:
+            self.collection.database.create_collection(
+                self.collection.name, capped=True, size=Config.SLOW_QUERY_COLLECTION_SIZE
+            )
+        except CollectionInvalid:
+            pass
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to create capped collection", e)
+        return []
+
+    def explainCommand(self, command, verbosity="executionStats"):
+        """
+        explain() untuk dokumen command mentah (find / aggregate / count / distinct).
+
+        Returns:
+            dict: Hasil explain dari server
+        """
+        try:
+            return self.collection.database.command({"explain": command, "verbosity": verbosity})
+        except PyMongoError as e:
+            raise PyMongoError("REPO ERROR : Failed to explain command", e)
+        except Exception as e:
+            raise Exception("REPO ERROR : Failed to explain command in repo", e)
@@ -1,6 +1,22 @@
 from repo.BaseRepo import BaseRepo
+from pymongo import IndexModel, ASCENDING, GEOSPHERE
+from utils.cache import TTLCache
+from utils.config import Config
+from utils.geo import haversine
+import logging
+
+logger = logging.getLogger(__name__)
+
+# lokasi + radius clock in per branch, hampir tidak pernah berubah; di-invalidate saat store diubah
+geofenceCache = TTLCache(maxsize=Config.GEOFENCE_CACHE_SIZE, ttl=Config.GEOFENCE_CACHE_TTL)
 
 class StoreRepo(BaseRepo):
+    indexes = [
+        # wajib ada supaya $nearSphere di validateCheckIn bisa jalan
+        IndexModel([("geometry", GEOSPHERE)], name="geometry_2dsphere"),
+        IndexModel([("status", ASCENDING)], name="status"),
+    ]
+
     def __init__(self):
         super().__init__("stores")
         
@@ -12,8 +28,52 @@ class StoreRepo(BaseRepo):
     #     return result   
     
     
+    def getGeofence(self, branchId):
+        """
+        Titik lokasi dan radius clock in (meter) sebuah branch, di-cache per proses.
+
+        Returns:
+            dict | None: {"coordinates": [lng, lat], "radius": float}; None jika
+                         branch tidak ada atau geometry-nya bukan Point
+        """
+        fence = geofenceCache.get(branchId)
+        if fence is None:
+            store = self.getData(id=branchId, projection={"geometry": 1, "checkInRadius": 1})
+            geometry = (store or {}).get("geometry") or {}
+            coordinates = geometry.get("coordinates")
+            if geometry.get("type", "Point") != "Point" or not coordinates or len(coordinates) != 2:
+                return None
+            fence = {"coordinates": coordinates, "radius": store.get("checkInRadius") or Config.CHECKIN_RADIUS}
+            geofenceCache.set(branchId, fence)
+        return fence
+
     def validateCheckIn(self, coordinates, branchId):
+        """
+        Cek apakah koordinat user berada dalam radius clock in branch-nya.
+
+        Jarak dihitung dengan haversine di Python dari lokasi branch yang di-cache,
+        jadi clock in/out tidak perlu query geo ke MongoDB. Kalau lokasi branch
+        tidak bisa dipakai dari cache (branch tidak ada / geometry bukan Point),
+        dicek dengan query $nearSphere seperti sebelumnya.
+
+        Returns:
+            dict | None: {"_id", "distance"} jika di dalam radius, None jika di luar
+        """
         try:
+            fence = self.getGeofence(branchId)
+            if fence is None:
+                return self.validateCheckInQuery(coordinates, branchId)
+            distance = haversine(coordinates, fence["coordinates"])
+            logger.debug("DISTANCE VALIDATE CHECK IN %s %s", distance, fence['radius'])
+            if distance > fence["radius"]:
+                return None
+            return {"_id": branchId, "distance": distance}
+        except Exception as e:
+            raise Exception("Failed to validate check in", e)
+
+    def validateCheckInQuery(self, coordinates, branchId):
+        try:
+            store = self.getData(id=branchId, projection={"checkInRadius": 1}) or {}
             result = self.collection.find_one({"_id": branchId, "geometry":
                 {
                     "$nearSphere": { #spherical law of cosines atau haversine.
@@ -21,10 +81,18 @@ class StoreRepo(BaseRepo):
                             "type": "Point",    
                             "coordinates": coordinates
                         },
-                        "$maxDistance": 50
+                        "$maxDistance": store.get("checkInRadius") or Config.CHECKIN_RADIUS
                     },
                 }})
-            print("RESULT VALIDATE CHECK IN",result)
+            logger.debug("RESULT VALIDATE CHECK IN %s", result)
             return result
         except Exception as e:
-            raise Exception("Failed to validate check in", e)
\ No newline at end of file
+            raise Exception("Failed to validate check in", e)
+
+    @staticmethod
+    def invalidateGeofence(branchId=None):
+        """Hapus cache lokasi branch (semua branch jika branchId None)."""
+        if branchId is None:
+            geofenceCache.clear()
+        else:
+            geofenceCache.delete(branchId)
@@ -1,11 +1,14 @@
-from flask import Blueprint, render_template, request, redirect, jsonify, make_response, url_for
+from flask import Blueprint, render_template, request, redirect, jsonify, url_for
 from service.leaveRequestService import LeaveRequestService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, getCurrentUser
 from validation.fileValidation import FileValidation
 import os
 import random
 import pendulum
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 """
 =================================================================================
@@ -16,7 +19,7 @@ MODULE: Manajemen Permohonan Cuti Karyawan
 
 AUTENTIKASI:
 - Semua endpoint memerlukan JWT token di cookies
-- Validasi menggunakan SessionService.checkAccess()
+- Validasi menggunakan @require_roles (token di-resolve sekali per request)
 
 AUTHORIZATION:
 - Owner: Approve/reject semua request, lihat semua request
@@ -34,11 +37,12 @@ FITUR UTAMA:
 ENDPOINTS:
 1. POST /request                    → Buat permohonan cuti
 2. GET  /list-employee              → Daftar request karyawan (pribadi)
-3. GET  /list-manager               → Daftar request untuk manager/owner
-4. GET  /detail/<request_id>        → Detail request
-5. PUT  /approve/<request_id>       → Approve request
-6. PUT  /reject/<request_id>        → Reject request
-7. PUT  /cancel/<request_id>        → Cancel request
+3. GET  /list-manager               → Antrian request manager/owner (?status=&limit=&cursor=)
+4. GET  /count-manager              → Jumlah request di antrian manager/owner (?status=)
+5. GET  /detail/<request_id>        → Detail request
+6. PUT  /approve/<request_id>       → Approve request
+7. PUT  /reject/<request_id>        → Reject request
+8. PUT  /cancel/<request_id>        → Cancel request
 
 FORMAT REQUEST:
 - POST /request:
@@ -81,18 +85,13 @@ FILE UPLOAD:
 
 annualRequestBp = Blueprint("annualRequestBp", __name__)
 service = LeaveRequestService()
-session = SessionService()
 
 
 @annualRequestBp.route("/request", methods=["POST"])
+@require_roles("manager", "employee")
 def annualRequest():
-    print("-----------[ANNUAL REQUEST]-----------")
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "employee"], token)
-    
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    logger.debug("-----------[ANNUAL REQUEST]-----------")
+    currentUser = getCurrentUser()
         
     directory = "./uploads/annualAttachment"
     os.makedirs(directory, exist_ok=True)
@@ -109,16 +108,16 @@ def annualRequest():
         filename = _id + f".{validatedFile['fileType']}"
         file.save(os.path.join(directory, filename))
         fileUrl = f"{request.url_root}uploads/annualAttachment/{filename}"
-        print(f"[INFO] File uploaded: {filename}")
+        logger.debug("[INFO] File uploaded: %s", filename)
     else:
-        print("[INFO] No file uploaded")
+        logger.debug("[INFO] No file uploaded")
     
     if request.is_json:
         data = request.get_json()
-        print("[INFO ANNUAL REQUEST] Data from JSON:", data)
+        logger.debug("[INFO ANNUAL REQUEST] Data from JSON: %s", data)
     elif request.form.get("payload"):
         data = json.loads(request.form.get("payload"))
-        print("[INFO ANNUAL REQUEST] Data from payload:", data)
+        logger.debug("[INFO ANNUAL REQUEST] Data from payload: %s", data)
     else:
         data = {
             "type": request.form.get("type"),
@@ -126,87 +125,82 @@ def annualRequest():
             "endDate": request.form.get("endDate"),
             "reason": request.form.get("reason")
         }
-        print("[INFO ANNUAL REQUEST] Data from form fields:", data)
+        logger.debug("[INFO ANNUAL REQUEST] Data from form fields: %s", data)
     
     data["attachmentUrl"] = fileUrl
     data["fileName"] = fileName
-    data["employeeId"] = currentUser["data"]["_id"]
+    data["employeeId"] = currentUser["_id"]
     
-    print("[ANNUAL REQUEST] Final data:", data)
+    logger.debug("[ANNUAL REQUEST] Final data: %s", data)
     
-    result = service.createAnnualRequest(data=data, currentUser=currentUser["data"])
+    result = service.createAnnualRequest(data=data, currentUser=currentUser)
     return jsonify(result), 200
 
 
 @annualRequestBp.route("/list-employee", methods=["GET"])
+@require_roles("manager", "employee")
 def listAnnualRequest():
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "employee"], token)
-
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
-    result = service.listAnnualByEmployee(id=currentUser["data"]["_id"])
+    result = service.listAnnualByEmployee(id=currentUser["_id"])
     return jsonify(result), 200
 
 @annualRequestBp.route("/list-manager", methods=["GET"])
+@require_roles("manager", "owner")
 def listRequest():
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "owner"], token)
-
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    if currentUser["data"]["role"] == "owner":
-        result = service.getRequestByOwner()
-        return jsonify(result), 200
-    result = service.getRequestByBranch(currentUser=currentUser["data"])
+    currentUser = getCurrentUser()
+    status = request.args.get("status")
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    try:
+        if currentUser["role"] == "owner":
+            result = service.getRequestByOwner(status=status, limit=limit, cursor=cursor)
+            return jsonify(result), 200
+        result = service.getRequestByBranch(currentUser=currentUser, status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"status": False, "message": str(e)}), 400
+    return jsonify(result), 200
+
+@annualRequestBp.route("/count-manager", methods=["GET"])
+@require_roles("manager", "owner")
+def countRequest():
+    currentUser = getCurrentUser()
+    try:
+        result = service.countRequestQueue(currentUser=currentUser, status=request.args.get("status"))
+    except ValueError as e:
+        return jsonify({"status": False, "message": str(e)}), 400
     return jsonify(result), 200
 
 @annualRequestBp.route("/detail/<request_id>", methods=["GET"])
+@require_roles("manager", "employee", "owner")
 def detailRequest(request_id):
-    print("-----------[DETAIL ANNUAL REQUEST]-----------")
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "employee", "owner"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    logger.debug("-----------[DETAIL ANNUAL REQUEST]-----------")
     
     result = service.details(id=request_id)
     return jsonify(result), 200
 
 @annualRequestBp.route("/cancel/<request_id>", methods=["PUT"])
+@require_roles("manager", "employee")
 def cancelRequest(request_id):
-    print("-----------[CANCEL ANNUAL REQUEST]-----------")
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "employee"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    result = service.cancelRequest(id=request_id, currentUser=currentUser["data"])
+    logger.debug("-----------[CANCEL ANNUAL REQUEST]-----------")
+    currentUser = getCurrentUser()
+    result = service.cancelRequest(id=request_id, currentUser=currentUser)
     return jsonify(result), 200 
 
 @annualRequestBp.route("/approve/<request_id>", methods=["PUT"])
+@require_roles("manager", "owner")
 def approveRequest(request_id):
-    print("-----------[APPROVE ANNUAL REQUEST]-----------")
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "owner"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    logger.debug("-----------[APPROVE ANNUAL REQUEST]-----------")
+    currentUser = getCurrentUser()
     data = request.get_json()
-    result = service.approveRequest(id=request_id, currentUser=currentUser["data"], data=data)
+    result = service.approveRequest(id=request_id, currentUser=currentUser, data=data)
     return jsonify(result), 200
 
 @annualRequestBp.route("/reject/<request_id>", methods=["PUT"])
+@require_roles("manager", "owner")
 def rejectRequest(request_id):
-    print("-----------[REJECT ANNUAL REQUEST]-----------", request_id)
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["manager", "owner"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    logger.debug("-----------[REJECT ANNUAL REQUEST]----------- %s", request_id)
+    currentUser = getCurrentUser()
     data = request.get_json()
-    result = service.rejectRequest(id=request_id, currentUser=currentUser["data"],data=data )
+    result = service.rejectRequest(id=request_id, currentUser=currentUser,data=data )
     return jsonify(result), 200
\ No newline at end of file
@@ -1,6 +1,9 @@
-from flask import Blueprint, render_template, request, redirect, jsonify, make_response, url_for
+from flask import Blueprint, render_template, request, redirect, jsonify, url_for
 from service.attendanceService import AttendanceService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, getCurrentUser
+import logging
+
+logger = logging.getLogger(__name__)
 
 """
 =================================================================================
@@ -11,7 +14,7 @@ MODULE: Manajemen Kehadiran & Shift Karyawan
 
 AUTENTIKASI:
 - Semua endpoint memerlukan JWT token di cookies
-- Validasi menggunakan SessionService.checkAccess()
+- Validasi menggunakan @require_roles (token di-resolve sekali per request)
 
 AUTHORIZATION:
 - Manager: Kelola shift, lihat kehadiran cabang, clock in/out
@@ -20,6 +23,7 @@ AUTHORIZATION:
 FITUR UTAMA:
 - Clock In/Out karyawan dengan geolokasi
 - Set & update shift harian (day/night shift)
+- Rencana shift satu bulan dalam satu request (bulk planner)
 - Remove karyawan dari shift
 - Laporan kehadiran harian per cabang
 - Laporan shift bulanan
@@ -35,7 +39,9 @@ ENDPOINTS:
 6. PUT  /remove/<id>            → Remove karyawan dari shift
 7. GET  /getMonthlyShifts/<date> → Laporan shift bulanan
 8. GET  /getMonthlySummary/<date> → Summary kehadiran bulanan
-9. GET  /schedule/<employeeId>  → Jadwal shift karyawan
+9. GET  /schedule/<employeeId>?month=YYYY-MM → Jadwal shift karyawan satu bulan
+10. GET /summary?start=&end=&branchId= → Summary kehadiran rentang tanggal (multi cabang)
+11. POST /planShifts            → Set shift banyak hari sekaligus (rotasi / roster per tanggal)
 
 FORMAT RESPONSE:
 Success: {"status": true, "message": "...", "data": {...}}
@@ -51,30 +57,23 @@ NOTES:
 
 attendanceBp = Blueprint("attendanceBp", __name__)
 service = AttendanceService()
-session = SessionService()
 
 
 @attendanceBp.route("/<date>", methods=["GET"])
+@require_roles("manager")
 def attendance(date=None):
-    print("[ATTENDANCE ROUTES ]DATE:", date)
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    branchId = currentUser["data"]["branchId"]
+    logger.debug("[ATTENDANCE ROUTES ]DATE: %s", date)
+    currentUser = getCurrentUser()
+    branchId = currentUser["branchId"]
     data = service.getAttendanceByStore(date=date, storeId=branchId)
     return jsonify(data), 200
 
 @attendanceBp.route("/clockIn", methods=["POST"])
+@require_roles("employee", "manager")
 def attendanceClockIn():
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["employee", "manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     req = request.get_json()
-    data = service.employeeClockIn(data=req, employee=currentUser["data"])
+    data = service.employeeClockIn(data=req, employee=currentUser)
     return jsonify(data), 200
 
 
@@ -92,15 +91,20 @@ def attendanceClockIn():
 #     _type_: _description_
 # """
 @attendanceBp.route("/setShift", methods=["POST"])
+@require_roles("manager")
 def setShift():
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
+    req = request.get_json()
+    req["branchId"] = currentUser["branchId"]
+    data = service.setShift(data=req, currentUser= currentUser)
+    return jsonify(data), 201
+
+@attendanceBp.route("/planShifts", methods=["POST"])
+@require_roles("manager")
+def planShifts():
+    currentUser = getCurrentUser()
     req = request.get_json()
-    req["branchId"] = currentUser["data"]["branchId"]
-    data = service.setShift(data=req, currentUser= currentUser["data"])
+    data = service.planShifts(data=req, currentUser=currentUser)
     return jsonify(data), 201
 
 # @attendanceBp.route("/changeShift", methods=["PUT"])
@@ -115,78 +119,77 @@ def setShift():
 #     return jsonify(data), 200
 
 @attendanceBp.route("/clockOut", methods=["POST"])
+@require_roles("employee", "manager")
 def clockOut():
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["employee", "manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     req = request.get_json()
-    data = service.employeeClockOut(data=req, employee=currentUser["data"] )
+    data = service.employeeClockOut(data=req, employee=currentUser )
     return jsonify(data), 200
 
 
 @attendanceBp.route("/remove/<id>", methods=["PUT"])
+@require_roles("manager")
 def removeShift(id):
-    print("-----------[REMOVE SHIFT ROUTES] ID:", id)
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    print("[INFO REMOVE SHIFT ROUTESS] ID:", id)
+    logger.debug("-----------[REMOVE SHIFT ROUTES] ID: %s", id)
+    currentUser = getCurrentUser()
+    logger.debug("[INFO REMOVE SHIFT ROUTESS] ID: %s", id)
     req = request.get_json()
-    data = service.removeShift(data=req, id=id, employee=currentUser["data"])
+    data = service.removeShift(data=req, id=id, employee=currentUser)
     return jsonify(data), 200
 
 
 @attendanceBp.route("/update/<id>", methods=["PUT"])
+@require_roles("manager")
 def addEmployee(id):
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     req = request.get_json()
-    data = service.updateShift(data=req, id=id, employee=currentUser["data"])
+    data = service.updateShift(data=req, id=id, employee=currentUser)
     return jsonify(data), 200
 
 
 @attendanceBp.route("/getMonthlyShifts/<date>", methods=["GET"])
+@require_roles("manager")
 def getMonthlyShifts(date):
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     year = date.split("-")[0]
     month = date.split("-")[1]
-    data = service.getMonthlyShifts(branchId=currentUser["data"]["branchId"], month=month, year=year)
+    data = service.getMonthlyShifts(branchId=currentUser["branchId"], month=month, year=year)
     return jsonify(data), 200
 
 
 @attendanceBp.route("/getMonthlySummary/<date>", methods=["GET"])
+@require_roles("manager")
 def getMonthlySummary(date):
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["manager"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    print("[INFO] DATE:", date)
+    currentUser = getCurrentUser()
+    logger.debug("[INFO] DATE: %s", date)
     year = date.split("-")[0]
     month = date.split("-")[1]
-    data = service.getMonthlySummary(branchId=currentUser["data"]["branchId"], month=month, year=year)
+    data = service.getMonthlySummary(branchId=currentUser["branchId"], month=month, year=year)
+    return jsonify(data), 200
+
+
+@attendanceBp.route("/summary", methods=["GET"])
+@require_roles("owner", "manager")
+def getAttendanceSummary():
+    currentUser = getCurrentUser()
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if not start or not end:
+        return jsonify({"status": False, "message": "start and end are required"}), 400
+    if currentUser["role"] == "manager":
+        branchIds = [currentUser["branchId"]]
+    else:
+        branchIds = request.args.getlist("branchId")
+    data = service.getAttendanceSummary(branchIds=branchIds, startDate=start, endDate=end)
     return jsonify(data), 200
 
 
 @attendanceBp.route("/schedule/<employeeId>", methods=["GET"])
+@require_roles("employee")
 def getSchedule(employeeId):
-    print("============[INFO] EMPLOYEE ID GET EMPLOYEE SCHEDULE : ==========", employeeId)
-    token = request.cookies.get("token")
-    currentUser = SessionService().checkAccess(["employee"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    branchId = currentUser["data"]["branchId"]
-    data = service.getEmployeeSchedule(branchId=branchId, employeeId=employeeId)
+    logger.debug("============[INFO] EMPLOYEE ID GET EMPLOYEE SCHEDULE : ========== %s", employeeId)
+    currentUser = getCurrentUser()
+    branchId = currentUser["branchId"]
+    month = request.args.get("month")
+    data = service.getEmployeeSchedule(branchId=branchId, employeeId=employeeId, month=month)
     return jsonify(data), 200
\ No newline at end of file
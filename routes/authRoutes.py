@@ -1,11 +1,13 @@
 from flask import Blueprint, request, redirect, jsonify, make_response, url_for
 from service.employeeService import EmployeeService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import getSessionService, currentAuth
 from utils.utility import Utility
+import logging
+
+logger = logging.getLogger(__name__)
 
 authBp = Blueprint("authBp", __name__)
 employService = EmployeeService()
-session = SessionService()
 utility = Utility()
 
 @authBp.route("/login", methods=["POST"])
@@ -90,7 +92,7 @@ def currentUser():
         token = request.cookies.get("token")
         if not token:
             return jsonify({"status": False, "message": "No token found"}), 400
-        result = session.checkAccess(["owner", "manager", "employee"], token)
+        result = currentAuth()
         if result["status"] == False:
            return redirect("/notHaveAccess"), 403
         return jsonify(result["data"]), 200
@@ -132,10 +134,10 @@ def logout():
     """
     try:
         token = request.cookies.get("token")
-        print("TOKENN = ", token)
+        logger.debug("TOKENN = %s", token)
         if not token:
             return jsonify({"status": False, "message": "No token found"}), 400
-        result = SessionService().deleteToken(token=token)
+        result = getSessionService().deleteToken(token=token)
         if not result:
             return jsonify({"status": False, "message": "Failed to logout"}), 400
         response = make_response(jsonify({"status": True, "message": "Successfully logout"}), 200)
@@ -1,7 +1,10 @@
-from flask import Blueprint, render_template, request, redirect, jsonify, make_response
+from flask import Blueprint, render_template, request, jsonify
 from service.storeService import StoreService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, getCurrentUser
 from utils.utility import Utility
+import logging
+
+logger = logging.getLogger(__name__)
 
 """
 =================================================================================
@@ -12,7 +15,7 @@ MODULE: Manajemen Cabang/Toko (CRUD + Aktivasi/Deaktivasi)
 
 AUTENTIKASI:
 - Semua endpoint memerlukan JWT token di cookies
-- Validasi menggunakan SessionService.checkAccess()
+- Validasi menggunakan @require_roles (token di-resolve sekali per request)
 
 AUTHORIZATION:
 - Owner: Akses penuh semua operasi cabang
@@ -48,31 +51,20 @@ NOTES:
 """
 
 branchRoutesBp = Blueprint("branchRoutesBp", __name__)
-session = SessionService()
 service = StoreService()
 utility = Utility()
 @branchRoutesBp.route("", methods=["GET"])
+@require_roles("owner", "manager", "employee")
 def branch():
-    token = request.cookies.get("token")
-    print("-------------CURRENT USER IN BRANCHES-------:")
-    currentUser = session.checkAccess(["owner", "manager", "employee"], token)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
    
     data = service.getAllStore()
-    print("[INFO] Data:", data)
+    logger.debug("[INFO] Data: %s", data)
     return jsonify(data), 200
 
     
 @branchRoutesBp.route("/<id>", methods=["GET"])
+@require_roles("owner")
 def branchById(id):
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
@@ -82,88 +74,69 @@ def branchById(id):
     return jsonify(data), 200
     
 @branchRoutesBp.route("/create", methods=["POST"])
+@require_roles("owner")
 def createBranch():
     
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     data = request.get_json()
     
     if not data:
         return jsonify({"status": False, "message": "No data found"}), 400
-    print("[INFO] Data:", data)
-    result = service.addStore(data, currentUser["data"]["_id"], currentUser["data"]["name"])
+    logger.debug("[INFO] Data: %s", data)
+    result = service.addStore(data, currentUser["_id"], currentUser["name"])
     if result["status"] == False:
         return jsonify(result), 400
     return jsonify(result), 201
 
     
 @branchRoutesBp.route("/update/<id>", methods=["PUT"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def updateBranch(id):
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        return  redirect("/notHaveAccess")
+    currentUser = getCurrentUser()
     data = request.get_json()
-    print("[INFO UPDATE BRANCH ROUTES ] Data:", data)
-    print("[UPDATE BRANCH] ID:", id)
-    result = service.updateStore(id=id, data=data,  employeeId=currentUser["data"]["_id"], employeeName=currentUser["data"]["name"])
+    logger.debug("[INFO UPDATE BRANCH ROUTES ] Data: %s", data)
+    logger.debug("[UPDATE BRANCH] ID: %s", id)
+    result = service.updateStore(id=id, data=data,  employeeId=currentUser["_id"], employeeName=currentUser["name"])
     return jsonify(result), 200
 
     
 @branchRoutesBp.route("/delete/<id>", methods=["DELETE"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def deleteBranch(id):
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        return redirect("/notHaveAccess")
-    result = service.deleteStore(id, currentUser["data"]["_id"], currentUser["data"]["name"])
-    print("[INFO] Result:", result)
+    currentUser = getCurrentUser()
+    result = service.deleteStore(id, currentUser["_id"], currentUser["name"])
+    logger.debug("[INFO] Result: %s", result)
     return jsonify(result), 200
 
 @branchRoutesBp.route("/non-active/<id>", methods=["PUT"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def nonActiveBranch(id):
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        return redirect("/notHaveAccess")
-    result = service.nonActivateStore(id, employee=currentUser["data"])
-    print("[INFO] Result:", result), 
+    currentUser = getCurrentUser()
+    result = service.nonActivateStore(id, employee=currentUser)
+    logger.debug("[INFO] Result: %s", result)
     return jsonify(result), 200
 
 @branchRoutesBp.route("/active/<id>", methods=["PUT"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def activeBranch(id):
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        return  redirect("/notHaveAccess")
-    result = service.ActivateStore(id, employee=currentUser["data"])
-    print("[INFO] Result:", result), 
+    currentUser = getCurrentUser()
+    result = service.ActivateStore(id, employee=currentUser)
+    logger.debug("[INFO] Result: %s", result)
     return jsonify(result), 200
 
 @branchRoutesBp.route("/active", methods=["GET"])
+@require_roles("owner", "manager", redirectTo="/notHaveAccess")
 def listActiveBranch():
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser['status'] == False:
-        return  redirect("/notHaveAccess")
+    currentUser = getCurrentUser()
     result = service.getActiveStore()
-    if currentUser["data"]["role"] == "manager":
+    if currentUser["role"] == "manager":
         managerstore = None
         for store in result["data"]:
-            if store["_id"] == currentUser["data"]["branchId"]:
+            if store["_id"] == currentUser["branchId"]:
                 managerstore = store
                 break
             
         return jsonify({"status": True, "message": "Manager Branch", "data" : [managerstore]}), 200
-    print("[==== INFO ====] Result:", result), 
+    logger.debug("[==== INFO ====] Result: %s", result)
     return jsonify(result), 200
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, make_response
+from flask import Blueprint, request, jsonify, render_template, redirect
 from service.employeeService import EmployeeService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, getCurrentUser
 from utils.utility import Utility
+import logging
+
+logger = logging.getLogger(__name__)
 
 """
 =================================================================================
@@ -12,7 +15,7 @@ MODULE: Manajemen Karyawan (CRUD + Aktivasi/Deaktivasi)
 
 AUTENTIKASI:
 - Semua endpoint memerlukan JWT token di cookies
-- Validasi menggunakan SessionService.checkAccess()
+- Validasi menggunakan @require_roles (token di-resolve sekali per request)
 
 AUTHORIZATION:
 - Owner: Akses penuh semua data
@@ -43,23 +46,17 @@ Error:   {"status": false, "message": "..."}
 
 employeesBp = Blueprint("employeesBp", __name__)
 service = EmployeeService()
-session = SessionService()
 utility = Utility()
 
 
 
 @employeesBp.route("/all", methods=["GET"])
+@require_roles("owner", "manager")
 def allEmployees():
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    result = session.checkAccess(["owner", "manager"], token)
-    if result["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    if result["data"]["role"] == "manager":
-        print("[INFO] Branch ID IN GET ALL EMPLOYEES:", result["data"]["branchId"])
-        data = service.getAllEmployee(result["data"]["branchId"])
+    currentUser = getCurrentUser()
+    if currentUser["role"] == "manager":
+        logger.debug("[INFO] Branch ID IN GET ALL EMPLOYEES: %s", currentUser['branchId'])
+        data = service.getAllEmployee(currentUser["branchId"])
     else: 
         data = service.getAllEmployee()
             
@@ -67,35 +64,27 @@ def allEmployees():
 
 
 @employeesBp.route("/create", methods=["POST"])
+@require_roles("owner", "manager")
 def createEmployee():
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     data = request.get_json()
     
     if not data:
         return jsonify({"status": False, "message": "No data found"}), 400
     
-    if currentUser['data']['role'] == "manager":
-        data['branchId'] = currentUser['data']['branchId']
-    insertData = service.newEmployee(data, employee=currentUser["data"])
+    if currentUser['role'] == "manager":
+        data['branchId'] = currentUser['branchId']
+    insertData = service.newEmployee(data, employee=currentUser)
     if not insertData.get("status"):
         return jsonify(insertData), 400
     return jsonify(insertData), 200
 
 
 @employeesBp.route("/update/<id>", methods=["PUT"])
+@require_roles("owner", "manager")
 def updateEmployee(id):
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
@@ -106,43 +95,30 @@ def updateEmployee(id):
     if not data:
         return jsonify({"status": False, "message": "No data found"}), 400
     
-    updateData = service.updateEmploye(data, id, currentUser["data"])
+    updateData = service.updateEmploye(data, id, currentUser)
     if not updateData.get("status"):
         return jsonify(updateData), 400
     return jsonify(updateData), 200
 
 
 @employeesBp.route("/fire/<id>", methods=["PUT"])
+@require_roles("owner", "manager")
 def fireEmployee(id):
-    print("[INFO ROUTES] GET TOKEN FIRE EMPLOYEE")
-    token = request.cookies.get("token")
-    print("token : ", token)
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
     id = sanitizedId
     
-    fireData = service.fireEmployee(employee=currentUser["data"], id=id)
+    fireData = service.fireEmployee(employee=currentUser, id=id)
     if not fireData.get("status"):
         return jsonify(fireData), 400
-    print("fireData: ", fireData)
+    logger.debug("fireData: %s", fireData)
     return jsonify(fireData), 200
 
 @employeesBp.route("/<id>", methods=["GET"])
+@require_roles("owner", "manager", "employee")
 def employeeDetails(id):
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager", "employee"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
@@ -153,49 +129,34 @@ def employeeDetails(id):
     
     
 @employeesBp.route("/delete/<id>", methods=["DELETE"])
+@require_roles("owner", "manager")
 def deleteEmployee(id):
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
     id = sanitizedId
     
-    data = service.deleteEmployee( id=id, employee=currentUser["data"] )
+    data = service.deleteEmployee( id=id, employee=currentUser )
     return jsonify(data), 200
 
 @employeesBp.route("/activate/<id>", methods=["PUT"])
+@require_roles("owner", "manager")
 def  activateEmployee(id):
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    currentUser = getCurrentUser()
     
     utility.blockMongoInject(id)
     sanitizedId = utility.sanitizeHTML(id)
     id = sanitizedId
     
-    data = service.activateEmployee(id=id, employee=currentUser["data"])
+    data = service.activateEmployee(id=id, employee=currentUser)
     return jsonify(data), 200   
 
 @employeesBp.route("/profile", methods=["GET"])
+@require_roles("owner", "manager", "employee")
 def employeeProfile():
-    print("[INFO] MASUK EMPLOYEE PROFILE")
-    token = request.cookies.get("token")
-    if not token:
-        return jsonify({"status": False, "message": "No token found"}), 400
-    currentUser = session.checkAccess(["owner", "manager", "employee"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
+    logger.debug("[INFO] MASUK EMPLOYEE PROFILE")
+    currentUser = getCurrentUser()
        
-    data = service.employeeProfile(currentUser["data"])
+    data = service.employeeProfile(currentUser)
     return jsonify(data), 200
\ No newline at end of file
@@ -1,30 +1,41 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, make_response
+from flask import Blueprint, render_template, request, jsonify, redirect
 from service.historyService import HistoryService
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, getCurrentUser
+import logging
+
+logger = logging.getLogger(__name__)
 
 historyRoutesBp = Blueprint("historyRoutesBp", __name__)
 service = HistoryService()
-session = SessionService()
 
 @historyRoutesBp.route("/all", methods=["GET"])
+@require_roles("owner")
 def getAllHistory():
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner"], token)
-    print("CURRENT USER:", currentUser)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    data = service.getAllHistory()
+    filters = {
+        "type": request.args.get("type"),
+        "employeeId": request.args.get("employeeId"),
+        "start": request.args.get("start"),
+        "end": request.args.get("end"),
+    }
+    try:
+        data = service.getAllHistory(filters=filters, limit=request.args.get("limit"), cursor=request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"status": False, "message": str(e)}), 400
     return jsonify(data), 200
 
 @historyRoutesBp.route("/all/user", methods=["GET"])
+@require_roles("owner", "manager", "employee")
 def getUserHistory():
-    print("-----------[GET USER HISTORY]-----------")
-    token = request.cookies.get("token")
-    currentUser = session.checkAccess(["owner", "manager", "employee"], token)
-    if currentUser["status"] == False:
-        response = make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
-        return response
-    print("OTW KE SERVICE")
-    data = service.getUserHistory(currentUser["data"]["_id"])
+    logger.debug("-----------[GET USER HISTORY]-----------")
+    currentUser = getCurrentUser()
+    logger.debug("OTW KE SERVICE")
+    filters = {
+        "type": request.args.get("type"),
+        "start": request.args.get("start"),
+        "end": request.args.get("end"),
+    }
+    try:
+        data = service.getUserHistory(currentUser["_id"], filters=filters, limit=request.args.get("limit"), cursor=request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"status": False, "message": str(e)}), 400
     return jsonify(data), 200
\ No newline at end of file
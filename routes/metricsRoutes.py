@@ -0,0 +1,31 @@
+from flask import Blueprint, request, Response, jsonify
+from utils.config import Config
+from utils import metrics
+import hmac
+
+metricsBp = Blueprint("metricsBp", __name__)
+
+
+@metricsBp.route("/metrics", methods=["GET"])
+def exposeMetrics():
+    """
+    Metrics proses ini dalam format teks Prometheus.
+
+    Endpoint hanya aktif kalau METRICS_ENABLED=true dan METRICS_TOKEN diisi,
+    jadi metrics tidak pernah terbuka tanpa autentikasi.
+
+    Headers:
+        Authorization: Bearer <METRICS_TOKEN>
+
+    Status Codes:
+        - 200: Metrics
+        - 401: Token scraper salah
+        - 404: METRICS_ENABLED=false atau METRICS_TOKEN kosong
+    """
+    if not Config.METRICS_ENABLED or not Config.METRICS_TOKEN:
+        return jsonify({"status": False, "message": "Not found"}), 404
+    # dibandingkan sebagai bytes: compare_digest menolak str yang berisi karakter non-ASCII
+    expected = f"Bearer {Config.METRICS_TOKEN}".encode()
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected):
+        return jsonify({"status": False, "message": "Unauthorized"}), 401
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
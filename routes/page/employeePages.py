@@ -1,28 +1,22 @@
-from flask import blueprints, render_template, request, redirect
-from utils.jwtHandler import SessionService
+from flask import blueprints, render_template, redirect
+from utils.jwtHandler import require_roles
 
 
 EmployeePageBp = blueprints.Blueprint("EmployeePageBp", __name__)
 
 
 @EmployeePageBp.route("/history", methods=["GET"])
+@require_roles("employee", redirectTo="/notHaveAccess")
 def historyAttendance():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["employee"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("employee/attendanceHistory.html")
     except Exception as e:
         return redirect("/")    
 
 @EmployeePageBp.route("/leave-request", methods=["GET"])
+@require_roles("employee", "manager", redirectTo="/notHaveAccess")
 def annualRequest():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["employee", "manager"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("employee/leaveRequest.html")
     except Exception as e:
         return redirect("/")
\ No newline at end of file
@@ -1,36 +1,27 @@
-from flask import blueprints, render_template, request, redirect, jsonify
-from utils.jwtHandler import SessionService
+from flask import blueprints, render_template, redirect, jsonify
+from utils.jwtHandler import require_roles
 
 ManagerPageBp = blueprints.Blueprint("ManagerPageBp", __name__)
 @ManagerPageBp.route("/shift-schedule", methods=["GET"])
+@require_roles("manager", redirectTo="/notHaveAccess")
 def branchPerformance():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["manager"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("manager/shiftManage.html")
     except Exception as e:
         return redirect("/")
     
 @ManagerPageBp.route("/leave-request", methods=["GET"])
+@require_roles("manager", redirectTo="/notHaveAccess")
 def annualRequest():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["manager"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("manager/leaveRequestManage.html")
     except Exception as e:
         return redirect("/")
     
 @ManagerPageBp.route("/history", methods=["GET"])
+@require_roles("manager", redirectTo="/notHaveAccess")
 def history():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["manager"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("employee/attendanceHistory.html")
     except Exception as e:
         return redirect("/")
@@ -1,51 +1,39 @@
-from flask import Blueprint, render_template, request, redirect, jsonify
-from utils.jwtHandler import SessionService
+from flask import Blueprint, render_template, redirect, jsonify
+from utils.jwtHandler import require_roles
+import logging
+
+logger = logging.getLogger(__name__)
 
 OwnerPageBp = Blueprint("OwnerPageBp", __name__)
 
 @OwnerPageBp.route("/branch-manage", methods=["GET"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def branchManage():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser['status'] == False:
-            return render_template("notHaveAccess.html")
         return render_template("owner/branchManage.html")
     except Exception as e:
-        print("[ERROR] Unexpected error:", e)
+        logger.error("[ERROR] Unexpected error: %s", e)
         return redirect("/")
 @OwnerPageBp.route("/branch-performance/<id>", methods=["GET"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def branchPerformance():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser['status'] == False:
-            return render_template("notHaveAccess.html")
         return render_template("branchPerformance.html")
     except Exception as e:
         return redirect("/")
     
 @OwnerPageBp.route("/leave-request", methods=["GET"])
+@require_roles("owner", redirectTo="/notHaveAccess")
 def annualRequest():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner"], token)
-        if currentUser['status'] == False:
-            return redirect("/notHaveAccess")
         return render_template("manager/leaveRequestManage.html")
     except Exception as e:
         return redirect("/")
 
 @OwnerPageBp.route("/history", methods=["GET"])
+@require_roles("owner", "manager", "employee", redirectTo="/notHaveAccess")
 def history():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner", "manager", "employee"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser['status'] == False:
-            return render_template("notHaveAccess.html")
         return render_template("owner/historyLog.html")
     except Exception as e:
         return redirect("/")
\ No newline at end of file
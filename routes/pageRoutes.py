@@ -1,12 +1,13 @@
 from flask import Blueprint, render_template,make_response, request, redirect, jsonify, abort
-from utils.jwtHandler import SessionService
 from routes.page.ownerPages import OwnerPageBp
 from routes.page.managerPages import ManagerPageBp
 from routes.page.employeePages import EmployeePageBp
-from utils.jwtHandler import SessionService
+from utils.jwtHandler import require_roles, currentAuth, getCurrentUser
+import logging
+
+logger = logging.getLogger(__name__)
 
 pageBp = Blueprint("pageBp", __name__)
-checkAccess = SessionService().checkAccess()
 pageBp.register_blueprint(OwnerPageBp, url_prefix="/owner")
 pageBp.register_blueprint(ManagerPageBp, url_prefix="/manager")
 pageBp.register_blueprint(EmployeePageBp, url_prefix="/employees")
@@ -21,37 +22,33 @@ def index():
     """
     try:
         token = request.cookies.get("token")
-        print("TOKEN:", token)
         if token != "" and token != None:
-            print("TOKEN:", token)
-            currentUser = SessionService().validateToken(token)
-            print("CURRENT USER:", currentUser)
-            if currentUser["status"] == False:
+            currentUser = currentAuth()
+            logger.debug("CURRENT USER: %s", currentUser)
+            if currentUser["message"] == "Token not found":
                 response = make_response(render_template("notHaveAccess.html"), 403)
                 response.set_cookie("token", "", expires=0)
                 return response
-            return redirect("/dashboard")
+            if currentUser["status"] == True:
+                return redirect("/dashboard")
         return render_template("authPage.html")
     except Exception as e:
-        print("Token invalid atau expired:", e)
+        logger.debug("Token invalid atau expired: %s", e)
 
     return render_template("authPage.html")
         
 @pageBp.route("/dashboard", methods=["GET"])
+@require_roles("owner", "manager", "employee", redirectTo="/notHaveAccess")
 def dashboard():
     """
     Menentukan tampilan dashboard berdasarkan role user.
     Hanya role: owner, manager, atau employee yang diizinkan.
     """
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner", "manager", "employee"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser["status"] == False:
-                return redirect("/notHaveAccess")
-        role = currentUser['data']['role']
-        print("[INFO] Role:", role)
-        print("CURRENT USER:", currentUser)
+        currentUser = getCurrentUser()
+        role = currentUser['role']
+        logger.debug("[INFO] Role: %s", role)
+        logger.debug("CURRENT USER: %s", currentUser)
 
         if role == "owner":
             return render_template("owner/dashboardOwner.html")
@@ -67,30 +64,17 @@ def dashboard():
 
     
 @pageBp.route("/employee-manage", methods=["GET"])
+@require_roles("owner", "manager", redirectTo="/notHaveAccess")
 def employee():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner", "manager", "employee"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser["status"] == False:
-                return redirect("/notHaveAccess")
-        role = currentUser['data']['role']
-
-        if role == "owner" or role == "manager":
-            return render_template("/employeeManage.html")
-        else :
-            return 403
+        return render_template("/employeeManage.html")
     except Exception as e:
         return jsonify({"message": "error", "error": str(e)}), 500
     
 @pageBp.route("/profile", methods=["GET"])
+@require_roles("owner", "manager", "employee", redirectTo="/notHaveAccess")
 def profile():
     try:
-        token = request.cookies.get("token")
-        currentUser = SessionService().checkAccess(["owner", "manager", "employee"], token)
-        print("CURRENT USER:", currentUser)
-        if currentUser["status"] == False:
-                return redirect("/notHaveAccess")
         return render_template("profileUser.html")
     except Exception as e:
         return jsonify({"message": "error", "error": str(e)}), 500
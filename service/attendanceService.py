@@ -2,16 +2,18 @@ from repo.attendanceRepo import AttendanceRepo
 from repo.storeRepo import StoreRepo
 from repo.shiftsRepo import ShiftsRepo
 from repo.EmployeeRepo import EmployeeRepo
-from validation.attendanceSchema import ShiftListSchema, EmployeeAttendanceSchema, updateListSchema
-from validation.storeSchema import GeometrySchema
-from validation.employeeSchema import EmployeeSchema
+from repo.employeeScheduleRepo import EmployeeScheduleRepo
+from validation.attendanceSchema import EmployeeAttendanceSchema, updateListSchema, ShiftPlanSchema, REST_DAY, MANAGER_SHIFT
+from validation.registry import shiftListSchema, shiftListDumper, employeeSchema, employeeDumper, geometrySchema
 from marshmallow import ValidationError
 from service.historyService import HistoryService
+from utils.clockLog import clockEventLog
+from utils.config import Config
+from datetime import datetime, time, timedelta
 import pendulum
 import random
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AttendanceService:
@@ -82,13 +84,44 @@ class AttendanceService:
     """
     def __init__(self):
         self.repo = AttendanceRepo()
-        self.shiftListSchema = ShiftListSchema()
+        self.shiftListSchema = shiftListSchema
         self.EmploAttendSchema = EmployeeAttendanceSchema()
         self.storeRepo = StoreRepo()
         self.shiftsRepo = ShiftsRepo()
         self.employeeRepo = EmployeeRepo()
-        self.employeeSchema = EmployeeSchema()
+        self.employeeSchema = employeeSchema
         self.updateShiftSchema = updateListSchema()
+        self.shiftPlanSchema = ShiftPlanSchema()
+        self.scheduleRepo = EmployeeScheduleRepo()
+
+    def hydrateEmployees(self, shifts):
+        """
+        Mengisi field `employee` di setiap entry `employees` pada list shift.
+
+        Semua employeeId unik dikumpulkan lalu diambil dengan SATU query `$in`
+        (tanpa field password), dan setiap employee cukup di-dump sekali pakai
+        schema yang sama. Entry dengan employeeId yang sama akan berbagi dict
+        hasil dump.
+
+        Args:
+            shifts (list): List dokumen shift (hasil dump atau raw dari database)
+
+        Returns:
+            list: List shift yang sama, dengan `employee` terisi di tiap entry
+        """
+        employeeIds = {
+            emp["employeeId"]
+            for shift in shifts
+            for emp in shift.get("employees", [])
+        }
+        employees = {
+            employee["_id"]: employeeDumper.dump(employee)
+            for employee in self.employeeRepo.getDataByIds(employeeIds)
+        }
+        for shift in shifts:
+            for emp in shift.get("employees", []):
+                emp["employee"] = employees.get(emp["employeeId"], {})
+        return shifts
 
     def getAttendanceByStore(self, storeId, date=None):
         """
@@ -139,23 +172,21 @@ class AttendanceService:
         try:
             date = pendulum.parse(date, tz="UTC")
             data = self.repo.getData(query={"branchId": storeId, "Date": date})
-            print("[ATTENDANCE]data = ", data)
+            logger.debug("[ATTENDANCE]data = %s", data)
             if not data:
                 return {"status": False, "message": "No data found", "data": None}
-            print("===== get data = ", data)
+            logger.debug("===== get data = %s", data)
             
             if not data:
                 return {"status": False, "message": "No data found", "data": None}
             
-            validated = self.shiftListSchema.dump(data)
-            print("validated = ", validated)
+            validated = shiftListDumper.dump(data)
+            logger.debug("validated = %s", validated)
             
             
-            for emp in validated["employees"]:
-                employee = self.employeeRepo.getDataById(id=emp["employeeId"])
-                emp["employee"] = self.employeeSchema.dump(employee)
-                
-            print("validated = ", validated )
+            self.hydrateEmployees([validated])
+
+            logger.debug("validated = %s", validated)
             return {
                 "status": True, 
                 "message": "Data fetched successfully", 
@@ -174,6 +205,17 @@ class AttendanceService:
         - Waktu clock out sudah melewati waktu akhir shift
         - Lokasi clock out berada dalam radius yang diizinkan dari store
         
+        Validasi status + waktu dan update `clockOut` dilakukan dalam satu
+        find_one_and_update (arrayFilters `clockOut` masih kosong); counter
+        workDays/lateDays lewat bulk_write. Clock out ulang tidak menambah
+        counter lagi.
+
+        Kedua write tidak dalam satu transaction (MongoDB standalone untuk
+        development tidak mendukung transaction). Kalau increment counter gagal
+        setelah clockOut tersimpan, clock out tetap dianggap berhasil dan
+        kegagalannya di-log ERROR (employeeId + counter) untuk dikoreksi manual;
+        clock out ulang ditolak, jadi counter tidak akan tertambah sendiri.
+        
         Args:
             data (dict): Data clock out berisi:
                 - shiftId (str): ID shift hari ini
@@ -207,73 +249,40 @@ class AttendanceService:
             {'status': True, 'message': 'Data updated successfully'}
         """
         try:
-            print("=================================== EMPLOYEE CLOCK OUT SERVICE ==================================")
+            logger.debug("=================================== EMPLOYEE CLOCK OUT SERVICE ==================================")
             now = pendulum.now("Asia/Jakarta")
             branchId = employee["branchId"]
             employeeId = employee["_id"]
-            geometry = GeometrySchema().load(data["geometry"])
+            geometry = geometrySchema.load(data["geometry"])
             coordinates = geometry["coordinates"]
             
-            shiftParent = self.repo.getDataById(id=data["shiftId"])
-            
-            employeeShift = None
-            endTime = None
-            isLate = False
-
-            for emp in shiftParent["employees"]:
-                if emp["employeeId"] == employeeId:
-                    if emp["clockIn"] is None or emp["clockIn"] == "":
-                        return {"status": False, "message": "Employee not clocked in"}
-                    employeeShift = emp["shift"]
-                    if emp["status"] == "late":
-                        isLate = True
-                    print("employeeShift = ", employeeShift)
-                    break
-
-            if employeeShift is None:
-                return {"status": False, "message": "Employee not found in shift"}
-            
-            shiftTime = self.shiftsRepo.getAllData()
-            for shift in shiftTime:
-                if shift["shiftName"] == employeeShift:
-                    endTime = pendulum.parse(shift["shiftEndTime"], tz="Asia/Jakarta") 
-                    break
-            if endTime > now:
-                return {"status": False, "message": "Clock out time is not yet"}
-                
             cek = self.storeRepo.validateCheckIn(coordinates=coordinates, branchId=branchId)
             if cek is None:
                 return {"status": False, "message": "Location is outside the allowed radius"}
 
+            # shift yang jam selesainya sudah lewat; cek waktu + update dalam satu query
+            shiftMap = self.shiftsRepo.getShiftMap()
+            endedShifts = [name for name, shift in shiftMap.items() if shift["endTime"] <= now.time()]
             current_time = now.to_time_string()
-            
-            result = self.repo.updateData(
-                query={
-                    "_id": data["shiftId"],
-                    "employees.employeeId": employeeId
-                },
-                update={
-                    "$set": {
-                        "employees.$.clockOut": current_time
-                    }
-                }
+
+            updated = self.repo.clockOut(
+                shiftId=data["shiftId"],
+                employeeId=employeeId,
+                clockOut=current_time,
+                endedShifts=endedShifts,
             )
-            
-            if not result.acknowledged:
-                return {"status": False, "message": "Failed to update data"}
-            
-            if isLate:
-                self.employeeRepo.updateData(query={"_id" : employeeId }, update={
-                    "$inc" : {
-                        "lateDays" : 1
-                    }
-                })
-            else : 
-                self.employeeRepo.updateData(query={"_id" : employeeId }, update={
-                    "$inc" : {
-                        "workDays" : 1
-                    }
-                })
+
+            if updated is None:
+                return self.clockOutRejected(data["shiftId"], employeeId, shiftMap)
+
+            entry = updated["employees"][0]
+            counter = "lateDays" if entry.get("status") == "late" else "workDays"
+            try:
+                self.employeeRepo.incrementCounters({employeeId: {counter: 1}})
+            except Exception as e:
+                # clockOut sudah tersimpan dan tidak bisa diulang; catat untuk koreksi manual
+                logger.error("Clock out %s saved but %s +1 for %s failed: %s", data["shiftId"], counter, employeeId, e)
+            self.updateSchedules([(data["shiftId"], employeeId, {"clockOut": current_time})])
             
             history = HistoryService().createHistory(data={
                 "employeeId": employee["_id"],
@@ -291,6 +300,121 @@ class AttendanceService:
             raise Exception(f"Failed to clock out: {str(e)}")
         
 
+    def applyClockEvents(self, events):
+        """
+        Terapkan satu batch event clock in dari clockEventLog (mode burst).
+
+        Semua event ditulis dengan satu bulk_write, lalu entry hasilnya dibaca
+        ulang dengan satu query `$in` untuk menentukan event mana yang benar-benar
+        tersimpan (clockIn di database sama dengan clockIn event). History hanya
+        dibuat untuk event tersebut, dengan createdAt = waktu event diterima.
+        Event yang ditolak (sudah clock in, bukan shift-nya, dll) cukup di-log.
+
+        Args:
+            events (list): Event dari employeeClockIn berisi shiftId, employeeId,
+                           employeeName, clockIn, presentShifts, lateShifts, receivedAt
+
+        Returns:
+            int: Jumlah clock in yang tercatat
+
+        Notes:
+            - Kalau proses mati setelah bulk_write tapi sebelum offset log maju,
+              batch dibaca ulang; update-nya tidak berefek tapi history bisa tercatat dua kali.
+        """
+        try:
+            if self.repo.applyClockIns(events) is None:
+                return 0
+            shiftIds = list({event["shiftId"] for event in events})
+            shifts = self.repo.getAllData(
+                query={"_id": {"$in": shiftIds}},
+                projection={"employees.employeeId": 1, "employees.clockIn": 1, "employees.status": 1},
+            )
+            entries = {
+                (shift["_id"], emp["employeeId"]): emp
+                for shift in shifts
+                for emp in shift.get("employees", [])
+            }
+            recorded = set()
+            scheduleUpdates = []
+            for event in events:
+                key = (event["shiftId"], event["employeeId"])
+                entry = entries.get(key)
+                if key in recorded or entry is None or entry.get("clockIn") != event["clockIn"]:
+                    logger.warning("Clock in event rejected: %s", event)
+                    continue
+                recorded.add(key)
+                scheduleUpdates.append((event["shiftId"], event["employeeId"], {"clockIn": entry["clockIn"], "status": entry["status"]}))
+                HistoryService().createHistory(data={
+                    "employeeId": event["employeeId"],
+                    "employeeName": event["employeeName"],
+                    "description": f"Clocked in successfully as {entry['status']}",
+                    "type": "attendance",
+                    "createdAt": event["receivedAt"],
+                })
+            self.updateSchedules(scheduleUpdates)
+            return len(recorded)
+        except Exception as e:
+            raise Exception(f"Failed to apply clock events: {str(e)}")
+
+    def syncSchedules(self, shifts):
+        """
+        Samakan projection `employeeSchedules` dengan dokumen shift yang baru ditulis.
+
+        Dokumen shift di `attendances` tetap sumber utama, jadi kegagalan di sini
+        hanya di-log; projection bisa dibangun ulang dengan `python -m utils.backfill`.
+        """
+        try:
+            self.scheduleRepo.syncShifts([shift for shift in shifts if shift])
+        except Exception as e:
+            logger.error("Failed to sync employee schedules: %s", e)
+
+    def updateSchedules(self, updates):
+        """Salin clock in/out ke projection `employeeSchedules` (lihat syncSchedules)."""
+        try:
+            self.scheduleRepo.updateEntries(updates)
+        except Exception as e:
+            logger.error("Failed to update employee schedules: %s", e)
+
+    def clockInRejected(self, shiftId, employeeId, shiftMap):
+        """
+        Cari alasan clock in tidak meng-update apa pun (hanya dipanggil di path gagal).
+
+        Clock in ulang dianggap idempotent: response sukses dengan status yang
+        sudah tersimpan, tanpa mengubah data.
+        """
+        shiftParent = self.repo.getEmployeeEntry(shiftId, employeeId)
+        if shiftParent is None:
+            return {"status": False, "message": "Shift not found"}
+        if not shiftParent.get("employees"):
+            return {"status": False, "message": "Employee not found in shift"}
+        entry = shiftParent["employees"][0]
+        if entry.get("clockIn"):
+            return {"status": True, "message": f"Already clocked in as {entry.get('status')}"}
+        if entry.get("shift") not in shiftMap:
+            return {"status": False, "message": "Shift time not found"}
+        return {"status": False, "message": "Employee clock in time is outside the shift time"}
+
+    def clockOutRejected(self, shiftId, employeeId, shiftMap):
+        """
+        Cari alasan clock out tidak meng-update apa pun (hanya dipanggil di path gagal).
+
+        Clock out ulang dianggap idempotent: response sukses tanpa menambah
+        counter workDays/lateDays lagi.
+        """
+        shiftParent = self.repo.getEmployeeEntry(shiftId, employeeId)
+        if shiftParent is None:
+            return {"status": False, "message": "Shift not found"}
+        if not shiftParent.get("employees"):
+            return {"status": False, "message": "Employee not found in shift"}
+        entry = shiftParent["employees"][0]
+        if not entry.get("clockIn"):
+            return {"status": False, "message": "Employee not clocked in"}
+        if entry.get("clockOut"):
+            return {"status": True, "message": "Already clocked out"}
+        if entry.get("shift") not in shiftMap:
+            return {"status": False, "message": "Shift time not found"}
+        return {"status": False, "message": "Clock out time is not yet"}
+
     def employeeClockIn(self, data, employee):
         """
         Proses clock in karyawan dengan validasi lokasi dan waktu.
@@ -305,6 +429,15 @@ class AttendanceService:
         - Late: Clock in lebih dari 10 menit setelah shift dimulai
         - Tidak bisa clock in: Lebih dari 30 menit sebelum shift dimulai
         
+        Cek waktu dan update dilakukan dalam satu find_one_and_update dengan
+        arrayFilters (entry hanya berubah kalau `clockIn` masih kosong), jadi
+        request paralel tidak saling menimpa dan clock in ulang idempotent.
+
+        Jika Config.CLOCK_BURST_MODE aktif, setelah cek lokasi dan jam shift
+        event clock in (dengan jam server saat request diterima) hanya ditulis
+        ke clockEventLog lalu langsung dijawab "Clock in received". Update ke
+        `attendances` dan history dilakukan per batch oleh applyClockEvents().
+        
         Args:
             data (dict): Data clock in berisi:
                 - shiftId (str): ID shift hari ini
@@ -339,89 +472,63 @@ class AttendanceService:
             {'status': True, 'message': 'Clocked in successfully as present'}
         """
         try:
-            print("=================================== EMPLOYEE CLOCK IN SERVICE ==================================")
-            print("data = ", data)
+            logger.debug("=================================== EMPLOYEE CLOCK IN SERVICE ==================================")
+            logger.debug("data = %s", data)
             employeeId = employee["_id"]
             branchId = employee["branchId"]
-            geometry = GeometrySchema().load(data["geometry"])
+            geometry = geometrySchema.load(data["geometry"])
             coordinates = geometry["coordinates"]
 
             cek = self.storeRepo.validateCheckIn(coordinates=coordinates, branchId=branchId)
             if cek is None:
                 return {"status": False, "message": "Location is outside the allowed radius"}
             
-            shiftParent = self.repo.getDataById(id=data["shiftId"])
-            shiftTime = self.shiftsRepo.getAllData()
-
-            employeeShift = None
-            startTime = None
-
-            for emp in shiftParent["employees"]:
-                if emp["employeeId"] == employeeId:
-                    employeeShift = emp["shift"]
-                    print("employeeShift = ", employeeShift)
-                    break
-
-            if employeeShift is None:
-                return {"status": False, "message": "Employee not found in shift"}
-
-            for shift in shiftTime:
-                if shift["shiftName"] == employeeShift:
-                    startTime = shift["shiftStartTime"]
-                    break
-
-            if startTime is None:
-                return {"status": False, "message": "Shift time not found"}
-
-            print("startTime = ", startTime)
-
             now = pendulum.now("Asia/Jakarta")
-            print("now = ", now)
-            current_time = now.to_time_string()    
-
-            shift_start = pendulum.from_format(startTime, "HH:mm:ss", tz="Asia/Jakarta")
-            late_limit = shift_start.add(minutes=10)
-            early_limit = shift_start.subtract(minutes=30)
-
-            print("early_limit = ", early_limit)
-            print("now.time() = ", now.time())
-            print("early_limit.time() = ", early_limit.time())
-
-            if now.time() < early_limit.time():
-                print("now.time() < early_limit.time()")
-                return {"status": False, "message": "Employee clock in time is outside the shift time"}
+            logger.debug("now = %s", now)
+            current_time = now.to_time_string()
 
-            if now.time() > late_limit.time():
-                status = "late"
-            else:
-                status = "present"
+            # status per nama shift untuk jam sekarang: present (<= 10 menit setelah
+            # mulai), late (> 10 menit), atau belum boleh clock in (< 30 menit sebelum)
+            shiftMap = self.shiftsRepo.getShiftMap()
+            presentShifts, lateShifts = [], []
+            for name, shift in shiftMap.items():
+                startTime = shift["startTime"]
+                if now.time() < startTime.subtract(minutes=30):
+                    continue
+                if now.time() > startTime.add(minutes=10):
+                    lateShifts.append(name)
+                else:
+                    presentShifts.append(name)
 
-            payload = {
-                "employeeId": employeeId,
-                "clockIn": current_time,
-                "clockOut": None,
-                "status": status
-            }
-            validated = self.EmploAttendSchema.load(payload)
-            print("[validated] = ", validated)
+            if Config.CLOCK_BURST_MODE:
+                # mode burst: simpan event ke write-ahead log, ditulis ke database per batch
+                if not presentShifts and not lateShifts:
+                    return {"status": False, "message": "Employee clock in time is outside the shift time"}
+                clockEventLog.append({
+                    "shiftId": data["shiftId"],
+                    "employeeId": employeeId,
+                    "employeeName": employee["name"],
+                    "clockIn": current_time,
+                    "presentShifts": presentShifts,
+                    "lateShifts": lateShifts,
+                    "receivedAt": now.isoformat(),
+                })
+                return {"status": True, "message": "Clock in received"}
 
-            result = self.repo.updateData(
-                query={
-                    "_id": data["shiftId"],
-                    "employees.employeeId": employeeId
-                },
-                update={ 
-                    "$set": {
-                        "employees.$.clockIn": validated["clockIn"],
-                        "employees.$.status": validated["status"]
-                    }
-                }
+            updated = self.repo.clockIn(
+                shiftId=data["shiftId"],
+                employeeId=employeeId,
+                clockIn=current_time,
+                presentShifts=presentShifts,
+                lateShifts=lateShifts,
             )
+            logger.debug("[RESULT CLOCK IN] = %s", updated)
 
-            print(f"[RESULT UPDATE STATUS TO {status.upper()}] = ", result)
+            if updated is None:
+                return self.clockInRejected(data["shiftId"], employeeId, shiftMap)
 
-            if not result.acknowledged:
-                return {"status": False, "message": "Failed to clock in"}
+            status = updated["employees"][0]["status"]
+            self.updateSchedules([(data["shiftId"], employeeId, {"clockIn": current_time, "status": status})])
             
             history = HistoryService().createHistory(data={
                 "employeeId": employeeId,
@@ -498,16 +605,16 @@ class AttendanceService:
             shift_id = f"SHF_{pendulum.now().to_date_string()}_{str(random.randint(1000, 9999))}"
             data["_id"] = shift_id
             date = pendulum.parse(data["Date"], tz="UTC")
-            print("-----------DATA ----------: ", date)
-            existingShift = self.repo.getData(query={"Date": date, "branchId": data["branchId"]})
-            print("=====EXISTING SHIFT: ", existingShift)
+            logger.debug("-----------DATA ----------: %s", date)
+            existingShift = self.repo.getData(query={"Date": date, "branchId": data["branchId"]}, projection={"_id": 1})
+            logger.debug("=====EXISTING SHIFT: %s", existingShift)
             if existingShift:
                 return {"status": False, "message": "Shift already exists for this date"}
-            valid_shifts = [s["shiftName"] for s in self.shiftsRepo.getAllData()]
-            print("VALID SHIFTS:", valid_shifts)
+            valid_shifts = self.shiftsRepo.getShiftMap()
+            logger.debug("VALID SHIFTS: %s", valid_shifts.keys())
             manager = {
                 "employeeId": currentUser["_id"],
-                "shift": "fullday",
+                "shift": MANAGER_SHIFT,
                 "clockIn": None,
                 "clockOut": None
             }
@@ -516,7 +623,7 @@ class AttendanceService:
                 if emp["shift"] not in valid_shifts:
                     raise Exception(f"Invalid shift name: {emp['shift']}")
                 validated_employees.append(self.EmploAttendSchema.load(emp))
-            print("[VALIDATED EMPLOYEES]:", validated_employees)
+            logger.debug("[VALIDATED EMPLOYEES]: %s", validated_employees)
 
             data["employees"] = validated_employees
 
@@ -525,6 +632,7 @@ class AttendanceService:
 
             if not result.acknowledged:
                 return {"status": False, "message": "Failed to insert shift data"}
+            self.syncSchedules([validated_data])
 
             history = HistoryService().createHistory(data={
                 "employeeId": currentUser["_id"],
@@ -544,6 +652,141 @@ class AttendanceService:
             raise Exception(f"Failed to insert shift data: {str(e)}")
     
     
+    def planShifts(self, data, currentUser):
+        """
+        Menyimpan jadwal shift banyak hari sekaligus (bulk planner).
+        
+        Seluruh rencana divalidasi sekali (schema, nama shift terhadap master
+        shift, dan karyawan harus ada di branch manager), lalu semua hari
+        ditulis dengan satu insert_many ke `attendances`. Hari yang sudah punya
+        shift dicari dengan satu query `$in` sebelum insert (bukan cek per hari),
+        dan index unik (branchId, Date) menolak insert paralel yang lolos cek;
+        hari yang bentrok dilaporkan di `conflicts`.
+        Hari tanpa karyawan terjadwal tidak dibuat.
+        
+        Args:
+            data (dict): Rencana shift (lihat ShiftPlanSchema) berisi:
+                - startDate (str): "YYYY-MM-DD"
+                - endDate (str): "YYYY-MM-DD" (inklusif)
+                - rotation (list): [{"employeeId": str, "pattern": ["Day", "Night", "off", ...]}]
+                  atau
+                - roster (dict): {"YYYY-MM-DD": [{"employeeId": str, "shift": str}]}
+            currentUser (dict): Manager yang membuat jadwal (_id, name, branchId)
+                
+        Returns:
+            dict: Dictionary berisi:
+                - status (bool): True jika minimal satu hari tersimpan
+                - message (str): Pesan hasil operasi
+                - data (dict): {"created": [tanggal], "conflicts": [{"date", "message"}]}
+                
+        Raises:
+            ValidationError: Jika data tidak sesuai dengan schema
+            Exception: Jika terjadi error saat menyimpan data
+            
+        Example:
+            >>> planShifts(
+            ...     {
+            ...         "startDate": "2025-11-01",
+            ...         "endDate": "2025-11-30",
+            ...         "rotation": [
+            ...             {"employeeId": "EMP001", "pattern": ["Day", "Day", "Night", "off"]},
+            ...             {"employeeId": "EMP002", "pattern": ["Night", "off", "Day", "Day"]}
+            ...         ]
+            ...     },
+            ...     {"_id": "MGR001", "name": "Manager", "branchId": "STR001"}
+            ... )
+            {'status': True, 'message': 'Shift plan saved', 'data': {'created': ['2025-11-01', ...], 'conflicts': [{'date': '2025-11-03', 'message': 'Shift already exists for this date'}]}}
+        """
+        try:
+            plan = self.shiftPlanSchema.load(data)
+            branchId = currentUser["branchId"]
+            days = [plan["startDate"] + timedelta(days=n) for n in range((plan["endDate"] - plan["startDate"]).days + 1)]
+
+            roster = {}
+            if "rotation" in plan:
+                for day in days:
+                    offset = (day - plan["startDate"]).days
+                    roster[day] = [
+                        {"employeeId": item["employeeId"], "shift": item["pattern"][offset % len(item["pattern"])]}
+                        for item in plan["rotation"]
+                    ]
+            else:
+                roster = plan["roster"]
+
+            valid_shifts = self.shiftsRepo.getShiftMap()
+            employeeIds = set()
+            for day, entries in roster.items():
+                seen = set()
+                for entry in entries:
+                    if entry.get("shift") == REST_DAY:
+                        continue
+                    if entry.get("shift") not in valid_shifts:
+                        return {"status": False, "message": f"Invalid shift name: {entry.get('shift')} ({day})"}
+                    if entry["employeeId"] in seen:
+                        return {"status": False, "message": f"Employee {entry['employeeId']} scheduled twice on {day}"}
+                    seen.add(entry["employeeId"])
+                employeeIds |= seen
+
+            employees = self.employeeRepo.getDataByIds(list(employeeIds), projection={"branchId": 1})
+            sameBranch = {emp["_id"] for emp in employees if emp.get("branchId") == branchId}
+            unknown = sorted(employeeIds - sameBranch)
+            if unknown:
+                return {"status": False, "message": f"Employees not found in this branch: {', '.join(unknown)}"}
+
+            createdAt = pendulum.now(tz="Asia/Jakarta")
+            shifts, usedIds = [], set()
+            for day in sorted(roster):
+                scheduled = [
+                    {"employeeId": entry["employeeId"], "shift": entry["shift"], "clockIn": None, "clockOut": None, "status": "absent"}
+                    for entry in roster[day] if entry.get("shift") != REST_DAY
+                ]
+                if not scheduled:
+                    continue
+                shiftId = f"SHF_{day.isoformat()}_{random.randint(1000, 9999)}"
+                while shiftId in usedIds:
+                    shiftId = f"SHF_{day.isoformat()}_{random.randint(1000, 9999)}"
+                usedIds.add(shiftId)
+                manager = {"employeeId": currentUser["_id"], "shift": MANAGER_SHIFT, "clockIn": None, "clockOut": None}
+                shifts.append({
+                    "_id": shiftId,
+                    "Date": datetime.combine(day, time.min),
+                    "branchId": branchId,
+                    "employees": [manager] + scheduled,
+                    "createdAt": createdAt,
+                })
+
+            if not shifts:
+                return {"status": False, "message": "No employees scheduled in this plan"}
+
+            errors = self.repo.insertShifts(shifts)
+            failed = {error["index"] for error in errors}
+            created = [shift["Date"].date().isoformat() for i, shift in enumerate(shifts) if i not in failed]
+            conflicts = [
+                {"date": shifts[i]["Date"].date().isoformat(), "message": "Shift already exists for this date"}
+                for i in sorted(failed)
+            ]
+            logger.debug("[PLAN SHIFTS] created: %s conflicts: %s", created, conflicts)
+            self.syncSchedules([shift for i, shift in enumerate(shifts) if i not in failed])
+
+            if not created:
+                return {"status": False, "message": "Shift already exists for all dates", "data": {"created": created, "conflicts": conflicts}}
+
+            history = HistoryService().createHistory(data={
+                "employeeId": currentUser["_id"],
+                "employeeName": currentUser["name"],
+                "description": f"Shift plan inserted {created[0]} - {created[-1]} ({len(created)} days) || {branchId}",
+                "type": "shift"
+            })
+            if not history["status"]:
+                raise Exception("Failed to add history")
+
+            return {"status": True, "message": "Shift plan saved", "data": {"created": created, "conflicts": conflicts}}
+
+        except ValidationError as e:
+            raise ValidationError(e)
+        except Exception as e:
+            raise Exception(f"Failed to insert shift plan: {str(e)}")
+
     # def changeShift(self, data,employee):
     #     try:
     #         print("[UPDATE SHIFT DATA IN SERVICE]:", data)
@@ -607,7 +850,7 @@ class AttendanceService:
             {'status': True, 'message': 'Shift data removed successfully'}
         """
         try:
-            print(" =========[REMOVE SHIFT DATA IN SERVICE]: ===========", id)
+            logger.debug("=========[REMOVE SHIFT DATA IN SERVICE]: =========== %s", id)
             
             result = self.repo.updateData(query={"_id": id}, update={
                     "$pull": {
@@ -619,6 +862,7 @@ class AttendanceService:
             
             if not result.acknowledged:
                 return {"status": False, "message": "Failed to remove shift data"}
+            self.syncSchedules([self.repo.getDataById(id)])
             
             history = HistoryService().createHistory({
                 "employeeId": employee["_id"],
@@ -685,12 +929,12 @@ class AttendanceService:
             {'status': True, 'message': 'Shift data updated successfully'}
         """
         try:
-            valid_shifts = [s["shiftName"] for s in self.shiftsRepo.getAllData()]
-            print("VALID SHIFTS:", valid_shifts)
+            valid_shifts = self.shiftsRepo.getShiftMap()
+            logger.debug("VALID SHIFTS: %s", valid_shifts.keys())
 
             manager = {
                 "employeeId": employee["_id"],
-                "shift": "fullday",
+                "shift": MANAGER_SHIFT,
                 "clockIn": None,
                 "clockOut": None
             }
@@ -706,6 +950,7 @@ class AttendanceService:
             result = self.repo.updateData(id=id, validateData=validated_data)
             if not result.acknowledged:
                 return {"status": False, "message": "Failed to update shift data"}
+            self.syncSchedules([self.repo.getDataById(id)])
 
             history = HistoryService().createHistory(data={
                 "employeeId": employee["_id"],
@@ -780,12 +1025,9 @@ class AttendanceService:
                     "Date": {"$gte": start_date, "$lt": end_date}
                 },
             )
-            for shift in shifts:
-                for emp in shift["employees"]:
-                    emp["employee"] = self.employeeRepo.getDataById(id=emp["employeeId"])
-                    emp["employee"] = EmployeeSchema().dump(emp["employee"])
+            shifts = self.hydrateEmployees(shifts)
             shifts = sorted(shifts, key=lambda s: s.get("Date"))
-            print("shifts = ", shifts)
+            logger.debug("shifts = %s", shifts)
             return {"status": True, "message": "Monthly shifts fetched successfully", "data": shifts}
         except Exception as e:
             raise Exception(f"Failed to get monthly shifts: {str(e)}")
@@ -794,8 +1036,10 @@ class AttendanceService:
         """
         Mengambil ringkasan data attendance untuk branch tertentu dalam satu bulan.
         
-        Method ini mengembalikan daftar ringkasan data attendance yang terdiri
-        dari jumlah karyawan yang hadir dan yang terlambat dalam satu bulan.
+        Method ini mengembalikan ringkasan data attendance yang terdiri dari
+        jumlah karyawan yang hadir, terlambat, absen, dan belum clock out dalam
+        satu bulan, beserta rincian per employee dan per shift. Perhitungan
+        dilakukan di MongoDB lewat getAttendanceSummary.
         
         Args:
             branchId (str): ID branch/store yang akan diambil data attendancenya
@@ -806,17 +1050,20 @@ class AttendanceService:
             dict: Dictionary berisi:
                 - status (bool): Status operasi
                 - message (str): Pesan hasil operasi
-                - data (dict): Ringkasan data attendance yang terdiri dari:
-                    - presentCount (int): Jumlah karyawan yang hadir
-                    - lateCount (int): Jumlah karyawan yang terlambat
+                - data (dict): Ringkasan data attendance (lihat getAttendanceSummary)
         example: 
             >>> getMonthlySummary("STR_9820251023235635", month=10, year=2025)
             {
                 status : True,
-                message : "Monthly summary for 2025-10 fetched successfully",
+                message : "Monthly summary for 2025-10",
                 data : {
                     "presentCount": 10,
-                    "lateCount": 5
+                    "lateCount": 5,
+                    "absentCount": 2,
+                    "noClockOutCount": 1,
+                    "scheduledCount": 17,
+                    "employees": [...],
+                    "shifts": [...]
                 }
             }
             
@@ -830,56 +1077,109 @@ class AttendanceService:
 
             start_date = pendulum.datetime(year, month, 1, tz="UTC")
             end_date = start_date.add(months=1)
-            print("------------------start_date = ", start_date)
-            shifts = self.repo.getAllData(
-                query={
-                    "branchId": branchId,
-                    "Date": {"$gte": start_date, "$lt": end_date}
-                }
-            )
-            print("------------------shifts = ", shifts)
 
-            if not shifts or len(shifts) == 0:
+            summary = self.getAttendanceSummary([branchId], start_date, end_date)
+            if summary["data"]["scheduledCount"] == 0:
                 return {
                     "status": True,
                     "message": f"No shift data found for {year}-{month:02d}",
-                    "data": {"presentCount": 0, "lateCount": 0}
+                    "data": summary["data"]
                 }
 
-            presentCount = 0
-            lateCount = 0
-            print("------------------AMBIL STATUS EMPLOYEE = ", shifts)
-            for shift in shifts:
-                employees = shift.get("employees", [])
-                if not isinstance(employees, list):
-                    continue
-
-                for emp in employees:
-                    status = emp.get("status", "").lower()
-                    if status == "present":
-                        presentCount += 1
-                    elif status == "late":
-                        lateCount += 1
-
             return {
                 "status": True,
                 "message": f"Monthly summary for {year}-{month:02d}",
-                "data": {
-                    "presentCount": presentCount,
-                    "lateCount": lateCount,
-                },
+                "data": summary["data"],
             }
 
         except Exception as e:
             raise Exception(f"Failed to get monthly summary: {str(e)}")
 
-    def getEmployeeSchedule(self, employeeId, branchId):
+    def getAttendanceSummary(self, branchIds, startDate, endDate):
+        """
+        Mengambil ringkasan attendance untuk beberapa branch dalam rentang tanggal bebas.
+
+        Semua perhitungan dilakukan dengan aggregation pipeline di MongoDB, jadi
+        yang dikirim ke aplikasi hanya angka-angka ringkasan, bukan seluruh
+        dokumen shift. Dipakai owner untuk melihat semua branch sekaligus.
+
+        Args:
+            branchIds (list): List ID branch/store. Jika kosong, semua branch dihitung.
+            startDate (str|datetime): Tanggal awal (inklusif), format "YYYY-MM-DD"
+            endDate (str|datetime): Tanggal akhir (eksklusif), format "YYYY-MM-DD"
+
+        Returns:
+            dict: Dictionary berisi:
+                - status (bool): Status operasi
+                - message (str): Pesan hasil operasi
+                - data (dict):
+                    - presentCount, lateCount, absentCount, noClockOutCount, scheduledCount (int)
+                    - branches (list): Jumlah per branch
+                    - employees (list): Jumlah per employee (branchId, employeeId, ...)
+                    - shifts (list): Jumlah per shift (branchId, shift, ...)
+
+        Raises:
+            ValueError: Jika tanggal tidak valid atau start tidak sebelum end
+            Exception: Jika terjadi error saat mengambil data
+
+        Example:
+            >>> getAttendanceSummary(["STR_001", "STR_002"], "2025-10-01", "2025-11-01")
+            {
+                'status': True,
+                'message': 'Attendance summary fetched successfully',
+                'data': {
+                    'presentCount': 40, 'lateCount': 3, 'absentCount': 2,
+                    'noClockOutCount': 1, 'scheduledCount': 45,
+                    'branches': [{'branchId': 'STR_001', 'presentCount': 20, ...}],
+                    'employees': [{'branchId': 'STR_001', 'employeeId': 'EMP001', 'presentCount': 20, ...}],
+                    'shifts': [{'branchId': 'STR_001', 'shift': 'Day', 'presentCount': 12, ...}]
+                }
+            }
+        """
+        try:
+            try:
+                if isinstance(startDate, str):
+                    startDate = pendulum.parse(startDate, tz="UTC")
+                if isinstance(endDate, str):
+                    endDate = pendulum.parse(endDate, tz="UTC")
+            except Exception as e:
+                raise ValueError(f"Invalid date range: {e}")
+            if startDate >= endDate:
+                raise ValueError("Start date must be before end date")
+            if not branchIds:
+                branchIds = [store["_id"] for store in self.storeRepo.iterData(projection={"_id": 1})]
+
+            result = self.repo.getSummary(branchIds, startDate, endDate)
+
+            counts = ["presentCount", "lateCount", "absentCount", "noClockOutCount", "scheduledCount"]
+            totals = result["totals"][0] if result["totals"] else {}
+            data = {key: totals.get(key, 0) for key in counts}
+            data["branches"] = [
+                {"branchId": row["_id"], **{key: row[key] for key in counts}}
+                for row in result["byBranch"]
+            ]
+            data["employees"] = [
+                {**row["_id"], **{key: row[key] for key in counts}}
+                for row in result["byEmployee"]
+            ]
+            data["shifts"] = [
+                {**row["_id"], **{key: row[key] for key in counts}}
+                for row in result["byShift"]
+            ]
+            return {"status": True, "message": "Attendance summary fetched successfully", "data": data}
+        except ValueError as e:
+            raise ValueError(e)
+        except Exception as e:
+            raise Exception(f"Failed to get attendance summary: {str(e)}")
+
+    def getEmployeeSchedule(self, employeeId, branchId, month=None):
         """
     Mengambil jadwal (schedule) untuk seorang employee pada sebuah branch/toko.
 
     Args:
         employeeId (str): ID employee yang ingin diambil jadwalnya.
         branchId (str): ID branch/store tempat employee terdaftar.
+        month (str, optional): Bulan jadwal format "YYYY-MM". Default bulan ini (Asia/Jakarta).
 
     Returns:
         dict: Dictionary berisi:
@@ -896,21 +1196,21 @@ class AttendanceService:
                 - shiftEndTime (str, optional): Waktu selesai shift (jika lookup di shiftsRepo berhasil).
 
     Behavior / Catatan implementasi:
-        - Mengambil data shift dari repository utama menggunakan query:
-          {"branchId": branchId, "employees.employeeId": employeeId}
-        - Mengambil semua definisi shift/time dari shiftsRepo dan membangun map
-          berdasarkan shiftName untuk lookup shiftStartTime/shiftEndTime.
-        - Untuk setiap shift yang mengandung employeeId, hanya data employee
-          yang relevan (baris yang cocok) yang dimasukkan ke `schedule`.
-        - Schedule diurutkan berdasarkan field "Date" sebelum dikembalikan.
+        - Dibaca dari projection `employeeSchedules` (satu dokumen kecil per
+          employee per shift) dengan range scan index (employeeId, Date) untuk
+          satu bulan, sudah urut berdasarkan Date dari database.
+        - Mengambil map definisi shift (berdasarkan shiftName) dari cache
+          shiftsRepo.getShiftMap() untuk lookup shiftStartTime/shiftEndTime.
+        - `_id` di response adalah ID dokumen shift (dipakai untuk clock in/out).
 
     Raises:
         Exception: Jika terjadi error saat pengambilan data dari repository
                    atau error lain selama proses. Pesan exception asli akan
                    disertakan (diforward) untuk keperluan debugging.
+        ValueError: Jika format month tidak valid.
 
     Example:
-        >>> getEmployeeSchedule("EMP001", "BR_9820251023")
+        >>> getEmployeeSchedule("EMP001", "BR_9820251023", "2025-11")
         {
             "status": True,
             "message": "Employee schedule fetched successfully",
@@ -939,46 +1239,45 @@ class AttendanceService:
         }
     """
         try:
-            print("GET EMPLOYEE SCHEDULE = ", employeeId, branchId)
-            result = self.repo.getAllData(
-                query={
-                    "branchId": branchId,
-                    "employees.employeeId": employeeId
-                },
-            )
-
-            shift_times = self.shiftsRepo.getAllData()
-            shift_time_map = {s["shiftName"]: s for s in shift_times}
+            logger.debug("GET EMPLOYEE SCHEDULE = %s %s %s", employeeId, branchId, month)
+            if month:
+                try:
+                    first = pendulum.from_format(month, "YYYY-MM")
+                except Exception:
+                    raise ValueError("month must use the YYYY-MM format")
+            else:
+                first = pendulum.now("Asia/Jakarta")
+            startDate = datetime(first.year, first.month, 1)
+            endDate = datetime(first.year + first.month // 12, first.month % 12 + 1, 1)
 
-            schedule = []
+            result = self.scheduleRepo.getSchedule(employeeId, startDate, endDate, branchId=branchId)
 
-            print("result = ", result)
-            for shift in result:
-                for emp in shift["employees"]:
-                    if emp["employeeId"] == employeeId:
-                        shift_name = emp["shift"]
-                        data = {
-                            "_id" : shift["_id"],
-                            "Date": shift["Date"],   
-                            "shift": shift_name,
-                            "clockIn": emp.get("clockIn"),
-                            "clockOut": emp.get("clockOut"),
-                            "status": emp.get("status"),
-                        }
-                        print("data = ", data)
-                        data["shiftStartTime"] = shift_time_map[shift_name]["shiftStartTime"]
-                        data["shiftEndTime"] = shift_time_map[shift_name]["shiftEndTime"]
+            shift_time_map = self.shiftsRepo.getShiftMap()
 
-                        schedule.append(data)
-                        break
+            schedule = []
+            for entry in result:
+                shift_name = entry.get("shift")
+                data = {
+                    "_id": entry["shiftId"],
+                    "Date": entry["Date"],
+                    "shift": shift_name,
+                    "clockIn": entry.get("clockIn"),
+                    "clockOut": entry.get("clockOut"),
+                    "status": entry.get("status"),
+                }
+                if shift_name in shift_time_map:
+                    data["shiftStartTime"] = shift_time_map[shift_name]["shiftStartTime"]
+                    data["shiftEndTime"] = shift_time_map[shift_name]["shiftEndTime"]
+                schedule.append(data)
 
-            schedule = sorted(schedule, key=lambda s: s.get("Date"))
-            print("schedule = ", schedule)
+            logger.debug("schedule = %s", schedule)
             return {
                 "status": True,
                 "message": "Employee schedule fetched successfully",
                 "data": schedule
             }
 
+        except ValueError as e:
+            raise ValueError(e)
         except Exception as e:
             raise Exception("Failed to get employee schedule:", e)
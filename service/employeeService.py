@@ -2,14 +2,17 @@ from repo.EmployeeRepo import EmployeeRepo
 from repo.storeRepo import StoreRepo
 from service.attendanceService import AttendanceService
 from service.storeService import StoreService
-from validation.employeeSchema import EmployeeSchema, UpdateEmployeeSchema, CreatedEmployeeSchema
-from bcrypt import hashpw, gensalt, checkpw
+from validation.employeeSchema import UpdateEmployeeSchema, CreatedEmployeeSchema
+from validation.registry import employeeSchema, employeeDumper, loginSchema
+from utils.passwords import hashPassword, checkPassword, needsRehash
 from utils.jwtHandler import SessionService
 import random
 from marshmallow import ValidationError
-from validation.employeeSchema import LoginSchema
 from service.historyService import HistoryService
 import pendulum
+import logging
+
+logger = logging.getLogger(__name__)
 
 class EmployeeService():
     """
@@ -30,7 +33,7 @@ class EmployeeService():
     """
     def __init__(self):
         self.repo = EmployeeRepo()
-        self.employeeSchema = EmployeeSchema()
+        self.employeeSchema = employeeSchema
         self.createdSchema = CreatedEmployeeSchema()
         self.updateSchema = UpdateEmployeeSchema()
         self.attendanceService = AttendanceService()
@@ -82,19 +85,22 @@ class EmployeeService():
             5
         """
         try:
-            print("UDAH SAMPE SERVICE GET ALL EMPLOYEE")
+            logger.debug("UDAH SAMPE SERVICE GET ALL EMPLOYEE")
             if branchId is not None:
-                data = self.repo.getAllData(query={"$and": [{"branchId": branchId}, {"role": "employee"}]})
+                data = self.repo.getAllData(query={"$and": [{"branchId": branchId}, {"role": "employee"}]}, projection=self.repo.publicProjection)
             else:
-                data = self.repo.getAllData()
-            print("UDAH NGEFETCH DATA EMPLOYEE = ", data)
+                data = self.repo.getAllData(projection=self.repo.publicProjection)
+            logger.debug("UDAH NGEFETCH DATA EMPLOYEE = %s", data)
+            # semua branch diambil sekali dengan satu query $in, bukan satu query per employee
+            branchIds = [emp.get("branchId") for emp in data if emp["role"] in ("employee", "manager") and emp.get("branchId")]
+            branches = {branch["_id"]: branch for branch in self.repoBranch.getDataByIds(branchIds)}
             result= []
             for emp in data:
-                empData = self.employeeSchema.dump(emp)
+                empData = employeeDumper.dump(emp)
                 if emp["role"] == "employee" or emp["role"] == "manager":
                     branch_id = empData["branchId"] 
                     if branch_id:   
-                        empData["branch"] = self.repoBranch.getDataById(branch_id)
+                        empData["branch"] = branches.get(branch_id)
                     result.append(empData)
                 if emp["role"] == "owner":
                     result.append(empData)
@@ -103,10 +109,10 @@ class EmployeeService():
             res = {"status" : True, "message" : "Data fetched successfully", "data" :result }
             return res
         except ValidationError as e:
-            print("VALIDATION ERROR: ", e)
+            logger.warning("VALIDATION ERROR: %s", e)
             raise ValidationError(e)
         except Exception as e:
-            print("EXCEPTION: ", e)
+            logger.error("EXCEPTION: %s", e)
             raise Exception(f"Failed to get data: {str(e)}")
     
     def getEmployeeById(self, idEmployee):
@@ -144,7 +150,7 @@ class EmployeeService():
             'Jane Smith'
         """
         try:
-            data = self.repo.getData(id=idEmployee)
+            data = self.repo.getData(id=idEmployee, projection=self.repo.publicProjection)
             data = self.employeeSchema.dump(data)
             result = {"status" : True, "message" : "Data fetched successfully", "data" : data}
             return result
@@ -205,31 +211,30 @@ class EmployeeService():
             'Data inserted successfully'
         """
         try:
-            print("[MASUK SERVICE NEW EMPLOYEE]", data)
+            logger.debug("[MASUK SERVICE NEW EMPLOYEE] %s", data)
             id = "EMP_"+str(random.randint(10, 99))+pendulum.now(tz="Asia/Jakarta").strftime("%Y%m%d%H%M%S")
-            print("[DATA EMPLOYEE MASUK]", data)
+            logger.debug("[DATA EMPLOYEE MASUK] %s", data)
 
             validateData = self.createdSchema.load(data)
             if validateData["role"] == "manager":
-                managers = self.repo.getAllData(query={"role": "manager", "branchId": validateData["branchId"], "status": "active"})
-                if len(managers) >= 1:
+                managers = self.repo.countData(query={"role": "manager", "branchId": validateData["branchId"], "status": "active"})
+                if managers >= 1:
                     result = {"status": False, "message": "Branch already has 2 manager"}
                     return result
-            employees= self.repo.getAllData(query={"branchId": validateData["branchId"], "role": "employee", "status": "active"})
-            print("[EMPLOYEES LEN]", employees)
-            if len(employees) >= 6:
+            employees = self.repo.countData(query={"branchId": validateData["branchId"], "role": "employee", "status": "active"})
+            logger.debug("[EMPLOYEES LEN] %s", employees)
+            if employees >= 6:
                 result = {"status": False, "message": "Branch already has 6 employees"}
                 return result
             
-            print("[VALIDATE NEW EMPLOYEE]", validateData)
-            emailUsed = self.repo.getData(query={"email": validateData["email"]})
+            logger.debug("[VALIDATE NEW EMPLOYEE] %s", validateData)
+            emailUsed = self.repo.getData(query={"email": validateData["email"]}, projection={"_id": 1})
             
             if emailUsed:
                 result = {"status": False, "message": "Email already used"}
                 return result
             validateData["_id"] = id
-            salt = gensalt()
-            validateData["password"] = hashpw(validateData["password"].encode('utf-8'), salt)
+            validateData["password"] = hashPassword(validateData["password"])
             res = self.repo.insertData(validateData)
 
             if not res.acknowledged:
@@ -281,7 +286,7 @@ class EmployeeService():
         """
         try:
             res = self.repo.updateData(validateData={"status": "inactive", "branchId": ""}, id=id)
-            print("[FIRE EMPLOYEE SERVICE] : ", res)
+            logger.debug("[FIRE EMPLOYEE SERVICE] : %s", res)
             if not res.acknowledged:
                 result = {"status": False, "message": "Failed to inactivate employee"}
                 return result
@@ -328,7 +333,7 @@ class EmployeeService():
         """
         try:
             res = self.repo.updateData(validateData={"status": "active"}, id=id)
-            print("[activate EMPLOYEE SERVICE] : ", res)
+            logger.debug("[activate EMPLOYEE SERVICE] : %s", res)
             if not res.acknowledged:
                 result = {"status": False, "message": "Failed to inactivate employee"}
                 return result
@@ -391,7 +396,7 @@ class EmployeeService():
             })
             if not history["status"]:
                 return {"status": False, "message": "Failed to add history"}
-            print("[DELETE EMPLOYEE SERVICE] : ", res)
+            logger.debug("[DELETE EMPLOYEE SERVICE] : %s", res)
             result = {"status": True, "message": "Data deleted successfully"}
             return result 
         except Exception as e:
@@ -444,15 +449,14 @@ class EmployeeService():
             ...     print(f"Token: {result['token']}")
         """
         try:
-            validateData = LoginSchema().load(data)
+            validateData = loginSchema.load(data)
             
             user = self.repo.getData(query={"email": validateData["email"]})
             if not user:
                 result = {"status": False, "message": "Email or Password Invalid"}
                 return result
 
-            checkPassword = checkpw(validateData["password"].encode("utf-8"), user["password"])
-            if not checkPassword:
+            if not checkPassword(validateData["password"], user["password"]):
                 result = {"status": False, "message": "Email or Password Invalid"}
                 return result
             
@@ -460,6 +464,10 @@ class EmployeeService():
                 result = {"status": False, "message": "Your account has been disabled"}
                 return result
 
+            # hash dengan cost factor lama diganti ke Config.BCRYPT_ROUNDS saat password diketahui benar
+            if needsRehash(user["password"]):
+                self.repo.updateData(id=user["_id"], validateData={"password": hashPassword(validateData["password"])})
+
             token = SessionService().createToken(user)
             history = self.historyService.createHistory({
                 "employeeId": user["_id"],
@@ -523,10 +531,10 @@ class EmployeeService():
         """
         try:
             validateData = self.updateSchema.load(data)
-            print("[UPDATE EMPLOYEE SERVICE VALIDATE DATA] : ", validateData)
+            logger.debug("[UPDATE EMPLOYEE SERVICE VALIDATE DATA] : %s", validateData)
             if validateData["role"] == "manager":
-                managers = self.repo.getAllData(query={"role": "manager", "branchId": validateData["branchId"], "name" : {"$ne": validateData["name"]}})
-                if len(managers) >= 1:
+                managers = self.repo.countData(query={"role": "manager", "branchId": validateData["branchId"], "name" : {"$ne": validateData["name"]}})
+                if managers >= 1:
                     result = {"status": False, "message": "Branch already has a manager"}
                     return result
             res = self.repo.updateData(validateData=validateData, id=idEmployee)
@@ -606,7 +614,7 @@ class EmployeeService():
         """
         try:
             id = employee["_id"]
-            data = self.repo.getData(id=id)
+            data = self.repo.getData(id=id, projection=self.repo.publicProjection)
             employee = self.employeeSchema.dump(data)
             if employee is None:
                 result = {"status": False, "message": "Data not found"}
@@ -616,13 +624,13 @@ class EmployeeService():
                 store = self.branchService.getStoreDetails(employee["branchId"])["data"]
             else :
                 store = self.branchService.getAllStore()
-                totalEmployees = self.repo.getAllData()
+                totalEmployees = self.repo.countData()
                 employee["totalStore"] =  len(store["data"])
-                employee["totalEmployee"] = len(totalEmployees)-1
+                employee["totalEmployee"] = totalEmployees-1
             
             if employee["role"] != "employee":
                 employee["workDays"] = (pendulum.now("Asia/Jakarta").date() - pendulum.parse(employee["createdAt"], tz="Asia/Jakarta").date()).days
-                print("MANAGER WORKDAYS : ",employee["workDays"])
+                logger.debug("MANAGER WORKDAYS : %s", employee['workDays'])
                 
             employee["branch"] = store
             return {"status": True, "message": "Data fetched successfully", "data": employee}
@@ -1,8 +1,11 @@
 from repo.historyRepo import HistoryRepo
-from validation.historySchema import HistorySchema
+from validation.registry import historySchema
+from utils.historyWriter import historyWriter
+from utils.config import Config
+from utils.pagination import parseLimit, encodeCursor, decodeCursor
 from marshmallow import ValidationError
 import pendulum
-import random
+import uuid
 
 class HistoryService:
     """
@@ -28,7 +31,7 @@ class HistoryService:
         
         Method ini mencatat setiap aktivitas penting yang dilakukan oleh employee,
         seperti login, CRUD operations, atau perubahan status. ID history akan
-        di-generate secara otomatis dengan format HIS + random number + timestamp.
+        di-generate secara otomatis dengan format HIS + uuid4 hex.
         
         Args:
             data (dict): Data history yang akan dicatat dengan struktur:
@@ -57,10 +60,12 @@ class HistoryService:
             Exception: Jika terjadi error saat menyimpan data ke database
         
         Notes:
-            - ID history di-generate dengan format: HIS[random][timestamp]
-            - Random number menggunakan range 10-99
-            - Timestamp menggunakan timezone default dari pendulum
+            - ID history di-generate dengan format: HIS[uuid4 hex], jadi tidak
+              bentrok walau banyak entry dibuat di detik yang sama (batch async)
             - Setiap aktivitas penting dalam sistem harus tercatat di history
+            - Jika Config.HISTORY_ASYNC aktif, data hanya divalidasi lalu dimasukkan
+              ke antrian historyWriter; insert ke database dilakukan per batch
+              di background thread
         
         Example:
             >>> service = HistoryService()
@@ -84,8 +89,11 @@ class HistoryService:
             >>> result = service.createHistory(history_data)
         """
         try:
-            data["_id"]  = "HIS" + str(random.randint(10, 99)) + pendulum.now().to_datetime_string()
-            data = HistorySchema().load(data)
+            data["_id"]  = "HIS" + uuid.uuid4().hex
+            data = historySchema.load(data)
+            if Config.HISTORY_ASYNC:
+                historyWriter.put(data)
+                return {"status": True, "message": "Data inserted successfully"}
             res = self.repo.insertData(validateData=data)
             if not res.acknowledged:
                 result = {"status": False, "message": "Failed to insert data"}
@@ -96,13 +104,86 @@ class HistoryService:
         except Exception as e:
             raise Exception(f"Failed to insert data {e}")
         
-    def getAllHistory(self):
+    def buildQuery(self, filters):
         """
-        Mengambil semua data history dari database.
+        Ubah filter dari query string menjadi filter MongoDB.
+
+        Args:
+            filters (dict): Filter opsional:
+                {
+                    "type": str | list[str] (satu tipe, "a,b", atau list),
+                    "employeeId": str,
+                    "start": str (tanggal/waktu awal, inklusif),
+                    "end": str (tanggal/waktu akhir, eksklusif)
+                }
+
+        Returns:
+            dict: Filter MongoDB untuk collection histories
+
+        Raises:
+            ValueError: Jika format tanggal salah atau start >= end
+        """
+        query = {}
+        filters = filters or {}
+        types = filters.get("type")
+        if isinstance(types, str):
+            types = [t for t in types.split(",") if t]
+        if types:
+            query["type"] = types[0] if len(types) == 1 else {"$in": types}
+        if filters.get("employeeId"):
+            query["employeeId"] = filters["employeeId"]
+        createdAt = {}
+        try:
+            if filters.get("start"):
+                createdAt["$gte"] = pendulum.parse(filters["start"], tz="Asia/Jakarta")
+            if filters.get("end"):
+                createdAt["$lt"] = pendulum.parse(filters["end"], tz="Asia/Jakarta")
+        except Exception as e:
+            raise ValueError(f"Invalid date filter: {e}")
+        if "$gte" in createdAt and "$lt" in createdAt and createdAt["$gte"] >= createdAt["$lt"]:
+            raise ValueError("Start date must be before end date")
+        if createdAt:
+            query["createdAt"] = createdAt
+        return query
+
+    def getHistoryPage(self, filters=None, limit=None, cursor=None):
+        """
+        Ambil satu halaman history, terbaru dulu (keyset pagination).
+
+        Args:
+            filters (dict, optional): Lihat buildQuery()
+            limit (int|str, optional): Jumlah data per halaman,
+                default Config.HISTORY_PAGE_SIZE, maksimal Config.HISTORY_PAGE_MAX
+            cursor (str, optional): `next_cursor` dari halaman sebelumnya
+
+        Returns:
+            dict: {"status", "message", "data", "next_cursor"}; next_cursor None
+                  kalau sudah halaman terakhir
+
+        Raises:
+            ValueError: Jika limit, cursor atau filter tanggal tidak valid
+        """
+        limit = parseLimit(limit, Config.HISTORY_PAGE_SIZE, Config.HISTORY_PAGE_MAX)
+        after = decodeCursor(cursor) if cursor else None
+        data, last = self.repo.getPage(query=self.buildQuery(filters), limit=limit, after=after)
+        if not data and after is None:
+            return {"status": False, "message": "Failed to get data"}
+        nextCursor = encodeCursor(*last) if last else None
+        return {"status": True, "message": "Data fetched successfully", "data": data, "next_cursor": nextCursor}
+
+    def getAllHistory(self, filters=None, limit=None, cursor=None):
+        """
+        Mengambil data history seluruh employee per halaman.
         
-        Method ini mengambil seluruh riwayat aktivitas yang tercatat dalam sistem,
+        Method ini mengambil riwayat aktivitas yang tercatat dalam sistem,
         biasanya digunakan oleh admin atau owner untuk monitoring aktivitas
-        seluruh employee.
+        seluruh employee. Data diambil per halaman (keyset pagination berdasarkan
+        createdAt + _id), bukan seluruh collection sekaligus.
+        
+        Args:
+            filters (dict, optional): Filter type, employeeId, start, end (lihat buildQuery)
+            limit (int, optional): Jumlah data per halaman (dibatasi Config.HISTORY_PAGE_MAX)
+            cursor (str, optional): `next_cursor` dari response sebelumnya
         
         Returns:
             dict: Response object dengan struktur:
@@ -118,7 +199,8 @@ class HistoryService:
                                 "description": str,
                                 "type": str,
                                 "createdAt": datetime
-                            }]
+                            }],
+                        "next_cursor": str | None
                     }
                 - Gagal:
                     {
@@ -127,43 +209,44 @@ class HistoryService:
                     }
         
         Raises:
+            ValueError: Jika limit, cursor atau filter tanggal tidak valid
             Exception: Jika terjadi error saat mengambil data dari database
         
         Notes:
-            - Data history diurutkan berdasarkan waktu (biasanya descending)
-            - Berguna untuk audit trail dan monitoring sistem secara keseluruhan
-            - Dapat difilter lebih lanjut di layer aplikasi jika diperlukan
+            - Data history diurutkan descending berdasarkan createdAt lalu _id
+            - Query dilayani index `created` / `employee_created` / `type_created`
+            - next_cursor None berarti sudah halaman terakhir
         
         Example:
             >>> service = HistoryService()
-            >>> result = service.getAllHistory()
-            >>> if result["status"]:
-            ...     for history in result["data"]:
-            ...         print(f"{history['employeeName']}: {history['description']}")
+            >>> result = service.getAllHistory(filters={"type": "auth"}, limit=20)
+            >>> for history in result["data"]:
+            ...     print(f"{history['employeeName']}: {history['description']}")
             John Doe: Login successfully
-            Jane Smith: New employee created
-            John Doe: Employee data updated
+            >>> nextPage = service.getAllHistory(filters={"type": "auth"}, limit=20,
+            ...                                  cursor=result["next_cursor"])
         """
         try:
-            data = self.repo.getAllData()
-            if not data:
-                result = {"status": False, "message": "Failed to get data"}
-                return result
-            print(data)
-            return {"status": True, "message": "Data fetched successfully", "data": data}
+            return self.getHistoryPage(filters=filters, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise ValueError(e)
         except Exception as e:
-            raise Exception("Failed to get data {e}")
+            raise Exception(f"Failed to get data {e}")
         
-    def getUserHistory(self, userId):
+    def getUserHistory(self, userId, filters=None, limit=None, cursor=None):
         """
-        Mengambil riwayat aktivitas dari employee tertentu.
+        Mengambil riwayat aktivitas dari employee tertentu per halaman.
         
-        Method ini mengambil semua history yang terkait dengan satu employee
+        Method ini mengambil history yang terkait dengan satu employee
         berdasarkan employeeId. Berguna untuk melihat track record aktivitas
-        individual employee atau untuk keperluan investigasi.
+        individual employee atau untuk keperluan investigasi. Pagination dan
+        filter sama dengan getAllHistory, tapi employeeId selalu userId.
         
         Args:
             userId (str): ID employee yang riwayat aktivitasnya ingin diambil
+            filters (dict, optional): Filter type, start, end (lihat buildQuery)
+            limit (int, optional): Jumlah data per halaman
+            cursor (str, optional): `next_cursor` dari response sebelumnya
         
         Returns:
             dict: Response object dengan struktur:
@@ -171,15 +254,8 @@ class HistoryService:
                     {
                         "status": True,
                         "message": "Data fetched successfully",
-                        "data": list[dict] - List history user tersebut:
-                            [{
-                                "_id": str,
-                                "employeeId": str,
-                                "employeeName": str,
-                                "description": str,
-                                "type": str,
-                                "createdAt": datetime
-                            }]
+                        "data": list[dict] - List history user tersebut,
+                        "next_cursor": str | None
                     }
                 - Gagal atau tidak ada data:
                     {
@@ -188,24 +264,20 @@ class HistoryService:
                     }
         
         Raises:
+            ValueError: Jika limit, cursor atau filter tanggal tidak valid
             Exception: Jika terjadi error saat query database
         
         Notes:
             - Hanya menampilkan history dari employee yang diminta
             - Dapat digunakan untuk profile activity user
-            - Berguna untuk tracking individual performance atau troubleshooting
         
         Example:
             >>> service = HistoryService()
-            >>> result = service.getUserHistory("EMP_123")
+            >>> result = service.getUserHistory("EMP_123", filters={"type": "attendance,leave"})
             >>> if result["status"]:
-            ...     print(f"Total aktivitas: {len(result['data'])}")
             ...     for history in result["data"]:
             ...         print(f"{history['createdAt']}: {history['description']}")
-            Total aktivitas: 15
-            2025-11-29 10:30:00: Login successfully
-            2025-11-29 10:35:00: Updated employee data
-            2025-11-29 11:00:00: Created new store
+            2025-11-29 10:30:00: Clock in successfully
             
             >>> # Contoh ketika user tidak memiliki history
             >>> result = service.getUserHistory("EMP_999")
@@ -213,12 +285,9 @@ class HistoryService:
             False
         """
         try:
-            print("---------UDAH DI SERVCIE HISTORY USER---------")
-            data = self.repo.getAllData(query={"employeeId": userId})
-            print("DATA HISTORY USER",data)
-            if not data:
-                result = {"status": False, "message": "Failed to get data"}
-                return result
-            return {"status": True, "message": "Data fetched successfully", "data": data}
+            filters = dict(filters or {}, employeeId=userId)
+            return self.getHistoryPage(filters=filters, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise ValueError(e)
         except Exception as e:
-            raise Exception("Failed to get data", e)
\ No newline at end of file
+            raise Exception("Failed to get data", e)
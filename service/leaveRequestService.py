@@ -1,12 +1,22 @@
 from repo.leaveRequestRepo import LeaveRequestRepo
-from validation.annualRequestschema import AnnualRequestSchema, reviewerSchema, CreateLeaveRequestSchema
+from validation.annualRequestschema import CreateLeaveRequestSchema
 from repo.EmployeeRepo import EmployeeRepo
-from validation.employeeSchema import EmployeeSchema
 from repo.historyRepo import HistoryRepo
-from validation.historySchema import HistorySchema
+from validation.registry import annualRequestSchema, annualRequestDumper, employeeSchema, employeeDumper, historySchema, reviewSchema
+from utils.historyWriter import historyWriter
+from utils.config import Config
+from utils.pagination import parseLimit, encodeCursor, decodeCursor
 from marshmallow import ValidationError
+from datetime import datetime, time, timedelta
 import pendulum
 import random
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# nilai status yang benar-benar tersimpan; cancelRequest menulis "canceled"
+LEAVE_STATUSES = ["pending", "approved", "rejected", "canceled"]
 
 class LeaveRequestService:
     """
@@ -25,9 +35,10 @@ class LeaveRequestService:
         self.employeeRepo = EmployeeRepo()
         self.annualRequestRepo = LeaveRequestRepo()
         self.createSchema = CreateLeaveRequestSchema()
-        self.employeeValidation = EmployeeSchema()
+        self.annualSchema = annualRequestSchema
+        self.employeeValidation = employeeSchema
         self.historyRepo = HistoryRepo()
-        self.historySchema = HistorySchema()
+        self.historySchema = historySchema
         
     def checkDateRange(self, start, end, employeeId):
         """
@@ -50,6 +61,11 @@ class LeaveRequestService:
                 - data (str|int): Data tambahan (tanggal sekarang atau selisih hari)
                 - days (int): Jumlah hari cuti jika valid
 
+        Notes:
+            Overlap dengan request pending/approved dicek lewat satu range query
+            LeaveRequestRepo.findOverlap (index employee_status_start), bukan
+            dengan mengambil seluruh riwayat request employee.
+
         Example:
             checkDateRange("2024-01-15", "2024-01-20", 10, "EMP001")
             {'status': True, 'days': 6}
@@ -61,7 +77,7 @@ class LeaveRequestService:
                 end = pendulum.parse(end, tz="Asia/Jakarta").date()
             now = pendulum.now(tz="Asia/Jakarta").date()
 
-            print(f"[START]{start} - [END]{end} - [NOW]{now}")
+            logger.debug("[START]%s - [END]%s - [NOW]%s", start, end, now)
 
             if start < now:
                 return {
@@ -82,30 +98,27 @@ class LeaveRequestService:
                 }
 
             days = (end - start).days + 1
-            print("[DAYS]", days)
+            logger.debug("[DAYS] %s", days)
 
-            employeeRequests = self.annualRequestRepo.getAllData(
-                query={"employeeId": employeeId}
+            # startDate/endDate disimpan sebagai datetime tengah malam (tanpa tz),
+            # jadi rentang [start, end] dicari sebagai [start 00:00, end+1 00:00)
+            overlap = self.annualRequestRepo.findOverlap(
+                employeeId=employeeId,
+                start=datetime.combine(start, time.min),
+                end=datetime.combine(end + timedelta(days=1), time.min),
             )
 
-            if employeeRequests:
-                for request in employeeRequests:
-                    if request["status"] not in ["pending", "approved"]:
-                        continue
-                    reqStart = pendulum.parse(str(request["startDate"]), tz="Asia/Jakarta").date()
-                    reqEnd = pendulum.parse(str(request["endDate"]), tz="Asia/Jakarta").date()
-
-                    if (reqStart <= start <= reqEnd or 
-                        reqStart <= end <= reqEnd or
-                        start <= reqStart and end >= reqEnd):
-                        return {
-                            "status": False, 
-                            "message": f"The date range overlaps with a previous request ({reqStart.strftime('%d-%m-%Y')} to {reqEnd.strftime('%d-%m-%Y')}).",
-                        }
+            if overlap:
+                reqStart = overlap["startDate"]
+                reqEnd = overlap["endDate"]
+                return {
+                    "status": False, 
+                    "message": f"The date range overlaps with a previous request ({reqStart.strftime('%d-%m-%Y')} to {reqEnd.strftime('%d-%m-%Y')}).",
+                }
 
             return {"status": True, "days": days}
         except Exception as e:
-            print("[ERROR CHECK DATE RANGE]",e)
+            logger.error("[ERROR CHECK DATE RANGE] %s", e)
             return {"status": False, "message": str(e)}
         
         
@@ -141,8 +154,11 @@ class LeaveRequestService:
             {'status': True, 'message': 'Data inserted successfully'}
         """
         try:
-            data["_id"] = "HIS_" + str(random.randint(10, 99)) +pendulum.now(tz="Asia/Jakarta").strftime("%Y%m%d%H%M%S")
+            data["_id"] = "HIS_" + uuid.uuid4().hex
             data = self.historySchema.load(data)
+            if Config.HISTORY_ASYNC:
+                historyWriter.put(data)
+                return {"status": True, "message": "Data inserted successfully"}
             res = self.historyRepo.insertData(validateData=data)
             if not res.acknowledged:
                 result = {"status": False, "message": "Failed to insert data"}
@@ -182,13 +198,13 @@ class LeaveRequestService:
             {'status': True, 'data': {...}}
         """
         try:
-            employee = self.employeeRepo.getData(id=currentUser["_id"])
+            employee = self.employeeRepo.getData(id=currentUser["_id"], projection={"name": 1})
             payload = {
                 "employeeId": employee["_id"],
                 "name": employee["name"],
                 "note": note
             }
-            data = reviewerSchema().load(payload)
+            data = reviewSchema.load(payload)
             
             return {"status": True, "data": data}
         except Exception as e:
@@ -239,8 +255,8 @@ class LeaveRequestService:
         try:
             data["_id"] = "ANR_" + str(random.randint(10, 99)) + pendulum.now(tz="Asia/Jakarta").strftime("%Y%m%d%H%M%S")
 
-            employee = self.employeeRepo.getData(id=data["employeeId"])
-            print("EMPLOYEE: ", employee)
+            employee = self.employeeRepo.getData(id=data["employeeId"], projection={"name": 1, "role": 1, "branchId": 1, "annualLeaveBalance": 1})
+            logger.debug("EMPLOYEE: %s", employee)
             if not employee:
                 return {
                     "status": False, 
@@ -257,9 +273,10 @@ class LeaveRequestService:
                     "status": False, 
                     "message": dateValidation["message"],
                 }
-            print("[date validation]: ", dateValidation )
+            logger.debug("[date validation]: %s", dateValidation)
             data["days"] = dateValidation["days"]
             data["branchId"] = employee["branchId"]
+            data["requesterRole"] = employee["role"]
             
             if data["days"] > employee["annualLeaveBalance"] and data["type"] == "annual":
                 return {
@@ -269,7 +286,7 @@ class LeaveRequestService:
                 }
 
             validatedData = self.createSchema.load(data)
-            print("VALIDATED DATA: ", validatedData)
+            logger.debug("VALIDATED DATA: %s", validatedData)
             result = self.annualRequestRepo.insertData(validateData=validatedData)
 
             if not result.acknowledged:
@@ -345,16 +362,12 @@ class LeaveRequestService:
             }
         """
         try:
-            print("==============LIST ANNUAL BY EMPLOYEE==============")
+            logger.debug("==============LIST ANNUAL BY EMPLOYEE==============")
             fetch = self.annualRequestRepo.getAllData(query={"employeeId": id})
-            print("[DATA FETCH ANNUAL]",fetch)
-            data = []
-            for annual in fetch:
-                dump = AnnualRequestSchema().dump(annual)
-                print("[DUMP ANNUAL]",dump)
-                data.append(dump)
+            logger.debug("[DATA FETCH ANNUAL] %s", fetch)
+            data = annualRequestDumper.dumpMany(fetch)
                 
-            print("[DATA ANNUAL]",data)
+            logger.debug("[DATA ANNUAL] %s", data)
             if not data:
                 return {"status": False, "message": "No data found", "data": None}
             return {"status": True, "data": data}
@@ -397,9 +410,9 @@ class LeaveRequestService:
             data = self.annualRequestRepo.getData(id=id)
             if not data:
                 return {"status": False, "message": "No data found", "data": None}
-            dump = AnnualRequestSchema().dump(data)
-            employee = self.employeeRepo.getData(id=dump["employeeId"])
-            dump["employee"] = self.employeeValidation.dump(employee)
+            dump = annualRequestDumper.dump(data)
+            employee = self.employeeRepo.getData(id=dump["employeeId"], projection=self.employeeRepo.publicProjection)
+            dump["employee"] = employeeDumper.dump(employee or {})
             return {"status": True, "data": dump}
         except Exception as e:
             raise Exception(f"Failed to get data {e}")
@@ -473,7 +486,7 @@ class LeaveRequestService:
         """
         try:
             note = data.get("note", "")
-            print("[NOTE]", note)
+            logger.debug("[NOTE] %s", note)
             reviewer = self.dataReviewer(currentUser, note)
             update = self.annualRequestRepo.updateData(validateData={"status": "rejected","reviewer": reviewer["data"]}, id=id)
             if not update.acknowledged:
@@ -519,7 +532,7 @@ class LeaveRequestService:
         try:
             note = data.get("note", "") 
             request = self.details(id=id)
-            print("[REQUEST]", request)
+            logger.debug("[REQUEST] %s", request)
             if request["data"]["type"] == "annual":
                 self.employeeRepo.updateData(validateData={"annualLeaveBalance": request["data"]["employee"]["annualLeaveBalance"] - request["data"]["days"]}, id=request["data"]["employeeId"])
             reviewer = self.dataReviewer(currentUser, note)
@@ -533,29 +546,92 @@ class LeaveRequestService:
             raise Exception(f"Failed to aprove request {e}")
         
     
-    def getRequestByBranch(self, currentUser):
+    def queueQuery(self, query, status=None):
+        """
+        Tambahkan filter status ke query antrian permintaan cuti.
+
+        Status selalu ikut di-filter (semua status pakai $in) supaya index
+        *_status_created tetap bisa dipakai, baik untuk sort maupun count.
+
+        Args:
+            query (dict): Filter dasar, contoh {"requesterRole": "manager"}
+            status (str, optional): pending / approved / rejected / canceled
+
+        Returns:
+            dict: Salinan query dengan field status
+
+        Raises:
+            ValueError: Jika status tidak valid
+        """
+        if status and status not in LEAVE_STATUSES:
+            raise ValueError(f"Invalid status {status}")
+        return dict(query, status=status if status else {"$in": LEAVE_STATUSES})
+
+    def getRequestQueue(self, query, status=None, limit=None, cursor=None):
+        """
+        Ambil satu halaman antrian permintaan cuti beserta data employee-nya.
+
+        Request diambil lewat keyset pagination (createdAt + _id, terbaru dulu)
+        dan filter role sudah ada di `query` (field requesterRole), jadi tidak
+        ada filter di Python setelah query. Data employee untuk satu halaman
+        diambil sekaligus dengan satu query `$in`.
+
+        Args:
+            query (dict): Filter dasar, contoh {"branchId": ..., "requesterRole": "employee"}
+            status (str, optional): pending / approved / rejected / canceled
+            limit (int|str, optional): Jumlah data per halaman (maks Config.LEAVE_PAGE_MAX)
+            cursor (str, optional): `next_cursor` dari halaman sebelumnya
+
+        Returns:
+            dict: {"status": True, "data": list, "next_cursor": str|None} atau
+                  {"status": False, "message": "No data found", "data": None}
+
+        Raises:
+            ValueError: Jika status, limit atau cursor tidak valid
+        """
+        query = self.queueQuery(query, status)
+        limit = parseLimit(limit, Config.LEAVE_PAGE_SIZE, Config.LEAVE_PAGE_MAX)
+        after = decodeCursor(cursor) if cursor else None
+
+        fetch, last = self.annualRequestRepo.getPage(query=query, limit=limit, after=after)
+        if not fetch and after is None:
+            return {"status": False, "message": "No data found", "data": None}
+
+        employees = {emp["_id"]: emp for emp in self.employeeRepo.getDataByIds([annual["employeeId"] for annual in fetch])}
+        data = annualRequestDumper.dumpMany(fetch)
+        for dump in data:
+            dump["employee"] = employeeDumper.dump(employees.get(dump["employeeId"], {}))
+        nextCursor = encodeCursor(*last) if last else None
+        return {"status": True, "data": data, "next_cursor": nextCursor}
+
+    def getRequestByBranch(self, currentUser, status=None, limit=None, cursor=None):
         """
-        Mengambil semua permintaan cuti dalam satu branch/cabang.
+        Mengambil permintaan cuti employee dalam satu branch/cabang.
         
-        Method ini digunakan oleh manager untuk melihat semua
+        Method ini digunakan oleh manager/supervisor untuk melihat
         permintaan cuti dari employee dalam branch yang sama. Berguna untuk
         monitoring dan approval workflow.
         
         Args:
             currentUser (dict): Data user yang request, berisi:
                 - branchId (str): ID branch dari user
+            status (str, optional): Filter status request
+            limit (int, optional): Jumlah data per halaman
+            cursor (str, optional): `next_cursor` dari response sebelumnya
                 
         Returns:
             dict: Dictionary berisi:
                 - status (bool): Status operasi
                 - message (str): Pesan jika tidak ada data
                 - data (list): List permintaan cuti beserta data employee, atau None
+                - next_cursor (str|None): Cursor halaman berikutnya
                 
         Raises:
+            ValueError: Jika status, limit atau cursor tidak valid
             Exception: Jika terjadi error saat mengambil data
             
         Example:
-            >>> getRequestByBranch({"branchId": "BRN001"})
+            >>> getRequestByBranch({"branchId": "BRN001"}, status="pending")
             {
                 'status': True,
                 'data': [
@@ -566,69 +642,90 @@ class LeaveRequestService:
                         ...
                     },
                     ...
-                ]
+                ],
+                'next_cursor': None
             }
         """
         try:
-            fetch = self.annualRequestRepo.getAllData(query={"branchId": currentUser["branchId"]})
-            data = []
-            for annual in fetch:
-                dump = AnnualRequestSchema().dump(annual)
-                dump["employee"] = self.employeeValidation.dump(self.employeeRepo.getData(id=dump["employeeId"]))
-                if dump["employee"]["role"] == "employee":
-                    data.append(dump)
-            if not data:
-                return {"status": False, "message": "No data found", "data": None}
-            return {"status": True, "data": data}
+            query = {"branchId": currentUser["branchId"], "requesterRole": "employee"}
+            return self.getRequestQueue(query, status=status, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise ValueError(e)
         except Exception as e:
             raise Exception(f"Failed to get data {e}")
         
-    def getRequestByOwner(self):
+    def getRequestByOwner(self, status=None, limit=None, cursor=None):
         """
-        Mengambil semua permintaan cuti dalam satu branch/cabang.
+        Mengambil permintaan cuti dari semua manager (antrian approval owner).
         
-        Method ini digunakan oleh manager/supervisor untuk melihat semua
-        permintaan cuti dari employee dalam branch yang sama. Berguna untuk
-        monitoring dan approval workflow.
+        Filter role manager dilakukan di query (requesterRole), jadi tidak
+        perlu membaca seluruh collection leaveRequests.
         
         Args:
-            currentUser (dict): Data user yang request, berisi:
-                - branchId (str): ID branch dari user
+            status (str, optional): Filter status request
+            limit (int, optional): Jumlah data per halaman
+            cursor (str, optional): `next_cursor` dari response sebelumnya
                 
         Returns:
-            dict: Dictionary berisi:
-                - status (bool): Status operasi
-                - message (str): Pesan jika tidak ada data
-                - data (list): List permintaan cuti beserta data employee, atau None
+            dict: Sama seperti getRequestByBranch
                 
         Raises:
+            ValueError: Jika status, limit atau cursor tidak valid
             Exception: Jika terjadi error saat mengambil data
             
         Example:
-            >>> getRequestByBranch({"branchId": "BRN001"})
+            >>> getRequestByOwner(status="pending", limit=20)
             {
                 'status': True,
                 'data': [
                     {
-                        '_id': 'ANR001',
-                        'employeeId': 'EMP001',
-                        'employee': {'_id': 'EMP001', 'name': 'John Doe', ...},
+                        '_id': 'ANR002',
+                        'employeeId': 'MGR001',
+                        'employee': {'_id': 'MGR001', 'name': 'Jane Manager', ...},
                         ...
-                    },
-                    ...
-                ]
+                    }
+                ],
+                'next_cursor': 'eyJ0Ijoi...'
             }
         """
         try:
-            fetch = self.annualRequestRepo.getAllData()
-            data = []
-            for annual in fetch:
-                dump = AnnualRequestSchema().dump(annual)
-                dump["employee"] = self.employeeValidation.dump(self.employeeRepo.getData(id=dump["employeeId"]))
-                if dump["employee"]["role"] == "manager":
-                    data.append(dump)
-            if not data:
-                return {"status": False, "message": "No data found", "data": None}
-            return {"status": True, "data": data}
+            return self.getRequestQueue({"requesterRole": "manager"}, status=status, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise ValueError(e)
+        except Exception as e:
+            raise Exception(f"Failed to get data {e}")
+
+    def countRequestQueue(self, currentUser, status=None):
+        """
+        Hitung jumlah permintaan cuti di antrian approval user.
+
+        Dipakai counter dashboard, jadi jumlahnya dihitung di database
+        (count_documents) dan tidak dibatasi ukuran halaman. Owner menghitung
+        request dari manager, manager menghitung request employee di branch-nya.
+
+        Args:
+            currentUser (dict): Data user yang request (role, branchId)
+            status (str, optional): Filter status request
+
+        Returns:
+            dict: {"status": True, "message": ..., "data": {"count": int}}
+
+        Raises:
+            ValueError: Jika status tidak valid
+            Exception: Jika terjadi error saat menghitung data
+
+        Example:
+            >>> countRequestQueue({"role": "manager", "branchId": "BRN001"}, status="pending")
+            {'status': True, 'message': 'Data fetched successfully', 'data': {'count': 3}}
+        """
+        try:
+            if currentUser["role"] == "owner":
+                query = {"requesterRole": "manager"}
+            else:
+                query = {"branchId": currentUser["branchId"], "requesterRole": "employee"}
+            count = self.annualRequestRepo.countData(self.queueQuery(query, status))
+            return {"status": True, "message": "Data fetched successfully", "data": {"count": count}}
+        except ValueError as e:
+            raise ValueError(e)
         except Exception as e:
-            raise Exception(f"Failed to get data {e}")
\ No newline at end of file
+            raise Exception(f"Failed to count data {e}")
@@ -6,6 +6,9 @@ from marshmallow import ValidationError
 import random
 from datetime import datetime
 from service.historyService import HistoryService
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class StoreService:
@@ -32,10 +35,10 @@ class StoreService:
         """
         try:
             id = "STR_"+str(random.randint(10, 99))+datetime.now().strftime("%Y%m%d%H%M%S")
-            print("[SERVICE ADD STORE : ]" , id )
+            logger.debug("[SERVICE ADD STORE : ] %s", id)
             data["_id"] = id
             data = self.createSchema.load(data)
-            print("[SERVICE ADD STORE : ]" , data )
+            logger.debug("[SERVICE ADD STORE : ] %s", data)
             store = self.repo.insertData(data)
             storeId = str(store.inserted_id)
             if not storeId:
@@ -59,7 +62,7 @@ class StoreService:
                 "Store": id,
             }} 
         except ValidationError as e:
-            print("VALIDATION ERROR: ", e)
+            logger.warning("VALIDATION ERROR: %s", e)
             raise ValidationError(e)
         except Exception as e:
             raise Exception(f"Failed to add store {e}")
@@ -80,19 +83,20 @@ class StoreService:
     def storeDetails(self, id):
         try:
             data = self.repo.getData(id=id)
-            data["employees"] = self.employeeRepo.getAllData(query={"storeID": id})
+            data["employees"] = self.employeeRepo.getAllData(query={"storeID": id}, projection=self.employeeRepo.publicProjection)
             return {"status": True, "message": "Data fetched successfully", "data": data}
         except Exception as e:
             raise Exception("Failed to get data {e}")
         
     def deleteStore(self, id,  employeeId, employeeName):
         try:
-            employee = self.employeeRepo.getAllData(query={"branchId": id})
-            print("EMPLOYEE : ", employee)
-            if len(employee) > 0 and employee != None:
+            employee = self.employeeRepo.countData(query={"branchId": id})
+            logger.debug("EMPLOYEE : %s", employee)
+            if employee > 0:
                 employee = self.employeeRepo.deleteData(query={"branchId": id}, multi=True)
             
             store  = self.repo.deleteData(id=id)
+            self.repo.invalidateGeofence(id)
             if not store and not employee:
                 result = {"status": False, "message": "Failed to delete data"}
                 return result
@@ -113,16 +117,17 @@ class StoreService:
     
     def updateStore(self, id, data,  employeeId, employeeName):
         try:
-            print("UPDATE SERVICE-----")
-            print("[SERVICE DATA]: ", data)
+            logger.debug("UPDATE SERVICE-----")
+            logger.debug("[SERVICE DATA]: %s", data)
             del data["id"]
             data = self.updateSchema.load(data)
-            print("[SERVICE UPDATE STORE : ]" , data )
+            logger.debug("[SERVICE UPDATE STORE : ] %s", data)
             res = self.repo.updateData(validateData=data, id=id)
-            print("[SERVICE UPDATE STORE RESULT : ]" , res )
+            logger.debug("[SERVICE UPDATE STORE RESULT : ] %s", res)
             if not res.acknowledged:
                 result = {"status": False, "message": "Failed to update data"}
                 return result
+            self.repo.invalidateGeofence(id)
             
             history = self.historyService.createHistory(data={
                 "employeeId": employeeId,
@@ -136,7 +141,7 @@ class StoreService:
             
             return {"status": True, "message": "Data updated successfully"}
         except ValidationError as e:
-            print("VALIDATION ERROR: ", e)
+            logger.warning("VALIDATION ERROR: %s", e)
             raise ValidationError(e)
         except Exception as e:
             raise Exception(f"Failed to update data e")
@@ -145,9 +150,9 @@ class StoreService:
     def nonActivateStore(self, id, employee):
         try:
             data = self.repo.updateData(id=id, validateData={"status": "inactive"})
-            print("---- NON ACTIVATE STORE SERVICE -----: ", data)
+            logger.debug("---- NON ACTIVATE STORE SERVICE -----: %s", data)
             employees = self.employeeRepo.updateData(query={"branchId": id}, update={"$set": {"status": "inactive", "branchId": None}}, multi=True)
-            print("--- NON ACTIVATE EMPLOYEE SERVICE ----: ", employees)
+            logger.debug("--- NON ACTIVATE EMPLOYEE SERVICE ----: %s", employees)
             if not employees.acknowledged:
                 result = {"status": False, "message": "Failed to update data"}
                 return result
@@ -170,7 +175,7 @@ class StoreService:
     def ActivateStore(self, id, employee):
         try:
             data = self.repo.updateData(id=id, validateData={"status": "active"})
-            print("---- NON ACTIVATE STORE SERVICE -----: ", data)
+            logger.debug("---- NON ACTIVATE STORE SERVICE -----: %s", data)
             if not data.acknowledged:
                 result = {"status": False, "message": "Failed to update data"}
                 return result
@@ -192,7 +197,7 @@ class StoreService:
             data = self.repo.getData(id=id)
             if data == None:
                 return {"status": False, "message": "Data not found"}
-            employees = self.employeeRepo.getAllData(query={"branchId": id})
+            employees = self.employeeRepo.getAllData(query={"branchId": id}, projection=self.employeeRepo.publicProjection)
             validate = []
             for emp in employees:
                 dump = self.employeeSchema.dump(emp)
@@ -205,9 +210,9 @@ class StoreService:
     def getActiveStore(self):
         try:
             data = self.repo.getAllData(query={"status": "active"})
-            print("DATA : ", data)
+            logger.debug("DATA : %s", data)
             data = self.schema.dump(data, many=True)
-            print("DATA : ", data)
+            logger.debug("DATA : %s", data)
             return {"status": True, "message": "Data fetched successfully", "data": data}
         except Exception as e:
             raise Exception(f"Failed to get data {e}")
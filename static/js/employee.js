@@ -1,16 +1,29 @@
 let schedule = [];
+// jadwal bulan berjalan, terpisah dari `schedule` (bulan di month picker)
+// supaya shift hari ini tetap ada saat user melihat bulan lain
+let todaySchedule = [];
 let currentShiftId = null;
 let selectedMonth = null;
 let isRequested = false;
 
-const fetchSchedule = async () => {
+const currentMonth = () => {
+  const now = new Date();
+  return `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, "0")}`;
+};
+
+const getSchedule = async (month) => {
+  const user = await currentUser();
+  console.log("LOADING GET SCHEDULE", month);
+  const res = await axios.get(`/api/attendance/schedule/${user.id}`, {
+    params: month ? { month } : {},
+  });
+  return res.data.data || [];
+};
+
+const fetchSchedule = async (month) => {
   try {
-    const user = await currentUser();
-    console.log("user", user);
-    console.log("LOADING GET SCHEDULE");
-    const res = await axios.get(`/api/attendance/schedule/${user.id}`);
-    console.log("RES DATA SCHEDULE :", res.data.data);
-    schedule = res.data.data;
+    schedule = await getSchedule(month);
+    console.log("RES DATA SCHEDULE :", schedule);
   } catch (error) {
     console.error("❌ Error fetching schedule:", error);
     webix.message({ type: "error", text: "Error fetching schedule." });
@@ -18,6 +31,23 @@ const fetchSchedule = async () => {
   }
 };
 
+const fetchTodaySchedule = async () => {
+  try {
+    const month = currentMonth();
+    todaySchedule = month === selectedMonth ? schedule : await getSchedule(month);
+  } catch (error) {
+    console.error("❌ Error fetching today's shift:", error);
+    webix.message({ type: "error", text: "Error fetching today's shift." });
+  }
+};
+
+const refreshAfterClock = async () => {
+  await fetchSchedule(selectedMonth);
+  await renderSchedule(selectedMonth);
+  await fetchTodaySchedule();
+  await currentShift();
+};
+
 const renderSchedule = async (monthFilter) => {
   try {
     const scheduleList = document.getElementById("scheduleList");
@@ -117,8 +147,7 @@ const clockIn = async () => {
     );
 
     if (res.data.status) {
-      await renderSchedule(selectedMonth);
-      await currentShift();
+      await refreshAfterClock();
       console.log("Clock in successful!");
       isRequested = false;
 
@@ -177,8 +206,7 @@ const clockOut = async () => {
 
     isRequested = false;
     if (res?.data?.status) {
-      await renderSchedule(selectedMonth);
-      await currentShift();
+      await refreshAfterClock();
       btn.classList.remove("opacity-50", "cursor-not-allowed");
       btn.disabled = false;
       return webix.message({ type: "success", text: "Clock out successful!" });
@@ -206,7 +234,8 @@ const currentShift = async () => {
       month: "short",
       day: "numeric",
     });
-    const myshift = schedule.filter((item) => {
+    currentShiftId = null;
+    const myshift = todaySchedule.filter((item) => {
       const date = new Date(item.Date).toLocaleDateString("en-US", {
         year: "numeric",
         month: "short",
@@ -282,27 +311,26 @@ const currentShift = async () => {
 document.addEventListener("DOMContentLoaded", async () => {
   topNav();
   navbarSide();
-  if (schedule.length === 0) {
-    await fetchSchedule();
-  }
   isRequested = false;
 
   const monthPicker = document.getElementById("monthPicker");
   if (monthPicker) {
-    const now = new Date();
-    const year = now.getFullYear();
-    const month = String(now.getMonth() + 1).padStart(2, "0");
-    const formattedMonth = `${year}-${month}`;
+    selectedMonth = currentMonth();
 
-    monthPicker.value = formattedMonth;
+    monthPicker.value = selectedMonth;
+    await fetchSchedule(selectedMonth);
 
-    console.log("📅 Selected month:", formattedMonth);
+    console.log("📅 Selected month:", selectedMonth);
 
-    await renderSchedule(formattedMonth).then(async () => await currentShift());
+    await renderSchedule(selectedMonth);
+    await fetchTodaySchedule();
+    await currentShift();
     console.log("shift id", currentShiftId);
 
     monthPicker.addEventListener("change", async (e) => {
-      await renderSchedule(e.target.value);
+      selectedMonth = e.target.value;
+      await fetchSchedule(selectedMonth);
+      await renderSchedule(selectedMonth);
     });
   }
 });
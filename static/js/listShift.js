@@ -224,16 +224,15 @@ const loadPresentLate = async () => {
   try {
     const [res, leave] = await Promise.all([
       axios.get(`/api/attendance/getMonthlySummary/${selectedMonth}`),
-      axios.get("/api/annualRequest/list-manager"),
+      axios.get("/api/annualRequest/count-manager", {
+        params: { status: "pending" },
+      }),
     ]);
 
     console.log("✅ Monthly summary:", res.data.data);
     const presentCount = res.data.data?.presentCount || 0;
     const lateCount = res.data.data?.lateCount || 0;
-    const request = leave.data.data || [];
-    const requestCount = request.filter(
-      (req) => req.status === "pending"
-    ).length;
+    const requestCount = leave.data.data?.count || 0;
 
     const presentElement = document.getElementById("presentCount");
     const lateElement = document.getElementById("lateCount");
@@ -7,6 +7,13 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 import pendulum
 from bson import ObjectId
+from utils.config import Config
+
+
+@pytest.fixture(autouse=True)
+def sync_history(monkeypatch):
+    """History ditulis synchronous di test supaya tidak ada background thread ke database"""
+    monkeypatch.setattr(Config, "HISTORY_ASYNC", False)
 
 @pytest.fixture
 def mock_employee_repo():
@@ -0,0 +1,87 @@
+"""
+Cek query-query yang dipakai service tidak jatuh ke COLLSCAN.
+
+Butuh MongoDB sungguhan, jadi hanya jalan kalau env TEST_MONGO_URI diisi, contoh:
+    TEST_MONGO_URI=mongodb://127.0.0.1:27017 pytest -m integration
+Database yang dipakai: aventra_index_test (di-drop setelah test).
+"""
+import os
+import pytest
+import pendulum
+from unittest.mock import patch
+from pymongo import MongoClient
+from utils.indexes import REPOSITORIES, findCollscans
+
+pytestmark = pytest.mark.integration
+
+TEST_DATABASE = "aventra_index_test"
+NOW = pendulum.datetime(2025, 10, 1)
+NEWEST_FIRST = [("createdAt", -1), ("_id", -1)]
+
+# query shape yang dipakai service, per collection
+SERVICE_QUERIES = {
+    "sessions": [{"token": "token"}],
+    "employees": [
+        {"email": "john@aventra.com"},
+        {"role": "manager", "branchId": "STR_001", "status": "active"},
+        {"branchId": "STR_001", "role": "employee", "status": "active"},
+        {"$and": [{"branchId": "STR_001"}, {"role": "employee"}]},
+        {"branchId": "STR_001"},
+    ],
+    "attendances": [
+        {"branchId": "STR_001", "Date": NOW},
+        {"branchId": "STR_001", "Date": {"$gte": NOW, "$lt": NOW.add(months=1)}},
+        {"branchId": "STR_001", "employees.employeeId": "EMP_001"},
+    ],
+    "leaveRequests": [
+        {"employeeId": "EMP_001"},
+        {"employeeId": "EMP_001", "status": {"$in": ["pending", "approved"]},
+         "startDate": {"$lt": NOW.add(days=5)}, "endDate": {"$gte": NOW}},
+        ({"branchId": "STR_001", "requesterRole": "employee", "status": {"$in": ["pending", "approved"]}}, NEWEST_FIRST),
+        ({"requesterRole": "manager", "status": "pending"}, NEWEST_FIRST),
+    ],
+    "histories": [
+        ({}, NEWEST_FIRST),
+        ({"employeeId": "EMP_001"}, NEWEST_FIRST),
+        ({"type": "auth", "createdAt": {"$gte": NOW}}, NEWEST_FIRST),
+    ],
+    "stores": [{"status": "active"}],
+}
+
+
+@pytest.fixture(scope="module")
+def test_db():
+    uri = os.getenv("TEST_MONGO_URI")
+    if not uri:
+        pytest.skip("TEST_MONGO_URI not set")
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except Exception as e:
+        pytest.skip(f"MongoDB not reachable: {e}")
+    db = client[TEST_DATABASE]
+    yield db
+    client.drop_database(TEST_DATABASE)
+    client.close()
+
+
+@pytest.fixture(scope="module")
+def repos(test_db):
+    with patch('repo.BaseRepo.mongoConnection') as mock_connection_class:
+        mock_connection_class.return_value.getColleciton.side_effect = lambda name: test_db[name]
+        repos = {}
+        for repoClass in REPOSITORIES:
+            repo = repoClass()
+            repo.ensureIndexes()
+            repos[repo.collection.name] = repo
+    return repos
+
+
+def test_service_queries_use_index(repos):
+    """Laporkan semua query service yang winning plan-nya COLLSCAN"""
+    collscans = {}
+    for name, queries in SERVICE_QUERIES.items():
+        found = findCollscans(repos[name], queries)
+        if found:
+            collscans[name] = found
+    assert collscans == {}, f"Queries ending in COLLSCAN: {collscans}"
@@ -0,0 +1,448 @@
+import pytest
+from unittest.mock import Mock, patch
+import pendulum
+from datetime import datetime
+from service.attendanceService import AttendanceService
+
+
+@pytest.fixture
+def sample_shift(sample_employee, sample_manager):
+    """Sample dokumen shift harian untuk testing"""
+    return {
+        "_id": "SHF_2025-10-31_4866",
+        "Date": pendulum.datetime(2025, 10, 31),
+        "branchId": "STR_001",
+        "employees": [
+            {"employeeId": sample_manager["_id"], "shift": "fullday", "clockIn": None, "clockOut": None, "status": "absent"},
+            {"employeeId": sample_employee["_id"], "shift": "Day", "clockIn": "07:05:00", "clockOut": None, "status": "present"},
+        ]
+    }
+
+
+class TestAttendanceServiceHydrateEmployees:
+    """Test hydrate data employee di shift - tanpa N+1 query"""
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_monthly_shifts_single_employee_query(self, mock_repo_class, mock_store_class, mock_shifts_class,
+                                                  mock_emp_class, sample_shift, sample_employee, sample_manager):
+        """Test path: sebulan shift -> employee diambil dengan satu query $in"""
+        second_day = dict(sample_shift, _id="SHF_2025-11-01_1111", Date=pendulum.datetime(2025, 11, 1),
+                          employees=[dict(emp) for emp in sample_shift["employees"]])
+        mock_repo = Mock()
+        mock_repo.getAllData.return_value = [second_day, sample_shift]
+        mock_repo_class.return_value = mock_repo
+
+        mock_emp = Mock()
+        mock_emp.getDataByIds.return_value = [sample_employee, sample_manager]
+        mock_emp_class.return_value = mock_emp
+
+        service = AttendanceService()
+        result = service.getMonthlyShifts("STR_001", month=10, year=2025)
+
+        assert result["status"] == True
+        assert [s["_id"] for s in result["data"]] == ["SHF_2025-10-31_4866", "SHF_2025-11-01_1111"]
+        mock_emp.getDataByIds.assert_called_once_with({"EMP_12345", "EMP_99999"})
+        mock_emp.getDataById.assert_not_called()
+        for shift in result["data"]:
+            names = {emp["employee"]["name"] for emp in shift["employees"]}
+            assert names == {"John Doe", "Manager User"}
+            assert all("password" not in emp["employee"] for emp in shift["employees"])
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_attendance_by_store_missing_employee(self, mock_repo_class, mock_store_class, mock_shifts_class,
+                                                  mock_emp_class, sample_shift, sample_employee):
+        """Test path: employee sudah dihapus -> entry tetap ada dengan employee kosong"""
+        mock_repo = Mock()
+        mock_repo.getData.return_value = sample_shift
+        mock_repo_class.return_value = mock_repo
+
+        mock_emp = Mock()
+        mock_emp.getDataByIds.return_value = [sample_employee]
+        mock_emp_class.return_value = mock_emp
+
+        service = AttendanceService()
+        result = service.getAttendanceByStore("STR_001", "2025-10-31")
+
+        assert result["status"] == True
+        employees = {emp["employeeId"]: emp["employee"] for emp in result["data"]["employees"]}
+        assert employees["EMP_12345"]["name"] == "John Doe"
+        assert employees["EMP_99999"] == {}
+        mock_emp.getDataByIds.assert_called_once()
+
+
+class TestAttendanceServiceSummary:
+    """Test ringkasan attendance - dihitung lewat aggregation pipeline"""
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_monthly_summary_counts(self, mock_repo_class, mock_store_class, mock_shifts_class, mock_emp_class):
+        """Test path: ringkasan bulanan pakai getSummary, bukan getAllData"""
+        counts = {"presentCount": 10, "lateCount": 5, "absentCount": 2, "noClockOutCount": 1, "scheduledCount": 17}
+        mock_repo = Mock()
+        mock_repo.getSummary.return_value = {
+            "totals": [dict(counts, _id=None)],
+            "byBranch": [dict(counts, _id="STR_001")],
+            "byEmployee": [dict(counts, _id={"branchId": "STR_001", "employeeId": "EMP_12345"})],
+            "byShift": [dict(counts, _id={"branchId": "STR_001", "shift": "Day"})],
+        }
+        mock_repo_class.return_value = mock_repo
+
+        service = AttendanceService()
+        result = service.getMonthlySummary("STR_001", month=10, year=2025)
+
+        assert result["status"] == True
+        assert result["message"] == "Monthly summary for 2025-10"
+        assert result["data"]["presentCount"] == 10
+        assert result["data"]["lateCount"] == 5
+        assert result["data"]["absentCount"] == 2
+        assert result["data"]["employees"][0]["employeeId"] == "EMP_12345"
+        assert result["data"]["shifts"][0]["shift"] == "Day"
+        mock_repo.getAllData.assert_not_called()
+        branchIds, start, end = mock_repo.getSummary.call_args.args
+        assert branchIds == ["STR_001"]
+        assert start == pendulum.datetime(2025, 10, 1)
+        assert end == pendulum.datetime(2025, 11, 1)
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_monthly_summary_empty(self, mock_repo_class, mock_store_class, mock_shifts_class, mock_emp_class):
+        """Test path: tidak ada shift di bulan itu -> semua nol"""
+        mock_repo = Mock()
+        mock_repo.getSummary.return_value = {"totals": [], "byBranch": [], "byEmployee": [], "byShift": []}
+        mock_repo_class.return_value = mock_repo
+
+        service = AttendanceService()
+        result = service.getMonthlySummary("STR_001", month=10, year=2025)
+
+        assert result["message"] == "No shift data found for 2025-10"
+        assert result["data"]["presentCount"] == 0
+        assert result["data"]["lateCount"] == 0
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_summary_all_branches(self, mock_repo_class, mock_store_class, mock_shifts_class, mock_emp_class):
+        """Test path: owner tanpa branchId -> semua branch dalam satu query"""
+        mock_repo = Mock()
+        mock_repo.getSummary.return_value = {"totals": [], "byBranch": [], "byEmployee": [], "byShift": []}
+        mock_repo_class.return_value = mock_repo
+
+        mock_store = Mock()
+        mock_store.iterData.return_value = iter([{"_id": "STR_001"}, {"_id": "STR_002"}])
+        mock_store_class.return_value = mock_store
+
+        service = AttendanceService()
+        service.getAttendanceSummary([], "2025-10-01", "2025-12-01")
+
+        mock_repo.getSummary.assert_called_once()
+        assert mock_repo.getSummary.call_args.args[0] == ["STR_001", "STR_002"]
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_summary_invalid_date(self, mock_repo_class, mock_store_class, mock_shifts_class, mock_emp_class):
+        """Test path: tanggal tidak valid -> ValueError (400), bukan 500"""
+        service = AttendanceService()
+
+        with pytest.raises(ValueError, match="Invalid date range"):
+            service.getAttendanceSummary(["STR_001"], "2025-13-45", "2025-12-01")
+
+        mock_repo_class.return_value.getSummary.assert_not_called()
+
+    @patch('service.attendanceService.EmployeeRepo')
+    @patch('service.attendanceService.ShiftsRepo')
+    @patch('service.attendanceService.StoreRepo')
+    @patch('service.attendanceService.AttendanceRepo')
+    def test_summary_invalid_range(self, mock_repo_class, mock_store_class, mock_shifts_class, mock_emp_class):
+        """Test path: tanggal awal setelah tanggal akhir"""
+        service = AttendanceService()
+
+        with pytest.raises(ValueError):
+            service.getAttendanceSummary(["STR_001"], "2025-12-01", "2025-10-01")
+
+
+@pytest.fixture
+def freeze_now(monkeypatch):
+    """Bekukan pendulum.now() di waktu tertentu (Asia/Jakarta)"""
+    def freeze(hour, minute):
+        frozen = pendulum.datetime(2025, 10, 31, hour, minute, tz="Asia/Jakarta")
+        monkeypatch.setattr(pendulum, "now", lambda tz=None: frozen.in_tz(tz) if tz else frozen)
+    return freeze
+
+
+@pytest.fixture
+def clock_services(sample_employee):
+    """AttendanceService dengan semua repo di-mock dan shift Day 07:00-15:00"""
+    with patch('service.attendanceService.AttendanceRepo') as mock_repo_class, \
+         patch('service.attendanceService.StoreRepo') as mock_store_class, \
+         patch('service.attendanceService.ShiftsRepo') as mock_shifts_class, \
+         patch('service.attendanceService.EmployeeRepo') as mock_emp_class, \
+         patch('service.attendanceService.EmployeeScheduleRepo'), \
+         patch('service.attendanceService.HistoryService') as mock_history_class:
+        mock_store_class.return_value.validateCheckIn.return_value = {"_id": "STR_001"}
+        mock_shifts_class.return_value.getShiftMap.return_value = {
+            "Day": {"startTime": pendulum.time(7, 0, 0), "endTime": pendulum.time(15, 0, 0)},
+        }
+        mock_history_class.return_value.createHistory.return_value = {"status": True}
+        service = AttendanceService()
+        yield service, mock_repo_class.return_value, mock_emp_class.return_value, mock_history_class.return_value
+
+
+CLOCK_DATA = {"shiftId": "SHF_2025-10-31_4866", "geometry": {"type": "Point", "coordinates": [110.3695, -7.7956]}}
+
+
+class TestAttendanceServiceClock:
+    """Test clock in / clock out atomik (find_one_and_update + arrayFilters)"""
+
+    def test_clock_in_present_single_update(self, clock_services, sample_employee, freeze_now):
+        """Test path: clock in tepat waktu -> satu update, tanpa baca shift dulu"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(7, 5)
+        mock_repo.clockIn.return_value = {"employees": [{"employeeId": sample_employee["_id"], "status": "present"}]}
+
+        result = service.employeeClockIn(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Clocked in successfully as present"}
+        kwargs = mock_repo.clockIn.call_args.kwargs
+        assert kwargs["presentShifts"] == ["Day"]
+        assert kwargs["lateShifts"] == []
+        assert kwargs["clockIn"] == "07:05:00"
+        service.scheduleRepo.updateEntries.assert_called_once_with(
+            [(CLOCK_DATA["shiftId"], sample_employee["_id"], {"clockIn": "07:05:00", "status": "present"})]
+        )
+        mock_repo.getDataById.assert_not_called()
+        mock_repo.updateData.assert_not_called()
+
+    def test_clock_in_late(self, clock_services, sample_employee, freeze_now):
+        """Test path: lebih dari 10 menit setelah mulai -> shift masuk lateShifts"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(7, 30)
+        mock_repo.clockIn.return_value = {"employees": [{"employeeId": sample_employee["_id"], "status": "late"}]}
+
+        result = service.employeeClockIn(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result["message"] == "Clocked in successfully as late"
+        assert mock_repo.clockIn.call_args.kwargs["lateShifts"] == ["Day"]
+
+    def test_clock_in_twice_idempotent(self, clock_services, sample_employee, freeze_now):
+        """Test path: clock in ulang tidak mengubah data dan tidak menulis history"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(7, 30)
+        mock_repo.clockIn.return_value = None
+        mock_repo.getEmployeeEntry.return_value = {"employees": [
+            {"employeeId": sample_employee["_id"], "shift": "Day", "clockIn": "07:05:00", "status": "present"}
+        ]}
+
+        result = service.employeeClockIn(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Already clocked in as present"}
+        mock_history.createHistory.assert_not_called()
+
+    def test_clock_in_too_early(self, clock_services, sample_employee, freeze_now):
+        """Test path: lebih dari 30 menit sebelum shift mulai"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(6, 0)
+        mock_repo.clockIn.return_value = None
+        mock_repo.getEmployeeEntry.return_value = {"employees": [
+            {"employeeId": sample_employee["_id"], "shift": "Day", "clockIn": None}
+        ]}
+
+        result = service.employeeClockIn(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result["status"] == False
+        assert result["message"] == "Employee clock in time is outside the shift time"
+        assert mock_repo.clockIn.call_args.kwargs["presentShifts"] == []
+
+    def test_clock_out_counts_late_day(self, clock_services, sample_employee, freeze_now):
+        """Test path: clock out setelah shift selesai -> counter lateDays lewat bulk_write"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(15, 5)
+        mock_repo.clockOut.return_value = {"employees": [{"employeeId": sample_employee["_id"], "status": "late"}]}
+
+        result = service.employeeClockOut(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Data updated successfully"}
+        assert mock_repo.clockOut.call_args.kwargs["endedShifts"] == ["Day"]
+        mock_emp.incrementCounters.assert_called_once_with({sample_employee["_id"]: {"lateDays": 1}})
+
+    def test_clock_out_counter_failure_logged(self, clock_services, sample_employee, freeze_now, caplog):
+        """Test path: clockOut sudah tersimpan, increment counter gagal -> tetap berhasil, error di-log"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(15, 5)
+        mock_repo.clockOut.return_value = {"employees": [{"employeeId": sample_employee["_id"], "status": "present"}]}
+        mock_emp.incrementCounters.side_effect = Exception("Database error")
+
+        result = service.employeeClockOut(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Data updated successfully"}
+        assert any("workDays" in record.getMessage() and record.levelname == "ERROR" for record in caplog.records)
+
+    def test_clock_out_twice_no_double_count(self, clock_services, sample_employee, freeze_now):
+        """Test path: clock out ulang tidak menambah workDays lagi"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(15, 5)
+        mock_repo.clockOut.return_value = None
+        mock_repo.getEmployeeEntry.return_value = {"employees": [
+            {"employeeId": sample_employee["_id"], "shift": "Day", "clockIn": "07:05:00", "clockOut": "15:01:00"}
+        ]}
+
+        result = service.employeeClockOut(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Already clocked out"}
+        mock_emp.incrementCounters.assert_not_called()
+
+    def test_clock_out_before_shift_end(self, clock_services, sample_employee, freeze_now):
+        """Test path: shift belum selesai"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(12, 0)
+        mock_repo.clockOut.return_value = None
+        mock_repo.getEmployeeEntry.return_value = {"employees": [
+            {"employeeId": sample_employee["_id"], "shift": "Day", "clockIn": "07:05:00", "clockOut": None}
+        ]}
+
+        result = service.employeeClockOut(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": False, "message": "Clock out time is not yet"}
+
+
+class TestAttendanceServiceClockBurst:
+    """Test clock in mode burst (write-ahead log + bulk_write)"""
+
+    def test_clock_in_enqueued_without_db_write(self, clock_services, sample_employee, freeze_now, monkeypatch):
+        """Test path: mode burst -> event masuk log, tidak ada update ke database"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        freeze_now(7, 5)
+        monkeypatch.setattr("service.attendanceService.Config.CLOCK_BURST_MODE", True)
+        with patch('service.attendanceService.clockEventLog') as mock_log:
+            result = service.employeeClockIn(data=CLOCK_DATA, employee=sample_employee)
+
+        assert result == {"status": True, "message": "Clock in received"}
+        event = mock_log.append.call_args.args[0]
+        assert event["shiftId"] == CLOCK_DATA["shiftId"]
+        assert event["clockIn"] == "07:05:00"
+        assert event["presentShifts"] == ["Day"]
+        mock_repo.clockIn.assert_not_called()
+        mock_history.createHistory.assert_not_called()
+
+    def test_apply_clock_events_records_history_once(self, clock_services):
+        """Test path: event duplikat / ditolak tidak menulis history"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        base = {"shiftId": "SHF_001", "employeeName": "John", "clockIn": "07:05:00",
+                "presentShifts": ["Day"], "lateShifts": [], "receivedAt": "2025-10-31T07:05:00+07:00"}
+        events = [
+            {**base, "employeeId": "EMP_001"},
+            {**base, "employeeId": "EMP_001"},
+            {**base, "employeeId": "EMP_002"},
+        ]
+        mock_repo.getAllData.return_value = [{"_id": "SHF_001", "employees": [
+            {"employeeId": "EMP_001", "clockIn": "07:05:00", "status": "present"},
+            {"employeeId": "EMP_002", "clockIn": "06:50:00", "status": "present"},
+        ]}]
+
+        assert service.applyClockEvents(events) == 1
+
+        mock_repo.applyClockIns.assert_called_once_with(events)
+        history = mock_history.createHistory.call_args.kwargs["data"]
+        assert history["employeeId"] == "EMP_001"
+        assert history["createdAt"] == base["receivedAt"]
+
+
+class TestAttendanceServicePlanShifts:
+    """Test bulk planner shift (satu insert_many untuk semua hari)"""
+
+    def test_rotation_one_insert_with_conflicts(self, clock_services, sample_manager):
+        """Test path: pola rotasi -> satu insertShifts, hari bentrok dilaporkan"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        mock_emp.getDataByIds.return_value = [
+            {"_id": "EMP_001", "branchId": sample_manager["branchId"]},
+            {"_id": "EMP_002", "branchId": sample_manager["branchId"]},
+        ]
+        mock_repo.insertShifts.return_value = [{"index": 1, "code": 11000}]
+
+        result = service.planShifts(data={
+            "startDate": "2025-11-01",
+            "endDate": "2025-11-04",
+            "rotation": [
+                {"employeeId": "EMP_001", "pattern": ["Day", "off"]},
+                {"employeeId": "EMP_002", "pattern": ["Day", "off", "off", "off"]},
+            ],
+        }, currentUser=sample_manager)
+
+        shifts = mock_repo.insertShifts.call_args.args[0]
+        assert [shift["Date"].day for shift in shifts] == [1, 3]
+        assert [emp["employeeId"] for emp in shifts[0]["employees"]] == [sample_manager["_id"], "EMP_001", "EMP_002"]
+        assert [emp["employeeId"] for emp in shifts[1]["employees"]] == [sample_manager["_id"], "EMP_001"]
+        assert result["status"] == True
+        assert result["data"] == {
+            "created": ["2025-11-01"],
+            "conflicts": [{"date": "2025-11-03", "message": "Shift already exists for this date"}],
+        }
+        mock_emp.getDataByIds.assert_called_once()
+        mock_history.createHistory.assert_called_once()
+
+    def test_employee_from_other_branch(self, clock_services, sample_manager):
+        """Test path: karyawan bukan dari branch manager -> tidak ada insert"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        mock_emp.getDataByIds.return_value = [{"_id": "EMP_001", "branchId": "STR_OTHER"}]
+
+        result = service.planShifts(data={
+            "startDate": "2025-11-01",
+            "endDate": "2025-11-02",
+            "roster": {"2025-11-02": [{"employeeId": "EMP_001", "shift": "Day"}]},
+        }, currentUser=sample_manager)
+
+        assert result == {"status": False, "message": "Employees not found in this branch: EMP_001"}
+        mock_repo.insertShifts.assert_not_called()
+
+    def test_invalid_shift_name(self, clock_services, sample_manager):
+        service, mock_repo, mock_emp, mock_history = clock_services
+
+        result = service.planShifts(data={
+            "startDate": "2025-11-01",
+            "endDate": "2025-11-01",
+            "rotation": [{"employeeId": "EMP_001", "pattern": ["Morning"]}],
+        }, currentUser=sample_manager)
+
+        assert result["status"] == False
+        assert "Invalid shift name: Morning" in result["message"]
+        mock_repo.insertShifts.assert_not_called()
+
+
+class TestAttendanceServiceSchedule:
+    """Test jadwal employee dari projection employeeSchedules"""
+
+    def test_schedule_reads_projection_for_month(self, clock_services, sample_employee):
+        """Test path: satu query range per bulan, _id response = ID shift"""
+        service, mock_repo, mock_emp, mock_history = clock_services
+        service.scheduleRepo.getSchedule.return_value = [
+            {"_id": "SHF_001:EMP_001", "shiftId": "SHF_001", "Date": pendulum.datetime(2025, 11, 3),
+             "shift": "Day", "clockIn": None, "clockOut": None, "status": "absent"},
+        ]
+        service.shiftsRepo.getShiftMap.return_value = {"Day": {"shiftStartTime": "07:00:00", "shiftEndTime": "15:00:00"}}
+
+        result = service.getEmployeeSchedule("EMP_001", "STR_001", month="2025-12")
+
+        args = service.scheduleRepo.getSchedule.call_args
+        assert args.args[1:] == (datetime(2025, 12, 1), datetime(2026, 1, 1))
+        assert args.kwargs["branchId"] == "STR_001"
+        assert result["data"][0]["_id"] == "SHF_001"
+        assert result["data"][0]["shiftStartTime"] == "07:00:00"
+        mock_repo.getAllData.assert_not_called()
+
+    def test_schedule_invalid_month(self, clock_services):
+        service, mock_repo, mock_emp, mock_history = clock_services
+
+        with pytest.raises(ValueError):
+            service.getEmployeeSchedule("EMP_001", "STR_001", month="12-2025")
@@ -3,6 +3,10 @@ import pytest
 from unittest.mock import Mock, patch
 from service.historyService import HistoryService
 from  marshmallow import ValidationError
+from utils.config import Config
+from datetime import datetime
+from utils.historyWriter import HistoryWriter
+from pymongo.errors import BulkWriteError
 
 
 class TestHistoryServiceCreateHistory:
@@ -32,7 +36,27 @@ class TestHistoryServiceCreateHistory:
         assert result["status"] == True
         assert result["message"] == "Data inserted successfully"
         mock_repo.insertData.assert_called_once()
-    
+
+    @patch('service.historyService.HistoryRepo')
+    def test_create_history_unique_id(self, mock_repo_class, mock_acknowledged_result):
+        """Test path: entry di detik yang sama tetap dapat _id berbeda"""
+        mock_repo = Mock()
+        mock_repo.insertData.return_value = mock_acknowledged_result
+        mock_repo_class.return_value = mock_repo
+
+        service = HistoryService()
+        for _ in range(200):
+            service.createHistory({
+                "employeeId": "EMP_001",
+                "employeeName": "John Doe",
+                "description": "Login successfully",
+                "type": "auth"
+            })
+
+        ids = [call.kwargs["validateData"]["_id"] for call in mock_repo.insertData.call_args_list]
+        assert len(set(ids)) == 200
+        assert all(id.startswith("HIS") for id in ids)
+
     @patch('service.historyService.HistoryRepo')
     def test_create_history_failed_insert(self, mock_repo_class, mock_not_acknowledged_result):
         """Test path: gagal insert ke database"""
@@ -83,14 +107,14 @@ class TestHistoryServiceGetHistory:
     
     @patch('service.historyService.HistoryRepo')
     def test_get_all_history_success(self, mock_repo_class):
-        """Test path: berhasil get all history"""
+        """Test path: berhasil get halaman pertama history"""
         # Setup
         mock_repo = Mock()
         mock_data = [
             {"_id": "HIS_001", "employeeId": "EMP_001", "description": "Login"},
             {"_id": "HIS_002", "employeeId": "EMP_002", "description": "Create employee"}
         ]
-        mock_repo.getAllData.return_value = mock_data
+        mock_repo.getPage.return_value = (mock_data, None)
         mock_repo_class.return_value = mock_repo
         
         service = HistoryService()
@@ -101,6 +125,8 @@ class TestHistoryServiceGetHistory:
         # Assert
         assert result["status"] == True
         assert len(result["data"]) == 2
+        assert result["next_cursor"] is None
+        mock_repo.getPage.assert_called_once_with(query={}, limit=Config.HISTORY_PAGE_SIZE, after=None)
     
     @patch('service.historyService.HistoryRepo')
     def test_get_user_history_success(self, mock_repo_class):
@@ -110,7 +136,7 @@ class TestHistoryServiceGetHistory:
         mock_data = [
             {"_id": "HIS_001", "employeeId": "EMP_001", "description": "Login"}
         ]
-        mock_repo.getAllData.return_value = mock_data
+        mock_repo.getPage.return_value = (mock_data, None)
         mock_repo_class.return_value = mock_repo
         
         service = HistoryService()
@@ -121,14 +147,14 @@ class TestHistoryServiceGetHistory:
         # Assert
         assert result["status"] == True
         assert len(result["data"]) == 1
-        mock_repo.getAllData.assert_called_once_with(query={"employeeId": "EMP_001"})
+        assert mock_repo.getPage.call_args.kwargs["query"] == {"employeeId": "EMP_001"}
     
     @patch('service.historyService.HistoryRepo')
     def test_get_user_history_not_found(self, mock_repo_class):
         """Test path: user tidak punya history"""
         # Setup
         mock_repo = Mock()
-        mock_repo.getAllData.return_value = []
+        mock_repo.getPage.return_value = ([], None)
         mock_repo_class.return_value = mock_repo
         
         service = HistoryService()
@@ -141,4 +167,165 @@ class TestHistoryServiceGetHistory:
         assert result["message"] == "Failed to get data"
 
 
-    
\ No newline at end of file
+class TestHistoryServicePagination:
+    """Test keyset pagination dan filter history"""
+
+    @patch('service.historyService.HistoryRepo')
+    def test_next_cursor_round_trip(self, mock_repo_class):
+        """Test path: next_cursor dari halaman 1 dipakai sebagai batas halaman 2"""
+        mock_repo = Mock()
+        createdAt = datetime(2025, 11, 29, 3, 30)
+        mock_repo.getPage.return_value = ([{"_id": "HIS_002"}], (createdAt, "HIS_002"))
+        mock_repo_class.return_value = mock_repo
+
+        service = HistoryService()
+        first = service.getAllHistory(limit="1")
+        mock_repo.getPage.return_value = ([{"_id": "HIS_001"}], None)
+        second = service.getAllHistory(limit="1", cursor=first["next_cursor"])
+
+        assert first["next_cursor"]
+        assert second["next_cursor"] is None
+        assert mock_repo.getPage.call_args.kwargs["after"] == (createdAt, "HIS_002")
+
+    @patch('service.historyService.HistoryRepo')
+    def test_filters_to_query(self, mock_repo_class):
+        """Test path: filter type, employeeId dan rentang tanggal"""
+        mock_repo = Mock()
+        mock_repo.getPage.return_value = ([{"_id": "HIS_001"}], None)
+        mock_repo_class.return_value = mock_repo
+
+        service = HistoryService()
+        service.getAllHistory(filters={
+            "type": "attendance,leave",
+            "employeeId": "EMP_001",
+            "start": "2025-11-01",
+            "end": "2025-12-01",
+        })
+
+        query = mock_repo.getPage.call_args.kwargs["query"]
+        assert query["type"] == {"$in": ["attendance", "leave"]}
+        assert query["employeeId"] == "EMP_001"
+        assert query["createdAt"]["$gte"] < query["createdAt"]["$lt"]
+
+    @patch('service.historyService.HistoryRepo')
+    def test_limit_capped(self, mock_repo_class, monkeypatch):
+        """Test path: limit di atas maksimum dipotong ke HISTORY_PAGE_MAX"""
+        monkeypatch.setattr(Config, "HISTORY_PAGE_MAX", 100)
+        mock_repo = Mock()
+        mock_repo.getPage.return_value = ([{"_id": "HIS_001"}], None)
+        mock_repo_class.return_value = mock_repo
+
+        HistoryService().getAllHistory(limit="5000")
+
+        assert mock_repo.getPage.call_args.kwargs["limit"] == 100
+
+    @pytest.mark.parametrize("kwargs", [
+        {"limit": "0"},
+        {"limit": "abc"},
+        {"cursor": "not-a-cursor"},
+        {"filters": {"start": "2025-12-01", "end": "2025-11-01"}},
+    ])
+    @patch('service.historyService.HistoryRepo')
+    def test_invalid_params(self, mock_repo_class, kwargs):
+        """Test path: parameter tidak valid -> ValueError"""
+        with pytest.raises(ValueError):
+            HistoryService().getAllHistory(**kwargs)
+
+
+class TestHistoryServiceAsyncWriter:
+    """Test createHistory lewat antrian background (HISTORY_ASYNC)"""
+
+    @patch('service.historyService.historyWriter')
+    @patch('service.historyService.HistoryRepo')
+    def test_create_history_async_enqueued(self, mock_repo_class, mock_writer, monkeypatch):
+        """Test path: mode async -> entry masuk antrian, tidak insert langsung"""
+        monkeypatch.setattr(Config, "HISTORY_ASYNC", True)
+        mock_repo = Mock()
+        mock_repo_class.return_value = mock_repo
+
+        service = HistoryService()
+        result = service.createHistory({
+            "employeeId": "EMP_001",
+            "employeeName": "John Doe",
+            "description": "Login successfully",
+            "type": "auth"
+        })
+
+        assert result["status"] == True
+        mock_repo.insertData.assert_not_called()
+        mock_writer.put.assert_called_once()
+        assert mock_writer.put.call_args.args[0]["employeeId"] == "EMP_001"
+
+    @patch('service.historyService.historyWriter')
+    @patch('service.historyService.HistoryRepo')
+    def test_create_history_async_still_validates(self, mock_repo_class, mock_writer, monkeypatch):
+        """Test path: mode async tetap validasi schema sebelum masuk antrian"""
+        monkeypatch.setattr(Config, "HISTORY_ASYNC", True)
+
+        service = HistoryService()
+
+        with pytest.raises(ValidationError):
+            service.createHistory({"employeeId": "EMP_001", "type": "transaction"})
+        mock_writer.put.assert_not_called()
+
+
+class TestHistoryWriter:
+    """Test penulisan history per batch"""
+
+    def test_flush_by_size(self):
+        """Test path: entry ditulis per batch dengan insert_many ordered=False"""
+        repo = Mock()
+        writer = HistoryWriter(repo=repo, batchSize=2, flushInterval=60)
+
+        for i in range(5):
+            writer.queue.put({"_id": f"HIS_{i}"})
+        writer.flush()
+
+        calls = repo.collection.insert_many.call_args_list
+        assert [len(call.args[0]) for call in calls] == [2, 2, 1]
+        assert all(call.kwargs == {"ordered": False} for call in calls)
+        assert writer.written == 5
+
+    def test_background_flush_by_time(self):
+        """Test path: batch belum penuh tetap ditulis setelah flushInterval"""
+        repo = Mock()
+        writer = HistoryWriter(repo=repo, batchSize=100, flushInterval=0.05)
+
+        writer.put({"_id": "HIS_1"})
+        writer.put({"_id": "HIS_2"})
+        writer.close()
+
+        written = [doc["_id"] for call in repo.collection.insert_many.call_args_list for doc in call.args[0]]
+        assert written == ["HIS_1", "HIS_2"]
+
+    def test_queue_full_writes_synchronously(self):
+        """Test path: antrian penuh -> entry ditulis langsung (backpressure)"""
+        repo = Mock()
+        writer = HistoryWriter(repo=repo, maxQueue=1, putTimeout=0)
+        writer.start = Mock()
+        writer.queue.put({"_id": "HIS_1"})
+
+        writer.put({"_id": "HIS_2"})
+
+        repo.collection.insert_many.assert_called_once_with([{"_id": "HIS_2"}], ordered=False)
+
+    def test_write_failure_counted(self):
+        """Test path: gagal insert tidak melempar error ke pemanggil"""
+        repo = Mock()
+        repo.collection.insert_many.side_effect = Exception("Database error")
+        writer = HistoryWriter(repo=repo)
+
+        writer.write([{"_id": "HIS_1"}])
+
+        assert writer.failed == 1
+
+    def test_partial_bulk_failure_counted(self):
+        """Test path: BulkWriteError ordered=False -> hanya writeErrors yang dihitung gagal"""
+        repo = Mock()
+        repo.collection.insert_many.side_effect = BulkWriteError({"writeErrors": [{"index": 1, "code": 11000}]})
+        writer = HistoryWriter(repo=repo)
+
+        writer.write([{"_id": "HIS_1"}, {"_id": "HIS_1"}, {"_id": "HIS_2"}])
+
+        assert writer.written == 2
+        assert writer.failed == 1
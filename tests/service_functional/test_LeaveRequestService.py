@@ -2,6 +2,7 @@
 import pytest
 from unittest.mock import Mock, patch
 import pendulum
+import mongomock
 from service.leaveRequestService import LeaveRequestService
 
 
@@ -13,7 +14,7 @@ class TestLeaveRequestServiceCheckDateRange:
         """Test path: date range valid"""
         # Setup
         mock_repo = Mock()
-        mock_repo.getAllData.return_value = []
+        mock_repo.findOverlap.return_value = None
         mock_repo_class.return_value = mock_repo
         
         service = LeaveRequestService()
@@ -68,21 +69,20 @@ class TestLeaveRequestServiceCheckDateRange:
         """Test path: overlap dengan request yang sudah ada"""
         # Setup
         mock_repo = Mock()
+        existing_start = pendulum.now("Asia/Jakarta").add(days=20).start_of("day").naive()
         existing_request = {
             "_id": "ANR_001",
-            "employeeId": "EMP_001",
-            "startDate": "2025-12-20",
-            "endDate": "2025-12-25",
-            "status": "approved"
+            "startDate": existing_start,
+            "endDate": existing_start.add(days=5),
         }
-        mock_repo.getAllData.return_value = [existing_request]
+        mock_repo.findOverlap.return_value = existing_request
         mock_repo_class.return_value = mock_repo
         
         service = LeaveRequestService()
         
-        # Overlap: 2025-12-23 to 2025-12-27
-        start = "2025-12-23"
-        end = "2025-12-27"
+        # Overlap: 3 hari setelah request lama mulai, sampai 2 hari setelah selesai
+        start = existing_start.add(days=3).to_date_string()
+        end = existing_start.add(days=7).to_date_string()
         
         # Execute
         result = service.checkDateRange(start, end, "EMP_001")
@@ -90,6 +90,30 @@ class TestLeaveRequestServiceCheckDateRange:
         # Assert
         assert result["status"] == False
         assert "overlaps" in result["message"].lower()
+        kwargs = mock_repo.findOverlap.call_args.kwargs
+        assert kwargs["employeeId"] == "EMP_001"
+        assert kwargs["start"] == existing_start.add(days=3)
+        assert kwargs["end"] == existing_start.add(days=8)
+
+
+class TestLeaveRequestServiceHistory:
+    """Test makeHistory - id history"""
+
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    @patch('service.leaveRequestService.HistoryRepo')
+    def test_history_ids_unique_within_second(self, mock_history_repo, mock_leave_repo, mock_emp_repo, mock_acknowledged_result):
+        """Test path: banyak approval di detik yang sama tetap dapat _id berbeda"""
+        mock_history = Mock()
+        mock_history.insertData.return_value = mock_acknowledged_result
+        mock_history_repo.return_value = mock_history
+
+        service = LeaveRequestService()
+        for n in range(200):
+            service.makeHistory({"employeeId": "EMP_001", "employeeName": "John Doe", "description": f"Approved {n}", "type": "leave"})
+
+        ids = [call.kwargs["validateData"]["_id"] for call in mock_history.insertData.call_args_list]
+        assert len(set(ids)) == 200
 
 
 class TestLeaveRequestServiceCreateRequest:
@@ -107,7 +131,7 @@ class TestLeaveRequestServiceCreateRequest:
         mock_emp_repo.return_value = mock_emp
         
         mock_leave = Mock()
-        mock_leave.getAllData.return_value = []  
+        mock_leave.findOverlap.return_value = None
         mock_leave.insertData.return_value = mock_acknowledged_result
         mock_leave_repo.return_value = mock_leave
         
@@ -131,10 +155,12 @@ class TestLeaveRequestServiceCreateRequest:
         assert result["status"] == True
         assert "created successfully" in result["message"].lower()
         mock_leave.insertData.assert_called_once()
+        assert mock_leave.insertData.call_args.kwargs["validateData"]["requesterRole"] == "employee"
         mock_emp.updateData.assert_called_once()  
     
     @patch('service.leaveRequestService.EmployeeRepo')
-    def test_create_request_insufficient_balance(self, mock_emp_repo, sample_employee):
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_create_request_insufficient_balance(self, mock_leave_repo, mock_emp_repo, sample_employee):
         """Test path: saldo cuti tidak cukup"""
         # Setup mock employee
         sample_employee["annualLeaveBalance"] = 3  # Only 3 days
@@ -142,6 +168,10 @@ class TestLeaveRequestServiceCreateRequest:
         mock_emp.getData.return_value = sample_employee
         mock_emp_repo.return_value = mock_emp
         
+        mock_leave = Mock()
+        mock_leave.findOverlap.return_value = None
+        mock_leave_repo.return_value = mock_leave
+        
         service = LeaveRequestService()
         
         future_date = pendulum.now("Asia/Jakarta").add(days=10)
@@ -191,4 +221,99 @@ class TestLeaveRequestServiceAnnualRequest:
         
         assert result["status"] == True
         assert result["message"] == "Data updated successfully"
-    
\ No newline at end of file
+    
+
+class TestLeaveRequestServiceQueue:
+    """Test antrian approval getRequestByBranch / getRequestByOwner"""
+
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_branch_queue_single_employee_query(self, mock_leave_repo, mock_emp_repo, sample_leave_request, sample_employee):
+        """Test path: role difilter di query, employee diambil sekali untuk satu halaman"""
+        second_request = dict(sample_leave_request, _id="ANR_002")
+        mock_leave = Mock()
+        mock_leave.getPage.return_value = ([sample_leave_request, second_request], None)
+        mock_leave_repo.return_value = mock_leave
+
+        mock_emp = Mock()
+        mock_emp.getDataByIds.return_value = [sample_employee]
+        mock_emp_repo.return_value = mock_emp
+
+        service = LeaveRequestService()
+        result = service.getRequestByBranch({"branchId": "STR_001"}, status="pending")
+
+        assert result["status"] == True
+        assert [req["employee"]["name"] for req in result["data"]] == ["John Doe", "John Doe"]
+        assert result["next_cursor"] is None
+        assert mock_leave.getPage.call_args.kwargs["query"] == {
+            "branchId": "STR_001", "requesterRole": "employee", "status": "pending"
+        }
+        mock_emp.getDataByIds.assert_called_once()
+        mock_emp.getData.assert_not_called()
+
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_owner_queue_manager_requests(self, mock_leave_repo, mock_emp_repo):
+        """Test path: owner hanya query request manager, semua status pakai $in"""
+        mock_leave = Mock()
+        mock_leave.getPage.return_value = ([], None)
+        mock_leave_repo.return_value = mock_leave
+
+        service = LeaveRequestService()
+        result = service.getRequestByOwner()
+
+        assert result == {"status": False, "message": "No data found", "data": None}
+        query = mock_leave.getPage.call_args.kwargs["query"]
+        assert query["requesterRole"] == "manager"
+        assert query["status"] == {"$in": ["pending", "approved", "rejected", "canceled"]}
+
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_canceled_request_in_unfiltered_queue(self, mock_leave_repo, mock_emp_repo, sample_leave_request):
+        """Test path: tanpa filter status, request yang di-cancel (status "canceled") tetap muncul"""
+        collection = mongomock.MongoClient().db.leaveRequests
+        collection.insert_many([
+            dict(sample_leave_request, _id="ANR_001", requesterRole="manager", status="pending"),
+            dict(sample_leave_request, _id="ANR_002", requesterRole="manager", status="canceled"),
+        ])
+        mock_leave = Mock()
+        mock_leave.getPage.side_effect = lambda query, limit, after: (list(collection.find(query)), None)
+        mock_leave.countData.side_effect = collection.count_documents
+        mock_leave_repo.return_value = mock_leave
+        mock_emp_repo.return_value.getDataByIds.return_value = []
+
+        service = LeaveRequestService()
+        result = service.getRequestByOwner()
+        canceled = service.getRequestByOwner(status="canceled")
+
+        assert sorted(req["_id"] for req in result["data"]) == ["ANR_001", "ANR_002"]
+        assert [req["_id"] for req in canceled["data"]] == ["ANR_002"]
+        assert service.countRequestQueue({"role": "owner"})["data"] == {"count": 2}
+
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_queue_invalid_status(self, mock_leave_repo, mock_emp_repo):
+        """Test path: status tidak dikenal -> ValueError"""
+        service = LeaveRequestService()
+
+        with pytest.raises(ValueError):
+            service.getRequestByOwner(status="waiting")
+
+    @pytest.mark.parametrize("user, expected", [
+        ({"role": "manager", "branchId": "STR_001"}, {"branchId": "STR_001", "requesterRole": "employee", "status": "pending"}),
+        ({"role": "owner"}, {"requesterRole": "manager", "status": "pending"}),
+    ])
+    @patch('service.leaveRequestService.EmployeeRepo')
+    @patch('service.leaveRequestService.LeaveRequestRepo')
+    def test_count_queue(self, mock_leave_repo, mock_emp_repo, user, expected):
+        """Test path: counter dashboard dihitung di database, tidak dibatasi ukuran halaman"""
+        mock_leave = Mock()
+        mock_leave.countData.return_value = 250
+        mock_leave_repo.return_value = mock_leave
+
+        service = LeaveRequestService()
+        result = service.countRequestQueue(user, status="pending")
+
+        assert result["data"] == {"count": 250}
+        mock_leave.countData.assert_called_once_with(expected)
+        mock_leave.getPage.assert_not_called()
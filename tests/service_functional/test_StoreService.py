@@ -178,7 +178,7 @@ class TestStoreServiceStoreDetails:
         assert result["data"]["_id"] == "STR_001"
         assert len(result["data"]["employees"]) == 2
         mock_store_repo.getData.assert_called_once_with(id="STR_001")
-        mock_emp_repo.getAllData.assert_called_once_with(query={"storeID": "STR_001"})
+        mock_emp_repo.getAllData.assert_called_once_with(query={"storeID": "STR_001"}, projection=mock_emp_repo.publicProjection)
     
     @patch('service.storeService.EmployeeRepo')
     @patch('service.storeService.StoreRepo')
@@ -221,7 +221,7 @@ class TestStoreServiceDeleteStore:
         mock_store_repo_class.return_value = mock_store_repo
         
         mock_emp_repo = Mock()
-        mock_emp_repo.getAllData.return_value = [{"_id": "EMP_001"}]
+        mock_emp_repo.countData.return_value = 1
         mock_emp_repo.deleteData.return_value = True
         mock_emp_repo_class.return_value = mock_emp_repo
         
@@ -253,7 +253,7 @@ class TestStoreServiceDeleteStore:
         mock_store_repo_class.return_value = mock_store_repo
         
         mock_emp_repo = Mock()
-        mock_emp_repo.getAllData.return_value = []
+        mock_emp_repo.countData.return_value = 0
         mock_emp_repo_class.return_value = mock_emp_repo
         
         mock_history = Mock()
@@ -282,7 +282,7 @@ class TestStoreServiceDeleteStore:
         mock_store_repo_class.return_value = mock_store_repo
         
         mock_emp_repo = Mock()
-        mock_emp_repo.getAllData.return_value = []
+        mock_emp_repo.countData.return_value = 0
         mock_emp_repo_class.return_value = mock_emp_repo
         
         mock_history = Mock()
@@ -339,6 +339,7 @@ class TestStoreServiceUpdateStore:
         assert result["status"] == True
         assert result["message"] == "Data updated successfully"
         mock_repo.updateData.assert_called_once()
+        mock_repo.invalidateGeofence.assert_called_once_with("STR_001")
         mock_history.createHistory.assert_called_once()
     
     @patch('service.storeService.StoreRepo')
@@ -47,7 +47,8 @@ class TestEmployeeServiceGetAllEmployee:
         # Assert
         assert result["status"] == True
         mock_repo.getAllData.assert_called_once_with(
-            query={"$and": [{"branchId": "STR_001"}, {"role": "employee"}]}
+            query={"$and": [{"branchId": "STR_001"}, {"role": "employee"}]},
+            projection=mock_repo.publicProjection
         )
     
     @patch('service.employeeService.EmployeeRepo')
@@ -74,7 +75,7 @@ class TestEmployeeServiceGetAllEmployee:
         mock_employee_repo.return_value = mock_repo
         
         mock_store = Mock()
-        mock_store.getDataById.return_value = sample_store
+        mock_store.getDataByIds.return_value = [sample_store]
         mock_store_repo.return_value = mock_store
         
         service = EmployeeService()
@@ -84,6 +85,10 @@ class TestEmployeeServiceGetAllEmployee:
         assert result["status"] == True
         assert result["message"] == "Data fetched successfully" 
         assert result["data"][0]["branch"] == sample_store
+        # employee + manager di branch yang sama -> satu query $in untuk semua branch
+        mock_store.getDataByIds.assert_called_once()
+        assert sorted(mock_store.getDataByIds.call_args.args[0]) == ["STR_001", "STR_001"]
+        mock_store.getDataById.assert_not_called()
 
 class TestEmployeeServiceNewEmployee:
     """Test newEmployee method - validation, business rules, edge cases"""
@@ -94,7 +99,7 @@ class TestEmployeeServiceNewEmployee:
         """Test path: successful employee creation"""
         # Setup
         mock_repo = Mock()
-        mock_repo.getAllData.return_value = []  # No existing manager
+        mock_repo.countData.return_value = 0  # No existing manager
         mock_repo.getData.return_value = None  # Email not used
         mock_repo.insertData.return_value = mock_acknowledged_result
         mock_repo_class.return_value = mock_repo
@@ -129,7 +134,7 @@ class TestEmployeeServiceNewEmployee:
         """Test path: email sudah digunakan"""
         # Setup
         mock_repo = Mock()
-        mock_repo.getAllData.return_value = []
+        mock_repo.countData.return_value = 0
         mock_repo.getData.return_value = {"email": "jane@aventra.com"}  # Email exists
         mock_repo_class.return_value = mock_repo
         
@@ -156,8 +161,7 @@ class TestEmployeeServiceNewEmployee:
         """Test path: branch sudah punya manager"""
         # Setup
         mock_repo = Mock()
-        existing_manager = {"_id": "EMP_999", "role": "manager", "branchId": "STR_001", "status": "active"}
-        mock_repo.getAllData.return_value = [existing_manager]
+        mock_repo.countData.return_value = 1  # sudah ada satu manager aktif
         mock_repo_class.return_value = mock_repo
         
         service = EmployeeService()
@@ -183,9 +187,7 @@ class TestEmployeeServiceNewEmployee:
         mock_repo = Mock()
         RepoMock.return_value = mock_repo
 
-        mock_repo.getAllData.side_effect = [
-            [{"_id": f"EMP_{i}"} for i in range(6)]
-        ]
+        mock_repo.countData.return_value = 6
 
         
         mock_repo.getData.return_value = None
@@ -202,7 +204,7 @@ class TestEmployeeServiceNewEmployee:
         
         # Execute
         result = service.newEmployee(data, {"_id": "EMP_001", "name": "Admin"})
-        print("CALLS getAllData:", mock_repo.getAllData.call_args_list)
+        print("CALLS countData:", mock_repo.countData.call_args_list)
         
         # Assert
         assert result["status"] == False
@@ -231,7 +233,7 @@ class TestEmployeeService:
     @patch('service.employeeService.EmployeeRepo')
     @patch('service.employeeService.SessionService')
     @patch('service.employeeService.HistoryService')
-    @patch('service.employeeService.checkpw')
+    @patch('service.employeeService.checkPassword')
     def test_login_success(self, mock_checkpw, mock_history_class, mock_session_class, 
                           mock_repo_class, sample_employee):
         """Test path: login berhasil"""
@@ -266,6 +268,28 @@ class TestEmployeeService:
         mock_session.createToken.assert_called_once()
         mock_history.createHistory.assert_called_once()
     
+    @patch('service.employeeService.EmployeeRepo')
+    @patch('service.employeeService.SessionService')
+    @patch('service.employeeService.HistoryService')
+    @patch('service.employeeService.hashPassword')
+    @patch('service.employeeService.checkPassword')
+    def test_login_rehash_old_cost(self, mock_checkpw, mock_hash, mock_history_class, mock_session_class,
+                                   mock_repo_class, sample_employee, monkeypatch):
+        """Test path: hash dengan rounds lama diganti setelah login berhasil"""
+        monkeypatch.setattr("utils.passwords.Config.BCRYPT_ROUNDS", 10)
+        mock_repo = Mock()
+        mock_repo.getData.return_value = sample_employee
+        mock_repo_class.return_value = mock_repo
+        mock_checkpw.return_value = True
+        mock_hash.return_value = b"$2b$10$newhash"
+        mock_history_class.return_value.createHistory.return_value = {"status": True}
+
+        result = EmployeeService().login({"email": "john@example.com", "password": "secret123"})
+
+        assert result["status"] == True
+        mock_hash.assert_called_once_with("secret123")
+        mock_repo.updateData.assert_called_once_with(id=sample_employee["_id"], validateData={"password": b"$2b$10$newhash"})
+
     @patch('service.employeeService.EmployeeRepo')
     def test_login_email_not_found(self, mock_repo_class):
         """Test path: email tidak ditemukan"""
@@ -289,7 +313,7 @@ class TestEmployeeService:
         assert result["message"] == "Email or Password Invalid"
     
     @patch('service.employeeService.EmployeeRepo')
-    @patch('service.employeeService.checkpw')
+    @patch('service.employeeService.checkPassword')
     def test_login_invalid_password(self, mock_checkpw, mock_repo_class, sample_employee):
         """Test path: password salah"""
         # Setup
@@ -312,7 +336,7 @@ class TestEmployeeService:
         assert result["message"] == "Email or Password Invalid"
     
     @patch('service.employeeService.EmployeeRepo')
-    @patch('service.employeeService.checkpw')
+    @patch('service.employeeService.checkPassword')
     def test_login_inactive_account(self, mock_checkpw, mock_repo_class, sample_employee):
         """Test path: account inactive"""
         # Setup
@@ -445,7 +469,7 @@ class TestEmployeeServiceUpdate:
         # Setup
         mock_repo = Mock()
         mock_repo.updateData.return_value = mock_acknowledged_result
-        mock_repo.getAllData.return_value = []
+        mock_repo.countData.return_value = 0
         mock_repo_class.return_value = mock_repo
         
         mock_history = Mock()
@@ -0,0 +1,140 @@
+import pytest
+import mongomock
+from datetime import datetime
+from unittest.mock import Mock, patch
+from pymongo import UpdateOne
+from repo.historyRepo import HistoryRepo
+from repo.EmployeeRepo import EmployeeRepo
+from utils.pagination import encodeCursor, decodeCursor, InvalidCursor, parseLimit
+
+
+@pytest.fixture
+def history_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = HistoryRepo()
+    repo.collection = mongomock.MongoClient().db.histories
+    # HIS_001..HIS_005, HIS_003 dan HIS_004 punya createdAt yang sama
+    times = [1, 2, 3, 3, 4]
+    repo.collection.insert_many([
+        {"_id": f"HIS_00{i + 1}", "createdAt": datetime(2025, 11, 29, hour), "type": "auth"}
+        for i, hour in enumerate(times)
+    ])
+    return repo
+
+
+class TestKeysetPagination:
+    """Test getPage + cursor"""
+
+    def test_pages_cover_all_without_duplicates(self, history_repo):
+        """Test path: jalan terus pakai cursor sampai habis, urut terbaru dulu"""
+        seen = []
+        after = None
+        while True:
+            data, last = history_repo.getPage(limit=2, after=after)
+            seen.extend(doc["_id"] for doc in data)
+            if last is None:
+                break
+            after = decodeCursor(encodeCursor(*last))
+
+        assert seen == ["HIS_005", "HIS_004", "HIS_003", "HIS_002", "HIS_001"]
+
+    def test_last_page_has_no_cursor(self, history_repo):
+        """Test path: limit >= jumlah data -> tidak ada halaman berikutnya"""
+        data, last = history_repo.getPage(limit=5)
+
+        assert len(data) == 5
+        assert last is None
+
+    def test_invalid_cursor(self):
+        """Test path: cursor rusak -> InvalidCursor"""
+        with pytest.raises(InvalidCursor):
+            decodeCursor("!!!")
+
+    def test_parse_limit(self):
+        """Test path: default, batas maksimum dan nilai tidak valid"""
+        assert parseLimit(None, 50, 200) == 50
+        assert parseLimit("500", 50, 200) == 200
+        with pytest.raises(ValueError):
+            parseLimit("-1", 50, 200)
+
+
+class TestStreaming:
+    """Test iterData dan countData"""
+
+    def test_iter_data_is_lazy_generator(self, history_repo):
+        """Test path: iterData mengembalikan generator, bukan list"""
+        documents = history_repo.iterData(query={"type": "auth"}, projection={"_id": 1}, batch_size=2)
+
+        assert not isinstance(documents, list)
+        assert next(documents) == {"_id": "HIS_001"}
+        assert len(list(documents)) == 4
+
+    def test_iter_data_sort_and_limit(self, history_repo):
+        """Test path: sort + limit diteruskan ke cursor"""
+        documents = history_repo.iterData(sort=[("createdAt", -1), ("_id", -1)], limit=2)
+
+        assert [doc["_id"] for doc in documents] == ["HIS_005", "HIS_004"]
+
+    def test_count_data(self, history_repo):
+        """Test path: count_documents tanpa mengambil dokumen"""
+        assert history_repo.countData() == 5
+        assert history_repo.countData(query={"createdAt": {"$gte": datetime(2025, 11, 29, 3)}}) == 3
+
+
+class TestProjection:
+    """Test parameter projection di getData, getAllData, getDataById"""
+
+    def test_get_data_projection(self, history_repo):
+        """Test path: hanya field yang diminta yang dikembalikan"""
+        assert history_repo.getData(id="HIS_001", projection={"type": 1}) == {"_id": "HIS_001", "type": "auth"}
+        assert history_repo.getDataById("HIS_001", projection={"_id": 1}) == {"_id": "HIS_001"}
+
+    def test_get_all_data_projection(self, history_repo):
+        """Test path: projection exclude field"""
+        data = history_repo.getAllData(query={"type": "auth"}, projection={"createdAt": 0})
+
+        assert len(data) == 5
+        assert all("createdAt" not in doc for doc in data)
+
+    def test_employee_public_projection(self):
+        """Test path: default projection employee tanpa password"""
+        with patch('repo.BaseRepo.mongoConnection'):
+            repo = EmployeeRepo()
+        repo.collection = mongomock.MongoClient().db.employees
+        repo.collection.insert_one({"_id": "EMP_001", "name": "John", "password": b"hash"})
+
+        assert repo.getData(id="EMP_001", projection=repo.publicProjection) == {"_id": "EMP_001", "name": "John"}
+        assert repo.getDataByIds(["EMP_001"]) == [{"_id": "EMP_001", "name": "John"}]
+
+
+class TestEmployeeCounters:
+    """Test incrementCounters (bulk_write $inc)"""
+
+    def test_increment_counters_bulk(self):
+        """Test path: banyak employee di-update dalam satu bulk_write, counter 0 dilewati"""
+        with patch('repo.BaseRepo.mongoConnection'):
+            repo = EmployeeRepo()
+        repo.collection = Mock()
+
+        repo.incrementCounters({
+            "EMP_001": {"workDays": 2},
+            "EMP_002": {"workDays": 0, "lateDays": 1},
+            "EMP_003": {"workDays": 0},
+        })
+
+        repo.collection.bulk_write.assert_called_once()
+        operations = repo.collection.bulk_write.call_args.args[0]
+        assert operations == [
+            UpdateOne({"_id": "EMP_001"}, {"$inc": {"workDays": 2}}),
+            UpdateOne({"_id": "EMP_002"}, {"$inc": {"lateDays": 1}}),
+        ]
+        assert repo.collection.bulk_write.call_args.kwargs == {"ordered": False}
+
+    def test_increment_counters_empty(self):
+        """Test path: tidak ada counter -> tidak ada query"""
+        with patch('repo.BaseRepo.mongoConnection'):
+            repo = EmployeeRepo()
+        repo.collection = Mock()
+
+        assert repo.incrementCounters({"EMP_001": {"workDays": 0}}) is None
+        repo.collection.bulk_write.assert_not_called()
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import Mock, patch
+from utils.mongoConnect import mongoConnection
+
+
+@pytest.fixture(autouse=True)
+def reset_client():
+    mongoConnection.reset()
+    yield
+    mongoConnection.reset()
+
+
+class TestMongoConnectionSharedClient:
+    """Test client MongoDB dipakai bareng dalam satu proses"""
+
+    @patch('utils.mongoConnect.MongoClient')
+    def test_client_created_once(self, mock_client_class):
+        """Test path: banyak mongoConnection cuma bikin satu MongoClient"""
+        mock_client_class.return_value = Mock()
+
+        first = mongoConnection()
+        second = mongoConnection()
+
+        assert first.client is second.client
+        mock_client_class.assert_called_once()
+
+    @patch('utils.mongoConnect.MongoClient')
+    def test_client_does_not_ping(self, mock_client_class):
+        """Test path: bikin koneksi tidak kirim ping ke server"""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        mongoConnection().getColleciton("employees")
+
+        mock_client.admin.command.assert_not_called()
+        assert mock_client_class.call_args.kwargs["connect"] is False
+
+    @patch('utils.mongoConnect.os.getpid')
+    @patch('utils.mongoConnect.MongoClient')
+    def test_client_recreated_after_fork(self, mock_client_class, mock_getpid):
+        """Test path: pid berubah (child setelah fork) -> client dibuat ulang"""
+        mock_client_class.side_effect = [Mock(), Mock()]
+
+        mock_getpid.return_value = 100
+        parent = mongoConnection()
+        mock_getpid.return_value = 200
+        child = mongoConnection()
+
+        assert parent.client is not child.client
+        assert mock_client_class.call_count == 2
+
+    @patch('utils.mongoConnect.MongoClient')
+    def test_client_error_is_logged(self, mock_client_class):
+        """Test path: gagal bikin client -> db None, collection None"""
+        mock_client_class.side_effect = Exception("DNS error")
+
+        connection = mongoConnection()
+
+        assert connection.db is None
+        assert connection.getColleciton("employees") is None
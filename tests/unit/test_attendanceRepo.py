@@ -0,0 +1,137 @@
+import pytest
+import mongomock
+from datetime import datetime
+from unittest.mock import Mock, patch
+from pymongo import ReturnDocument
+from repo.attendanceRepo import AttendanceRepo
+
+
+@pytest.fixture
+def attendance_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = AttendanceRepo()
+    repo.collection = mongomock.MongoClient().db.attendances
+    repo.ensureIndexes()
+    repo.collection.insert_one({"_id": "SHF_OLD", "branchId": "STR_001", "Date": datetime(2025, 11, 2), "employees": []})
+    return repo
+
+
+class TestAttendanceRepoInsertShifts:
+    """Test insert banyak shift dengan index unik (branchId, Date)"""
+
+    def test_conflicting_days_reported(self, attendance_repo):
+        """Test path: hari yang sudah ada dilewati, hari lain tetap masuk"""
+        shifts = [
+            {"_id": f"SHF_{day}", "branchId": "STR_001", "Date": datetime(2025, 11, day), "employees": []}
+            for day in (1, 2, 3)
+        ]
+
+        errors = attendance_repo.insertShifts(shifts)
+
+        assert [error["index"] for error in errors] == [1]
+        assert attendance_repo.collection.count_documents({}) == 3
+        assert attendance_repo.collection.find_one({"_id": "SHF_3"}) is not None
+
+    def test_conflict_detected_without_unique_index(self, attendance_repo):
+        """Test path: index branch_date_unique belum dibuat -> bentrok tetap terdeteksi lewat query $in"""
+        attendance_repo.collection.drop_index("branch_date_unique")
+        shifts = [
+            {"_id": f"SHF_{day}", "branchId": "STR_001", "Date": datetime(2025, 11, day), "employees": []}
+            for day in (1, 2, 3)
+        ]
+
+        errors = attendance_repo.insertShifts(shifts)
+
+        assert [error["index"] for error in errors] == [1]
+        assert attendance_repo.collection.count_documents({"branchId": "STR_001", "Date": datetime(2025, 11, 2)}) == 1
+        assert attendance_repo.collection.count_documents({}) == 3
+
+    def test_duplicate_key_index_mapped(self, attendance_repo):
+        """Test path: duplicate key dari insert (insert paralel) -> index dikembalikan ke posisi di `shifts`"""
+        attendance_repo.collection.insert_one({"_id": "SHF_3", "branchId": "STR_009", "Date": datetime(2025, 11, 9), "employees": []})
+        shifts = [
+            {"_id": f"SHF_{day}", "branchId": "STR_001", "Date": datetime(2025, 11, day), "employees": []}
+            for day in (2, 3, 4)
+        ]
+
+        errors = attendance_repo.insertShifts(shifts)
+
+        assert [error["index"] for error in errors] == [0, 1]
+        assert attendance_repo.collection.find_one({"_id": "SHF_4"}) is not None
+
+    def test_no_conflict(self, attendance_repo):
+        shifts = [{"_id": "SHF_1", "branchId": "STR_002", "Date": datetime(2025, 11, 2), "employees": []}]
+
+        assert attendance_repo.insertShifts(shifts) == []
+
+
+class TestAttendanceRepoSummary:
+    """Test getSummary - aggregation ringkasan kehadiran"""
+
+    def test_manager_entry_not_counted(self, attendance_repo):
+        """Test path: entry manager (fullday, default absent) tidak ikut absentCount"""
+        attendance_repo.collection.insert_one({"_id": "SHF_1", "branchId": "STR_001", "Date": datetime(2025, 11, 3), "employees": [
+            {"employeeId": "EMP_MGR", "shift": "fullday", "clockIn": None, "clockOut": None},
+            {"employeeId": "EMP_001", "shift": "Day", "clockIn": "07:01:00", "clockOut": None, "status": "present"},
+            {"employeeId": "EMP_002", "shift": "Day", "clockIn": None, "clockOut": None, "status": "absent"},
+        ]})
+
+        result = attendance_repo.getSummary(["STR_001"], datetime(2025, 11, 1), datetime(2025, 12, 1))
+
+        totals = result["totals"][0]
+        assert totals["scheduledCount"] == 2
+        assert totals["absentCount"] == 1
+        assert totals["presentCount"] == 1
+        assert [row["_id"]["employeeId"] for row in result["byEmployee"]] == ["EMP_001", "EMP_002"]
+
+
+class TestAttendanceRepoClockUpdates:
+    """Test filter/update/arrayFilters clock in dan clock out (mongomock tidak mendukung arrayFilters)"""
+
+    def test_clock_in_update(self, attendance_repo):
+        """Test path: hanya entry employee yang belum clock in dan shift-nya buka"""
+        query, update, arrayFilters = attendance_repo.clockInUpdate("SHF_1", "EMP_001", "07:05:00", ["Day"], ["Night"])
+
+        assert query == {"_id": "SHF_1", "employees": {"$elemMatch": {
+            "employeeId": "EMP_001", "clockIn": {"$in": [None, ""]}, "shift": {"$in": ["Day", "Night"]},
+        }}}
+        assert update == {"$set": {
+            "employees.$[present].clockIn": "07:05:00",
+            "employees.$[present].status": "present",
+            "employees.$[late].clockIn": "07:05:00",
+            "employees.$[late].status": "late",
+        }}
+        assert arrayFilters == [
+            {"present.employeeId": "EMP_001", "present.clockIn": {"$in": [None, ""]}, "present.shift": {"$in": ["Day"]}},
+            {"late.employeeId": "EMP_001", "late.clockIn": {"$in": [None, ""]}, "late.shift": {"$in": ["Night"]}},
+        ]
+
+    def test_clock_in_single_write(self, attendance_repo):
+        """Test path: clockIn = satu find_one_and_update dengan update dari clockInUpdate"""
+        attendance_repo.collection = Mock()
+
+        attendance_repo.clockIn("SHF_1", "EMP_001", "07:05:00", ["Day"], [])
+
+        query, update, arrayFilters = attendance_repo.clockInUpdate("SHF_1", "EMP_001", "07:05:00", ["Day"], [])
+        call = attendance_repo.collection.find_one_and_update.call_args
+        assert call.args == (query, update)
+        assert call.kwargs["array_filters"] == arrayFilters
+        assert call.kwargs["return_document"] == ReturnDocument.AFTER
+
+    def test_clock_out_single_write(self, attendance_repo):
+        """Test path: clock out hanya kalau sudah clock in, belum clock out, shift sudah selesai"""
+        attendance_repo.collection = Mock()
+
+        attendance_repo.clockOut("SHF_1", "EMP_001", "15:05:00", ["Day"])
+
+        call = attendance_repo.collection.find_one_and_update.call_args
+        assert call.args == (
+            {"_id": "SHF_1", "employees": {"$elemMatch": {
+                "employeeId": "EMP_001",
+                "clockIn": {"$nin": [None, ""]},
+                "clockOut": {"$in": [None, ""]},
+                "shift": {"$in": ["Day"]},
+            }}},
+            {"$set": {"employees.$[entry].clockOut": "15:05:00"}},
+        )
+        assert call.kwargs["array_filters"] == [{"entry.employeeId": "EMP_001", "entry.clockOut": {"$in": [None, ""]}}]
@@ -0,0 +1,104 @@
+import logging
+import pytest
+from utils.benchmark import ErrorLog, backgroundErrors, combine, compare, percentile, summarize
+
+
+def scenario(p95=40.0, p99=60.0, throughput=200.0, errorRate=0.0):
+    return {"requests": 100, "errorRate": errorRate, "p50": 10.0, "p95": p95, "p99": p99, "throughput": throughput}
+
+
+class TestBenchmarkSummary:
+    """Test utils.benchmark - percentile dan ringkasan skenario"""
+
+    def test_percentile_nearest_rank(self):
+        """Test path: nearest-rank, list kosong -> 0"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0.0
+
+    def test_summarize_in_milliseconds(self):
+        """Test path: durasi detik -> ms, throughput dari wall clock"""
+        result = summarize([0.01] * 9 + [0.5], errors=1, elapsed=2.0)
+
+        assert result["requests"] == 10
+        assert result["errorRate"] == 0.1
+        assert result["p50"] == 10.0
+        assert result["p99"] == 500.0
+        assert result["throughput"] == 5.0
+
+    def test_combine_takes_median(self):
+        """Test path: angka tiap skenario = median dari semua run"""
+        runs = [{"login-storm": scenario(p95=p95)} for p95 in (40.0, 90.0, 45.0)]
+
+        assert combine(runs)["login-storm"]["p95"] == 45.0
+
+
+class TestBenchmarkCompare:
+    """Test utils.benchmark.compare - deteksi regresi terhadap baseline"""
+
+    def test_within_tolerance(self):
+        """Test path: kenaikan di bawah tolerance -> tidak ada regresi"""
+        assert compare({"login-storm": scenario(p95=55.0)}, {"login-storm": scenario()}, tolerance=0.5) == []
+
+    def test_latency_regression(self):
+        """Test path: p95 naik lebih dari tolerance -> regresi"""
+        regressions = compare({"login-storm": scenario(p95=90.0)}, {"login-storm": scenario()}, tolerance=0.5)
+
+        assert regressions == ["login-storm: p95 90.0 ms > baseline 40.0 ms (+125%)"]
+
+    def test_small_absolute_change_ignored(self):
+        """Test path: angka sub-milidetik naik 2x tapi selisihnya kecil -> bukan regresi"""
+        baseline = {"clock-in-burst": scenario(p95=0.5, p99=0.8)}
+
+        assert compare({"clock-in-burst": scenario(p95=1.2, p99=1.6)}, baseline, tolerance=0.5) == []
+
+    @pytest.mark.parametrize("current, message", [
+        (scenario(throughput=100.0), "throughput 100.0/s < baseline 200.0/s"),
+        (scenario(errorRate=0.05), "error rate 5.00% > baseline 0.00%"),
+    ])
+    def test_throughput_and_error_regression(self, current, message):
+        """Test path: throughput turun / error rate naik -> regresi"""
+        regressions = compare({"monthly-shifts": current}, {"monthly-shifts": scenario()}, tolerance=0.5)
+
+        assert regressions == [f"monthly-shifts: {message}"]
+
+    def test_missing_scenario(self):
+        """Test path: skenario baseline tidak ikut dijalankan -> dilaporkan"""
+        assert compare({}, {"leave-approvals": scenario()}) == ["leave-approvals: scenario missing from this run"]
+
+
+class TestBenchmarkBackgroundErrors:
+    """Test deteksi error di background (log ERROR, writer yang gagal)"""
+
+    def test_no_errors(self):
+        assert backgroundErrors([], {"history writer": 0, "clock event log": 0}) == []
+
+    def test_writer_failures_and_logged_errors(self):
+        """Test path: counter writer gagal dan pesan ERROR yang sama digabung"""
+        logged = ["service.attendanceService: Failed to sync employee schedules"] * 3 + ["utils.clockLog: boom"]
+
+        problems = backgroundErrors(logged, {"history writer": 2, "clock event log": 0})
+
+        assert problems == [
+            "history writer: 2 failed",
+            "3x service.attendanceService: Failed to sync employee schedules",
+            "utils.clockLog: boom",
+        ]
+
+    def test_error_log_collects_error_records_only(self):
+        """Test path: handler di root logger hanya menyimpan ERROR ke atas, pesan panjang dipotong"""
+        errorLog = ErrorLog()
+        logger = logging.getLogger("bench.test")
+        logger.addHandler(errorLog)
+        try:
+            logger.warning("slow")
+            logger.error("failed %s", "x" * 1000)
+        finally:
+            logger.removeHandler(errorLog)
+
+        assert len(errorLog.messages) == 1
+        assert errorLog.messages[0].startswith("bench.test: failed xxx")
+        assert len(errorLog.messages[0]) == ErrorLog.MESSAGE_LIMIT + 3
@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import Mock
+from utils.clockLog import ClockEventLog
+
+
+@pytest.fixture
+def make_log(tmp_path):
+    """ClockEventLog di tmp_path, tanpa fsync, worker tidak di-start"""
+    logs = []
+
+    def make(applyBatch=None, batchSize=2):
+        log = ClockEventLog(path=str(tmp_path / "clock.log"), applyBatch=applyBatch or Mock(), batchSize=batchSize, flushInterval=60, fsync=False)
+        log.start = log.open  # drain dipanggil manual di test
+        logs.append(log)
+        return log
+
+    yield make
+    for log in logs:
+        if log.file is not None:
+            log.file.close()
+
+
+def event(n):
+    return {"shiftId": "SHF_001", "employeeId": f"EMP_{n:03d}", "clockIn": "07:05:00"}
+
+
+class TestClockEventLog:
+    """Test write-ahead log clock in (mode burst)"""
+
+    def test_drain_applies_in_batches_and_compacts(self, make_log):
+        apply = Mock()
+        log = make_log(apply)
+        for n in range(3):
+            log.append(event(n))
+
+        assert log.drain() == 3
+
+        assert [len(call.args[0]) for call in apply.call_args_list] == [2, 1]
+        assert apply.call_args_list[0].args[0][0] == event(0)
+        assert log.pending() == 0
+        assert log.readOffset() == 0
+
+    def test_failed_apply_keeps_events(self, make_log):
+        apply = Mock(side_effect=Exception("db down"))
+        log = make_log(apply)
+        log.append(event(1))
+
+        with pytest.raises(Exception):
+            log.drain()
+
+        assert log.pending() > 0
+        apply.side_effect = None
+        assert log.drain() == 1
+        assert apply.call_args.args[0] == [event(1)]
+
+    def test_replay_after_restart(self, make_log):
+        log = make_log(Mock())
+        log.append(event(1))
+        log.append(event(2))
+        log.file.close()
+        log.file = None
+
+        apply = Mock()
+        restarted = make_log(apply)
+        restarted.open()
+
+        assert restarted.drain() == 2
+        assert apply.call_args.args[0] == [event(1), event(2)]
+
+    def test_incomplete_and_corrupt_lines(self, make_log):
+        apply = Mock()
+        log = make_log(apply, batchSize=10)
+        log.append(event(1))
+        with open(log.path, "ab") as f:
+            f.write(b"not json\n")
+            f.write(b'{"shiftId": "SHF_0')
+
+        assert log.drain() == 1
+        assert apply.call_args.args[0] == [event(1)]
+        # baris terakhir belum lengkap, jadi log belum dikosongkan
+        assert log.pending() > 0
+
+    def test_stale_offset_after_truncate(self, make_log):
+        """Offset lama melewati ukuran log (log dikosongkan sebelum offset di-reset) -> baca dari awal"""
+        apply = Mock()
+        log = make_log(apply, batchSize=10)
+        log.writeOffset(500)
+        log.append(event(1))
+
+        assert log.readOffset() == 0
+        assert log.drain() == 1
+        assert apply.call_args.args[0] == [event(1)]
+
+    def test_compact_resets_offset_first(self, make_log):
+        """Offset 0 sudah tersimpan sebelum log dikosongkan"""
+        log = make_log(Mock())
+        log.append(event(1))
+        size = log.pending()
+        offsets = []
+        log.file.truncate = Mock(side_effect=lambda n: offsets.append(log.readOffset()))
+        log.writeOffset(size)
+
+        assert log.compact(size) == True
+        assert offsets == [0]
@@ -0,0 +1,59 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, Mock, patch
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+from repo.employeeScheduleRepo import EmployeeScheduleRepo
+
+
+@pytest.fixture
+def schedule_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = EmployeeScheduleRepo()
+    repo.collection = Mock()
+    return repo
+
+
+class TestEmployeeScheduleRepo:
+    """Test projection employeeSchedules"""
+
+    def test_sync_shift_upserts_and_prunes(self, schedule_repo):
+        """Test path: satu bulk_write berisi upsert per entry + hapus entry yang sudah tidak ada"""
+        shift = {"_id": "SHF_001", "branchId": "STR_001", "Date": datetime(2025, 11, 1), "employees": [
+            {"employeeId": "EMP_001", "shift": "Day", "clockIn": None, "clockOut": None, "status": "absent"},
+        ]}
+
+        schedule_repo.syncShifts([shift])
+
+        operations = schedule_repo.collection.bulk_write.call_args.args[0]
+        assert operations == [
+            ReplaceOne({"_id": "SHF_001:EMP_001"}, {
+                "shiftId": "SHF_001", "employeeId": "EMP_001", "branchId": "STR_001", "Date": datetime(2025, 11, 1),
+                "shift": "Day", "clockIn": None, "clockOut": None, "status": "absent",
+            }, upsert=True),
+            DeleteMany({"shiftId": "SHF_001", "employeeId": {"$nin": ["EMP_001"]}}),
+        ]
+        assert schedule_repo.collection.bulk_write.call_args.kwargs["ordered"] == False
+
+    def test_update_entries(self, schedule_repo):
+        schedule_repo.updateEntries([("SHF_001", "EMP_001", {"clockIn": "07:05:00", "status": "present"})])
+
+        operations = schedule_repo.collection.bulk_write.call_args.args[0]
+        assert operations == [UpdateOne({"_id": "SHF_001:EMP_001"}, {"$set": {"clockIn": "07:05:00", "status": "present"}})]
+
+    def test_nothing_to_write(self, schedule_repo):
+        assert schedule_repo.syncShifts([]) is None
+        assert schedule_repo.updateEntries([]) is None
+        schedule_repo.collection.bulk_write.assert_not_called()
+
+    def test_get_schedule_window(self, schedule_repo):
+        """Test path: range Date [start, end) per employee, diurutkan di database"""
+        cursor = MagicMock()
+        cursor.__iter__.return_value = iter([{"_id": "SHF_001:EMP_001"}])
+        schedule_repo.collection.find.return_value.sort.return_value = cursor
+
+        result = schedule_repo.getSchedule("EMP_001", datetime(2025, 11, 1), datetime(2025, 12, 1), branchId="STR_001")
+
+        assert result == [{"_id": "SHF_001:EMP_001"}]
+        query = schedule_repo.collection.find.call_args.args[0]
+        assert query == {"employeeId": "EMP_001", "branchId": "STR_001",
+                         "Date": {"$gte": datetime(2025, 11, 1), "$lt": datetime(2025, 12, 1)}}
@@ -0,0 +1,56 @@
+from unittest.mock import Mock, patch
+from utils.indexes import planStages, isCollscan, findCollscans, ensureAllIndexes
+from repo.storeRepo import StoreRepo
+from repo.sessionRepo import SessionRepo
+
+
+class TestIndexBootstrap:
+    """Test pembuatan index yang dideklarasikan repo"""
+
+    @patch('repo.BaseRepo.mongoConnection')
+    def test_ensure_all_indexes(self, mock_connection_class):
+        """Test path: setiap repo memanggil create_indexes dengan index miliknya"""
+        collection = Mock()
+        collection.name = "stores"
+        collection.create_indexes.return_value = ["geometry_2dsphere", "status"]
+        mock_connection_class.return_value.getColleciton.return_value = collection
+
+        result = ensureAllIndexes([StoreRepo])
+
+        assert result == {"stores": ["geometry_2dsphere", "status"]}
+        collection.create_indexes.assert_called_once_with(StoreRepo.indexes)
+
+    def test_store_has_2dsphere_index(self):
+        """Test path: $nearSphere butuh index 2dsphere di geometry"""
+        keys = [index.document["key"] for index in StoreRepo.indexes]
+        assert {"geometry": "2dsphere"} in keys
+
+    def test_session_token_unique(self):
+        """Test path: token session unik dan punya TTL di exp"""
+        documents = {index.document["name"]: index.document for index in SessionRepo.indexes}
+        assert documents["token_unique"]["unique"] is True
+        assert documents["exp_ttl"]["expireAfterSeconds"] == 0
+
+
+class TestCollscanDetection:
+    """Test deteksi COLLSCAN dari hasil explain()"""
+
+    def test_plan_stages_ixscan(self):
+        explain = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}
+        assert planStages(explain) == ["FETCH", "IXSCAN"]
+        assert isCollscan(explain) == False
+
+    def test_plan_stages_sbe_format(self):
+        explain = {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}}}}
+        assert isCollscan(explain) == True
+
+    def test_find_collscans(self):
+        repo = Mock()
+        repo.explainData.side_effect = [
+            {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}},
+            {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}},
+        ]
+
+        result = findCollscans(repo, [{"name": "x"}, ({"email": "x"}, None)])
+
+        assert result == [{"name": "x"}]
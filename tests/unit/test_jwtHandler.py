@@ -0,0 +1,168 @@
+import pytest
+from flask import Flask, jsonify
+from unittest.mock import Mock, patch
+from utils.jwtHandler import SessionService, sessionCache, loadCurrentUser, require_roles, getCurrentUser
+import utils.jwtHandler as jwtHandler
+
+
+@pytest.fixture(autouse=True)
+def clear_session_cache():
+    sessionCache.clear()
+    yield
+    sessionCache.clear()
+
+
+@pytest.fixture
+def active_user():
+    return {
+        "_id": "EMP_12345",
+        "name": "John Doe",
+        "role": "employee",
+        "status": "active",
+        "branchId": "STR_001"
+    }
+
+
+class TestSessionServiceValidateToken:
+    """Test validateToken - validasi lokal + cache revoke"""
+
+    @patch('utils.jwtHandler.SessionRepo')
+    def test_validate_token_uses_cache(self, mock_repo_class, active_user, mock_acknowledged_result):
+        """Test path: token baru dibuat -> validasi tidak query database"""
+        mock_repo = Mock()
+        mock_repo.insertData.return_value = mock_acknowledged_result
+        mock_repo_class.return_value = mock_repo
+
+        service = SessionService()
+        token = service.createToken(active_user)
+
+        for _ in range(3):
+            result = service.validateToken(token)
+            assert result["status"] == True
+            assert result["data"]["_id"] == "EMP_12345"
+        mock_repo.getData.assert_not_called()
+
+    @patch('utils.jwtHandler.SessionRepo')
+    def test_validate_token_cache_miss_hits_database_once(self, mock_repo_class, active_user, mock_acknowledged_result):
+        """Test path: cache kosong (worker lain) -> query database sekali saja"""
+        mock_repo = Mock()
+        mock_repo.insertData.return_value = mock_acknowledged_result
+        mock_repo.getData.return_value = {"token": "exists"}
+        mock_repo_class.return_value = mock_repo
+
+        service = SessionService()
+        token = service.createToken(active_user)
+        sessionCache.clear()
+
+        service.validateToken(token)
+        service.validateToken(token)
+
+        mock_repo.getData.assert_called_once_with(query={"token": token}, projection={"_id": 1})
+
+    @patch('utils.jwtHandler.SessionRepo')
+    def test_validate_token_after_logout(self, mock_repo_class, active_user, mock_acknowledged_result):
+        """Test path: token sudah logout -> tidak valid tanpa query database"""
+        mock_repo = Mock()
+        mock_repo.insertData.return_value = mock_acknowledged_result
+        mock_repo.deleteData.return_value = mock_acknowledged_result
+        mock_repo_class.return_value = mock_repo
+
+        service = SessionService()
+        token = service.createToken(active_user)
+        service.deleteToken(token)
+
+        result = service.validateToken(token)
+
+        assert result["status"] == False
+        mock_repo.getData.assert_not_called()
+
+    @patch('utils.jwtHandler.SessionRepo')
+    def test_check_access_forbidden_role(self, mock_repo_class, active_user, mock_acknowledged_result):
+        """Test path: role tidak diizinkan"""
+        mock_repo = Mock()
+        mock_repo.insertData.return_value = mock_acknowledged_result
+        mock_repo_class.return_value = mock_repo
+
+        service = SessionService()
+        token = service.createToken(active_user)
+
+        result = service.checkAccess(["owner"], token)
+
+        assert result["status"] == False
+        assert result["message"] == "Forbidden"
+
+    @patch('utils.jwtHandler.SessionRepo')
+    def test_check_access_invalid_signature(self, mock_repo_class):
+        """Test path: token palsu ditolak tanpa query database"""
+        mock_repo = Mock()
+        mock_repo_class.return_value = mock_repo
+
+        service = SessionService()
+        result = service.checkAccess(["employee"], "not.a.token")
+
+        assert result["status"] == False
+        mock_repo.getData.assert_not_called()
+
+
+@pytest.fixture
+def auth_app():
+    """App kecil dengan hook loadCurrentUser dan route yang dijaga require_roles"""
+    app = Flask(__name__)
+    app.before_request(loadCurrentUser)
+
+    @app.route("/api")
+    @require_roles("manager", "employee")
+    def api():
+        getCurrentUser()
+        return jsonify(getCurrentUser())
+
+    @app.route("/page")
+    @require_roles("owner", redirectTo="/notHaveAccess")
+    def page():
+        return "ok"
+
+    return app
+
+
+class TestRequireRoles:
+    """Test require_roles - token di-resolve sekali per request"""
+
+    @pytest.fixture(autouse=True)
+    def session_service(self, monkeypatch):
+        service = Mock()
+        monkeypatch.setattr(jwtHandler, "sessionService", service)
+        return service
+
+    def test_allowed_role_resolves_token_once(self, auth_app, session_service, active_user):
+        """Test path: role diizinkan -> payload dari g, resolve token satu kali"""
+        session_service.resolveToken.return_value = {"status": True, "message": "Success", "data": active_user}
+        client = auth_app.test_client()
+        client.set_cookie("token", "abc")
+
+        response = client.get("/api")
+
+        assert response.status_code == 200
+        assert response.get_json()["_id"] == "EMP_12345"
+        session_service.resolveToken.assert_called_once_with("abc")
+
+    def test_forbidden_role_redirects_page(self, auth_app, session_service, active_user):
+        """Test path: role tidak diizinkan di halaman -> redirect notHaveAccess"""
+        session_service.resolveToken.return_value = {"status": True, "message": "Success", "data": active_user}
+        client = auth_app.test_client()
+        client.set_cookie("token", "abc")
+
+        response = client.get("/page")
+
+        assert response.status_code == 302
+        assert response.headers["Location"].endswith("/notHaveAccess")
+
+    def test_no_token_returns_403(self, auth_app, session_service):
+        """Test path: tanpa cookie -> JSON 403"""
+        session_service.resolveToken.return_value = {"status": False, "message": "No token found"}
+
+        response = auth_app.test_client().get("/api")
+
+        assert response.status_code == 403
+        assert response.get_json() == {"status": False, "message": "You don't have access"}
+        session_service.resolveToken.assert_called_once_with(None)
+
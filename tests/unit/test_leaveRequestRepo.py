@@ -0,0 +1,42 @@
+import pytest
+import mongomock
+from datetime import datetime
+from unittest.mock import patch
+from repo.leaveRequestRepo import LeaveRequestRepo
+
+
+@pytest.fixture
+def leave_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = LeaveRequestRepo()
+    repo.collection = mongomock.MongoClient().db.leaveRequests
+    repo.collection.insert_many([
+        {"_id": "ANR_001", "employeeId": "EMP_001", "status": "approved",
+         "startDate": datetime(2025, 12, 20), "endDate": datetime(2025, 12, 25)},
+        {"_id": "ANR_002", "employeeId": "EMP_001", "status": "rejected",
+         "startDate": datetime(2026, 1, 5), "endDate": datetime(2026, 1, 10)},
+        {"_id": "ANR_003", "employeeId": "EMP_002", "status": "pending",
+         "startDate": datetime(2026, 1, 5), "endDate": datetime(2026, 1, 10)},
+    ])
+    return repo
+
+
+class TestLeaveRequestRepoOverlap:
+    """Test findOverlap (interval [start, end))"""
+
+    @pytest.mark.parametrize("start, end, expected", [
+        (datetime(2025, 12, 23), datetime(2025, 12, 28), "ANR_001"),  # irisan di ujung akhir
+        (datetime(2025, 12, 18), datetime(2025, 12, 21), "ANR_001"),  # irisan di ujung awal
+        (datetime(2025, 12, 25), datetime(2025, 12, 26), "ANR_001"),  # hari terakhir request lama
+        (datetime(2025, 12, 10), datetime(2025, 12, 20), None),       # selesai tepat sebelum mulai
+        (datetime(2025, 12, 26), datetime(2025, 12, 30), None),       # mulai setelah selesai
+    ])
+    def test_overlap_boundaries(self, leave_repo, start, end, expected):
+        """Test path: batas interval inklusif/eksklusif"""
+        result = leave_repo.findOverlap("EMP_001", start, end)
+
+        assert (result or {}).get("_id") == expected
+
+    def test_ignores_other_status_and_employee(self, leave_repo):
+        """Test path: request rejected dan milik employee lain tidak dihitung"""
+        assert leave_repo.findOverlap("EMP_001", datetime(2026, 1, 6), datetime(2026, 1, 8)) is None
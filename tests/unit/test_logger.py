@@ -0,0 +1,86 @@
+import io
+import json
+import logging
+import queue
+import pytest
+from utils.logger import AsyncQueueHandler, parseLevels, setupLogging, stopLogging
+
+
+class Payload:
+    """Dokumen palsu yang menghitung berapa kali diubah ke string"""
+
+    def __init__(self, text="x"):
+        self.text = text
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return self.text
+
+
+@pytest.fixture
+def log_stream():
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    handler = setupLogging(level="INFO", levels={"tests.verbose": "DEBUG"}, stream=stream)
+    yield stream
+    stopLogging()
+    root.removeHandler(handler)
+    root.setLevel(level)
+    logging.getLogger("tests.verbose").setLevel(logging.NOTSET)
+
+
+def lines(stream):
+    stopLogging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestLogger:
+    """Test setupLogging - level per module, lazy formatting, antrian"""
+
+    def test_disabled_debug_never_formats_payload(self, log_stream):
+        """Test path: DEBUG tidak aktif -> dokumen tidak pernah di-format"""
+        payload = Payload()
+
+        logging.getLogger("tests.quiet").debug("shifts = %s", payload)
+
+        assert payload.formatted == 0
+        assert lines(log_stream) == []
+
+    def test_module_level_override(self, log_stream):
+        """Test path: LOG_LEVELS mengaktifkan DEBUG hanya untuk satu module"""
+        logging.getLogger("tests.verbose").debug("shifts = %s", Payload("month"))
+
+        entries = lines(log_stream)
+
+        assert entries[0]["severity"] == "DEBUG"
+        assert entries[0]["logger"] == "tests.verbose"
+        assert entries[0]["message"] == "shifts = month"
+
+    def test_long_message_truncated(self):
+        """Test path: pesan lebih panjang dari limit dipotong"""
+        handler = AsyncQueueHandler(queue.Queue(), payloadLimit=10)
+        record = logging.LogRecord("tests", logging.INFO, __file__, 1, "doc = %s", ("a" * 50,), None)
+
+        prepared = handler.prepare(record)
+
+        assert prepared.getMessage().startswith("doc = aaaa")
+        assert prepared.getMessage().endswith("(56 chars)")
+
+    def test_full_queue_drops_record(self):
+        """Test path: antrian penuh -> log dibuang, request tidak menunggu"""
+        handler = AsyncQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("tests", logging.INFO, __file__, 1, "hello", None, None)
+
+        handler.emit(record)
+        handler.emit(record)
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
+
+    def test_parse_levels(self):
+        assert parseLevels("repo=WARNING, service.attendanceService=debug,invalid") == {
+            "repo": "WARNING",
+            "service.attendanceService": "DEBUG",
+        }
@@ -0,0 +1,119 @@
+import pytest
+from flask import Flask
+from types import SimpleNamespace
+from utils import metrics
+from utils.config import Config
+from utils.metrics import CommandMetrics, Gauge, Histogram
+
+
+def command_event(command_name, command=None, request_id=1, duration_micros=0):
+    return SimpleNamespace(
+        command_name=command_name,
+        command=command or {},
+        request_id=request_id,
+        operation_id=request_id,
+        connection_id=("localhost", 27017),
+        duration_micros=duration_micros,
+    )
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    """Ganti metrics global dengan instance baru supaya test tidak saling mempengaruhi"""
+    latency = Histogram("http_request_duration_seconds", "test", labels=("endpoint", "method", "status"))
+    inFlight = Gauge("http_requests_in_flight", "test", labels=("endpoint",))
+    monkeypatch.setattr(metrics, "requestLatency", latency)
+    monkeypatch.setattr(metrics, "requestsInFlight", inFlight)
+    return latency, inFlight
+
+
+class TestMetrics:
+    """Test utils.metrics - histogram, CommandListener, hook request"""
+
+    def test_histogram_render_cumulative_buckets(self):
+        """Test path: bucket dirender kumulatif + sum/count"""
+        histogram = Histogram("latency", "test", labels=("endpoint",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "a")
+        histogram.observe(0.5, "a")
+        histogram.observe(2.0, "a")
+
+        lines = histogram.render()
+
+        assert 'latency_bucket{endpoint="a",le="0.1"} 1' in lines
+        assert 'latency_bucket{endpoint="a",le="1.0"} 2' in lines
+        assert 'latency_bucket{endpoint="a",le="+Inf"} 3' in lines
+        assert 'latency_count{endpoint="a"} 3' in lines
+
+    def test_command_listener_records_collection(self):
+        """Test path: durasi command dicatat per collection dan command"""
+        histogram = Histogram("mongo", "test", labels=("collection", "command", "outcome"))
+        listener = CommandMetrics(histogram)
+
+        listener.started(command_event("find", {"find": "attendances"}, request_id=7))
+        listener.succeeded(command_event("find", request_id=7, duration_micros=1500))
+        listener.started(command_event("ping", {"ping": 1}, request_id=8))
+        listener.failed(command_event("ping", request_id=8, duration_micros=100))
+
+        assert histogram.count("attendances", "find", "success") == 1
+        assert histogram.count("-", "ping", "failure") == 1
+        assert listener.pending == {}
+
+    def test_request_hooks_record_latency(self, fresh_metrics):
+        """Test path: request selesai -> latency tercatat, in-flight kembali 0"""
+        latency, inFlight = fresh_metrics
+        app = Flask(__name__)
+        metrics.initMetrics(app)
+        seen = {}
+
+        @app.route("/ping")
+        def ping():
+            seen["inFlight"] = inFlight.value("ping")
+            return "ok"
+
+        app.test_client().get("/ping")
+
+        assert seen["inFlight"] == 1
+        assert inFlight.value("ping") == 0
+        assert latency.count("ping", "GET", "200") == 1
+
+    def test_render_includes_components(self):
+        """Test path: cache dan antrian background ikut dirender"""
+        body = metrics.render()
+
+        assert 'cache_hits_total{cache="session"}' in body
+        assert 'cache_misses_total{cache="geofence"}' in body
+        assert "history_writer_queue_depth" in body
+        assert "clock_event_log_pending_bytes" in body
+
+
+class TestMetricsEndpoint:
+    """Test routes.metricsRoutes - /metrics wajib token"""
+
+    @pytest.fixture
+    def client(self):
+        from routes.metricsRoutes import metricsBp
+        app = Flask(__name__)
+        app.register_blueprint(metricsBp)
+        return app.test_client()
+
+    @pytest.mark.parametrize("enabled, token", [(False, "secret"), (True, "")])
+    def test_disabled_without_token(self, client, monkeypatch, enabled, token):
+        """Test path: METRICS_ENABLED mati atau token kosong -> 404"""
+        monkeypatch.setattr(Config, "METRICS_ENABLED", enabled)
+        monkeypatch.setattr(Config, "METRICS_TOKEN", token)
+
+        assert client.get("/metrics").status_code == 404
+
+    @pytest.mark.parametrize("header, status", [
+        ("Bearer secret", 200),
+        ("Bearer wrong", 401),
+        ("Bearer sécret", 401),
+        (None, 401),
+    ])
+    def test_token_checked(self, client, monkeypatch, header, status):
+        """Test path: token benar -> 200, salah / non-ASCII / tidak ada -> 401"""
+        monkeypatch.setattr(Config, "METRICS_ENABLED", True)
+        monkeypatch.setattr(Config, "METRICS_TOKEN", "secret")
+        headers = {"Authorization": header} if header else {}
+
+        assert client.get("/metrics", headers=headers).status_code == status
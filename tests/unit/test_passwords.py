@@ -0,0 +1,31 @@
+import pytest
+import threading
+from utils.config import Config
+from utils import passwords
+from utils.passwords import hashPassword, checkPassword, needsRehash, offload
+
+
+@pytest.fixture(autouse=True)
+def low_rounds(monkeypatch):
+    monkeypatch.setattr(Config, "BCRYPT_ROUNDS", 4)
+
+
+class TestPasswords:
+    """Test hash / cek password bcrypt di native thread"""
+
+    def test_hash_and_check(self):
+        hashed = hashPassword("secret123")
+
+        assert hashed.startswith(b"$2b$04$")
+        assert checkPassword("secret123", hashed) == True
+        assert checkPassword("wrong", hashed) == False
+        assert checkPassword("secret123", hashed.decode()) == True
+
+    def test_needs_rehash(self):
+        assert needsRehash(b"$2b$12$" + b"x" * 53) == True
+        assert needsRehash(hashPassword("secret123")) == False
+        assert needsRehash(b"not-a-bcrypt-hash") == False
+
+    def test_runs_outside_caller_thread(self):
+        assert passwords.isGreen() == False
+        assert offload(lambda: threading.current_thread().name).startswith("bcrypt")
@@ -0,0 +1,46 @@
+import pytest
+import pendulum
+from datetime import datetime
+from validation.employeeSchema import EmployeeSchema
+from validation.attendanceSchema import ShiftListSchema
+from validation.annualRequestschema import AnnualRequestSchema
+from validation.registry import employeeDumper, shiftListDumper, annualRequestDumper, benchmark
+
+
+NOW = pendulum.datetime(2025, 11, 1, 8, 30, tz="Asia/Jakarta")
+
+
+class TestFastDumper:
+    """FastDumper harus menghasilkan output yang sama dengan schema.dump() untuk dokumen database"""
+
+    @pytest.mark.parametrize("schema, dumper, document", [
+        (EmployeeSchema(), employeeDumper, {
+            "_id": "EMP_001", "name": "John Doe", "email": "john@aventra.com", "password": b"$2b$12$hash",
+            "role": "employee", "salaryPerDay": 150000.0, "workDays": 3, "branchId": None,
+            "createdAt": NOW, "notInSchema": 1,
+        }),
+        (ShiftListSchema(), shiftListDumper, {
+            "_id": "SHF_001", "Date": datetime(2025, 11, 1), "branchId": "STR_001", "createdAt": NOW,
+            "employees": [
+                {"employeeId": "EMP_001", "shift": "Day", "clockIn": "07:05:00", "status": "present"},
+                {"employeeId": "EMP_002", "shift": "Night", "clockIn": None},
+            ],
+        }),
+        (AnnualRequestSchema(), annualRequestDumper, {
+            "_id": "ANR_001", "employeeId": "EMP_001", "branchId": "STR_001", "type": "annual",
+            "startDate": datetime(2025, 12, 1), "endDate": datetime(2025, 12, 3), "days": 3,
+            "status": "approved", "reason": "Holiday", "createdAt": NOW,
+            "reviewer": {"employeeId": "EMP_099", "name": "Manager", "note": "", "timeReviewed": NOW},
+        }),
+    ])
+    def test_same_as_schema_dump(self, schema, dumper, document):
+        assert dumper.dump(document) == schema.dump(document)
+
+    def test_load_only_not_dumped(self):
+        assert "password" not in employeeDumper.dump({"_id": "EMP_001", "password": b"hash"})
+
+    def test_benchmark_runs(self):
+        result = benchmark(count=10, repeat=1)
+
+        assert "employee: FastDumper" in result
+        assert all(seconds >= 0 for seconds in result.values())
@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import Mock, patch
+import pendulum
+from repo.shiftsRepo import ShiftsRepo
+
+
+@pytest.fixture(autouse=True)
+def clear_shift_cache():
+    ShiftsRepo.invalidateCache()
+    yield
+    ShiftsRepo.invalidateCache()
+
+
+@pytest.fixture
+def shifts_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = ShiftsRepo()
+    repo.collection = Mock()
+    repo.collection.find.return_value = [
+        {"_id": "SHF_001", "shiftName": "Day", "shiftStartTime": "07:00:00", "shiftEndTime": "15:00:00"},
+        {"_id": "SHF_002", "shiftName": "Night", "shiftStartTime": "15:00:00", "shiftEndTime": "23:00:00"},
+    ]
+    return repo
+
+
+class TestShiftsRepoCache:
+    """Test cache definisi shift"""
+
+    def test_shift_map_parsed(self, shifts_repo):
+        """Test path: jam shift sudah di-parse ke pendulum Time"""
+        shifts = shifts_repo.getShiftMap()
+
+        assert set(shifts) == {"Day", "Night"}
+        assert shifts["Day"]["startTime"] == pendulum.time(7, 0, 0)
+        assert shifts["Night"]["endTime"] == pendulum.time(23, 0, 0)
+        assert shifts["Day"]["shiftStartTime"] == "07:00:00"
+
+    def test_shift_map_cached(self, shifts_repo):
+        """Test path: pemanggilan kedua tidak query database"""
+        shifts_repo.getShiftMap()
+        shifts_repo.getShiftMap()
+
+        shifts_repo.collection.find.assert_called_once()
+
+    def test_shift_map_invalidate(self, shifts_repo):
+        """Test path: setelah invalidate, data diambil ulang"""
+        shifts_repo.getShiftMap()
+        ShiftsRepo.invalidateCache()
+        shifts_repo.getShiftMap()
+
+        assert shifts_repo.collection.find.call_count == 2
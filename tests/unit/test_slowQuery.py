@@ -0,0 +1,110 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from utils.slowQuery import SlowQueryListener, SlowQueryLog, explainCache, filterShape, redact
+
+
+def command_event(command_name, command=None, request_id=1, duration_micros=0):
+    return SimpleNamespace(
+        command_name=command_name,
+        command=command or {},
+        request_id=request_id,
+        operation_id=request_id,
+        connection_id=("localhost", 27017),
+        database_name="aventra_db",
+        duration_micros=duration_micros,
+        failure=None,
+    )
+
+
+def run_in_service(fn):
+    """Jalankan fn dari frame yang module-nya ada di package `service`"""
+    scope = {"__name__": "service.fakeService", "fn": fn}
+    exec("class FakeService:\n    def getMonthlyShifts(self):\n        return fn()\n", scope)
+    return scope["FakeService"]().getMonthlyShifts()
+
+
+@pytest.fixture(autouse=True)
+def clear_explain_cache():
+    explainCache.clear()
+    yield
+    explainCache.clear()
+
+
+@pytest.fixture
+def slow_log(tmp_path):
+    repo = Mock()
+    repo.explainCommand.return_value = {
+        "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+        "executionStats": {"nReturned": 3, "totalKeysExamined": 0, "totalDocsExamined": 5000, "executionTimeMillis": 120},
+    }
+    log = SlowQueryLog(sink="file", path=str(tmp_path / "slow.log"), explain=True, repo=repo)
+    log.start = Mock()  # tanpa background thread; diproses lewat flush()
+    yield log
+    log.close()
+
+
+class TestSlowQueryShape:
+    """Test bentuk filter tanpa value"""
+
+    def test_redact_nested_filter(self):
+        shape = redact({"branchId": "STR_001", "Date": {"$gte": 1, "$lt": 2}, "status": {"$in": ["a", "b"]}})
+        assert shape == {"branchId": "?", "Date": {"$gte": "?", "$lt": "?"}, "status": {"$in": ["?"]}}
+
+    def test_filter_shape_update(self):
+        command = {"update": "attendances", "updates": [{"q": {"_id": "SHF_1"}, "u": {"$set": {"x": 1}}}]}
+        assert filterShape("update", command) == {"_id": "?"}
+
+
+class TestSlowQueryListener:
+    """Test SlowQueryListener - threshold, origin, explain"""
+
+    def test_fast_command_not_recorded(self, slow_log):
+        """Test path: di bawah threshold -> tidak ada catatan"""
+        listener = SlowQueryListener(slow_log, thresholdMs=100)
+
+        listener.started(command_event("find", {"find": "attendances", "filter": {}}))
+        listener.succeeded(command_event("find", duration_micros=5000))
+
+        assert slow_log.queue.qsize() == 0
+        assert listener.pending == {}
+
+    def test_slow_find_recorded_with_origin_and_plan(self, slow_log):
+        """Test path: find lambat -> origin service, filter di-redact, winning plan COLLSCAN"""
+        listener = SlowQueryListener(slow_log, thresholdMs=100)
+        command = {"find": "attendances", "filter": {"branchId": "STR_001"}, "sort": {"Date": 1}, "lsid": {"id": 1}, "$db": "aventra_db"}
+
+        listener.started(command_event("find", command))
+        run_in_service(lambda: listener.succeeded(command_event("find", duration_micros=250000)))
+        slow_log.flush()
+
+        record = json.loads(open(slow_log.path).read().splitlines()[0])
+        # Python < 3.11 tidak punya co_qualname, origin hanya nama method
+        assert record["origin"] in ("service.fakeService:FakeService.getMonthlyShifts", "service.fakeService:getMonthlyShifts")
+        assert record["collection"] == "attendances"
+        assert record["filter"] == {"branchId": "?"}
+        assert record["durationMs"] == 250.0
+        assert record["plan"]["collscan"] is True
+        assert record["plan"]["docsExamined"] == 5000
+        slow_log.repo.explainCommand.assert_called_once_with({"find": "attendances", "filter": {"branchId": "STR_001"}, "sort": {"Date": 1}})
+
+    def test_same_shape_explained_once(self, slow_log):
+        """Test path: bentuk query sama berulang -> explain memakai cache"""
+        listener = SlowQueryListener(slow_log, thresholdMs=100)
+        for requestId, branch in [(1, "STR_001"), (2, "STR_002")]:
+            listener.started(command_event("find", {"find": "stores", "filter": {"_id": branch}}, request_id=requestId))
+            listener.succeeded(command_event("find", request_id=requestId, duration_micros=150000))
+        slow_log.flush()
+
+        assert len(open(slow_log.path).read().splitlines()) == 2
+        slow_log.repo.explainCommand.assert_called_once()
+
+    def test_worker_commands_ignored(self, slow_log):
+        """Test path: explain/insert dari thread worker sendiri tidak dicatat ulang"""
+        listener = SlowQueryListener(slow_log, thresholdMs=0)
+        slow_log.local.worker = True
+
+        listener.started(command_event("aggregate", {"aggregate": "x", "pipeline": []}))
+
+        assert listener.pending == {}
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import Mock, patch
+from repo.storeRepo import StoreRepo
+from utils.geo import haversine
+
+
+@pytest.fixture(autouse=True)
+def clear_geofence_cache():
+    StoreRepo.invalidateGeofence()
+    yield
+    StoreRepo.invalidateGeofence()
+
+
+@pytest.fixture
+def store_repo():
+    with patch('repo.BaseRepo.mongoConnection'):
+        repo = StoreRepo()
+    repo.collection = Mock()
+    repo.collection.find_one.return_value = {"_id": "STR_001", "geometry": {"type": "Point", "coordinates": [110.3695, -7.7956]}}
+    return repo
+
+
+class TestStoreRepoGeofence:
+    """Test validasi lokasi clock in (haversine + cache)"""
+
+    def test_haversine(self):
+        """Test path: 0.0004 derajat lintang sekitar 44.5 meter"""
+        assert haversine([110.3695, -7.7956], [110.3695, -7.7956]) == 0
+        assert haversine([110.3695, -7.7956], [110.3695, -7.7960]) == pytest.approx(44.5, abs=0.1)
+
+    def test_inside_and_outside_radius(self, store_repo):
+        """Test path: default radius 50 meter"""
+        assert store_repo.validateCheckIn([110.3695, -7.7960], "STR_001")["_id"] == "STR_001"
+        assert store_repo.validateCheckIn([110.3695, -7.7961], "STR_001") is None
+
+    def test_branch_radius(self, store_repo):
+        """Test path: checkInRadius per branch dipakai"""
+        store_repo.collection.find_one.return_value["checkInRadius"] = 100
+
+        assert store_repo.validateCheckIn([110.3695, -7.7962], "STR_001") is not None
+
+    def test_cached_until_invalidated(self, store_repo):
+        """Test path: lokasi branch hanya dibaca sekali sampai di-invalidate"""
+        store_repo.validateCheckIn([110.3695, -7.7956], "STR_001")
+        store_repo.validateCheckIn([110.3695, -7.7956], "STR_001")
+        assert store_repo.collection.find_one.call_count == 1
+
+        StoreRepo.invalidateGeofence("STR_001")
+        store_repo.validateCheckIn([110.3695, -7.7956], "STR_001")
+        assert store_repo.collection.find_one.call_count == 2
+
+    def test_fallback_to_geo_query(self, store_repo):
+        """Test path: branch tanpa geometry Point dicek dengan $nearSphere"""
+        store_repo.collection.find_one.side_effect = [{"_id": "STR_001"}, {"_id": "STR_001"}, None]
+
+        assert store_repo.validateCheckIn([110.3695, -7.7956], "STR_001") is None
+
+        query = store_repo.collection.find_one.call_args.args[0]
+        assert query["geometry"]["$nearSphere"]["$maxDistance"] == 50
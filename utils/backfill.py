@@ -0,0 +1,33 @@
+"""
+Backfill field turunan pada dokumen lama.
+
+Dijalankan sekali setelah deploy yang menambah field baru, supaya data lama
+ikut terbaca oleh query yang memfilter field tersebut.
+
+Usage:
+    python -m utils.backfill
+"""
+from repo.employeeScheduleRepo import EmployeeScheduleRepo
+from repo.leaveRequestRepo import LeaveRequestRepo
+import sys
+
+
+def backfillLeaveRequests():
+    """Isi requesterRole di leaveRequests dari role employee pembuatnya."""
+    return LeaveRequestRepo().backfillRequesterRole()
+
+
+def backfillEmployeeSchedules():
+    """Bangun ulang projection employeeSchedules dari collection attendances."""
+    return EmployeeScheduleRepo().rebuild()
+
+
+if __name__ == "__main__":
+    try:
+        remaining = backfillLeaveRequests()
+        print(f"leaveRequests: requesterRole backfilled, {remaining} request(s) without a matching employee")
+        total = backfillEmployeeSchedules()
+        print(f"employeeSchedules: rebuilt, {total} schedule entries")
+    except Exception as e:
+        print("Failed to backfill data", e)
+        sys.exit(1)
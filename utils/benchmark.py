@@ -0,0 +1,669 @@
+"""
+Load test + benchmark in-process, tanpa k6 dan tanpa URL deploy.
+
+Harness ini mem-boot `main:app` di proses yang sama, mengisi database dengan
+data dummy (branch, manager, karyawan, master shift, jadwal sebulan, pengajuan
+cuti), lalu menjalankan skenario lewat Flask test client dari beberapa thread
+sekaligus. Seluruh stack WSGI ikut diukur (hook before/after request,
+@require_roles, service, repo); yang tidak ikut hanya socket HTTP.
+
+Database:
+    - default: mongomock (in-memory), jalan offline tanpa MongoDB. mongomock
+      tidak mendukung arrayFilters, jadi clock in selalu lewat CLOCK_BURST_MODE
+      (write-ahead log di direktori sementara) dan event tidak diterapkan.
+      Endpoint summary (aggregation $unwind + $facet) tidak ikut diukur:
+      mongomock menjalankan aggregation di Python (deepcopy dokumen per
+      elemen $unwind), jadi ~300 ms per request yang antre di GIL dan
+      menenggelamkan angka endpoint lain
+    - --mongo-uri mongodb://127.0.0.1:27017 : MongoDB lokal, database
+      BENCH_DATABASE (default aventra_bench) di-drop sebelum dan sesudah run;
+      clock in memakai mode yang dikonfigurasi, atau --clock-burst-mode
+
+Skenario (berurutan, state dari skenario sebelumnya dipakai berikutnya):
+    login-storm      semua karyawan + manager login bersamaan (bcrypt ikut terukur)
+    clock-in-burst   semua karyawan clock in ke shift hari ini di saat yang sama
+    owner-dashboard  halaman dashboard owner + API yang dipanggil dashboard.js
+    monthly-shifts   laporan shift / summary bulanan manager + jadwal karyawan
+    leave-approvals  manager (cuti karyawan) dan owner (cuti manager) approve antrian pending
+
+Seed + semua skenario diulang --repeat kali (database dikosongkan tiap kali).
+Tiap skenario dilaporkan median p50/p95/p99 (ms), throughput (request/detik)
+dan error rate dari semua run, lalu dibandingkan dengan baseline JSON
+(non-functional/baseline.json, per backend; --update-baseline menyimpan angka
+terburuk dari semua run). p95/p99 yang naik atau throughput yang turun lebih dari
+--tolerance, atau error rate yang naik, dianggap regresi dan exit code 1.
+Error di background (record ERROR yang di-log, history writer / clock event
+log yang gagal menulis) juga membuat run gagal (exit code 1) dan baseline
+tidak ditulis, karena angkanya tidak mewakili jalur yang normal.
+
+Usage:
+    python -m utils.benchmark
+    python -m utils.benchmark --mongo-uri mongodb://127.0.0.1:27017
+    python -m utils.benchmark --update-baseline
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dayTime
+from http.cookies import SimpleCookie
+import argparse
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "non-functional", "baseline.json")
+BENCH_DATABASE = os.getenv("BENCH_DATABASE", "aventra_bench")
+PASSWORD = "benchmark123"
+STORE_LOCATION = [110.50241088552868, -7.324738730101273]
+# selisih absolut minimal (ms) sebelum kenaikan latency dianggap regresi, supaya
+# noise di angka sub-milidetik tidak membuat run gagal
+MIN_DELTA_MS = 2.0
+
+
+def percentile(values, pct):
+    """
+    Percentile nearest-rank.
+
+    Example:
+        >>> percentile([1, 2, 3, 4], 50)
+        2
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(timings, errors, elapsed):
+    """
+    Ringkasan satu skenario.
+
+    Args:
+        timings (list): Durasi tiap request dalam detik
+        errors (int): Jumlah request yang gagal
+        elapsed (float): Durasi wall clock skenario dalam detik
+
+    Returns:
+        dict: requests, errorRate, p50/p95/p99 (ms), throughput (request/detik)
+    """
+    return {
+        "requests": len(timings),
+        "errorRate": round(errors / len(timings), 4) if timings else 0.0,
+        "p50": round(percentile(timings, 50) * 1000, 2),
+        "p95": round(percentile(timings, 95) * 1000, 2),
+        "p99": round(percentile(timings, 99) * 1000, 2),
+        "throughput": round(len(timings) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def combine(runs, worst=False):
+    """
+    Gabungkan beberapa run (satu run = satu database baru) jadi satu angka per
+    skenario, supaya satu run yang kebetulan lambat tidak jadi regresi palsu.
+
+    Args:
+        runs (list): [{skenario: summarize(...)}, ...]
+        worst (bool): False -> median tiap angka (hasil run yang dibandingkan);
+                      True -> angka terburuk: latency / error rate tertinggi,
+                      throughput terendah (dipakai saat menulis baseline, jadi
+                      noise normal antar run masih di dalam tolerance)
+
+    Returns:
+        dict: {skenario: summarize(...)}
+    """
+    def pick(key, values):
+        if not worst or key == "requests":
+            return statistics.median(values)
+        return min(values) if key == "throughput" else max(values)
+
+    return {
+        name: {key: pick(key, [run[name][key] for run in runs]) for key in runs[0][name]}
+        for name in runs[0]
+    }
+
+
+def compare(results, baseline, tolerance=0.5):
+    """
+    Bandingkan hasil run dengan baseline.
+
+    Args:
+        results (dict): {skenario: summarize(...)}
+        baseline (dict): Format yang sama, dari baseline JSON
+        tolerance (float): Kenaikan relatif yang masih diterima (0.5 = 50%)
+
+    Returns:
+        list: Pesan regresi; kosong jika tidak ada
+
+    Example:
+        >>> compare({"login-storm": {"p95": 90, ...}}, {"login-storm": {"p95": 40, ...}})
+        ['login-storm: p95 90.0 ms > baseline 40.0 ms (+125%)']
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            regressions.append(f"{name}: scenario missing from this run")
+            continue
+        for key in ("p95", "p99"):
+            limit = base[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - base[key] > MIN_DELTA_MS:
+                change = (current[key] / base[key] - 1) * 100 if base[key] else math.inf
+                regressions.append(f"{name}: {key} {current[key]:.1f} ms > baseline {base[key]:.1f} ms (+{change:.0f}%)")
+        if current["throughput"] < base["throughput"] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {current['throughput']:.1f}/s < baseline {base['throughput']:.1f}/s")
+        if current["errorRate"] > base["errorRate"]:
+            regressions.append(f"{name}: error rate {current['errorRate']:.2%} > baseline {base['errorRate']:.2%}")
+    return regressions
+
+
+def backgroundErrors(logged, writers):
+    """
+    Error yang tidak terlihat di response request.
+
+    Args:
+        logged (list): Pesan record ERROR selama run
+        writers (dict): {nama writer background: jumlah yang gagal}
+
+    Returns:
+        list: Pesan error (pesan yang sama digabung); kosong jika tidak ada
+
+    Example:
+        >>> backgroundErrors(["a", "a"], {"history writer": 2})
+        ['history writer: 2 failed', '2x a']
+    """
+    problems = [f"{name}: {count} failed" for name, count in writers.items() if count]
+    problems += [f"{count}x {message}" if count > 1 else message for message, count in Counter(logged).items()]
+    return problems
+
+
+class ErrorLog(logging.Handler):
+    """Kumpulkan record ERROR dari seluruh app selama benchmark (dipasang di root logger)."""
+
+    # pesan error bisa berisi seluruh batch dokumen; cukup awalnya untuk laporan
+    MESSAGE_LIMIT = 300
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        message = f"{record.name}: {record.getMessage()}"
+        if len(message) > self.MESSAGE_LIMIT:
+            message = message[:self.MESSAGE_LIMIT] + "..."
+        self.messages.append(message)
+
+
+def configure(args):
+    """
+    Arahkan app ke database benchmark. Harus dipanggil sebelum `main` di-import,
+    karena repo dibuat (dan client MongoDB diminta) saat module route di-import.
+    """
+    from utils.clockLog import clockEventLog
+    from utils.config import Config
+    from utils.mongoConnect import mongoConnection
+    from utils.slowQuery import slowQueryLog
+
+    if args.mongo_uri and args.database == Config.DATABASE:
+        raise ValueError(f"Refusing to benchmark against the application database {Config.DATABASE}")
+    # slow query log dan write-ahead log clock in di direktori sementara, bukan milik app
+    workDir = tempfile.mkdtemp(prefix="aventra-bench-")
+    Config.BCRYPT_ROUNDS = args.bcrypt_rounds
+    Config.DATABASE = args.database
+    slowQueryLog.sink = "file"
+    slowQueryLog.path = os.path.join(workDir, "slow-queries.log")
+    clockEventLog.path = os.path.join(workDir, "clock-events.log")
+    clockEventLog.offsetPath = clockEventLog.path + ".offset"
+    if args.clock_burst_mode or not args.mongo_uri:
+        Config.CLOCK_BURST_MODE = True
+    if args.mongo_uri:
+        Config.MONGO_URI = args.mongo_uri
+        mongoConnection.close()
+        mongoConnection.getClient().drop_database(args.database)
+    else:
+        mongoConnection.close()
+        mongoConnection._client = mongomockClient()
+        mongoConnection._pid = os.getpid()
+    return mongoConnection.getClient()[args.database]
+
+
+def mongomockClient():
+    """
+    Client mongomock yang perilakunya disamakan dengan pymongo untuk benchmark.
+
+    - tz_aware=False: datetime dikembalikan naive UTC, sama seperti MongoClient default.
+    - mongomock mem-pop `_id` dari dict projection milik pemanggil lalu
+      mengembalikannya; dict projection yang dipakai bersama antar thread
+      (EmployeeRepo.publicProjection) jadi race. pymongo tidak pernah mengubah
+      projection, jadi mongomock diberi salinannya.
+    - pymongo 4.11+ mengirim `sort=None` ke add_replace/add_update saat
+      bulk_write ReplaceOne/UpdateOne, yang belum dikenal mongomock (sync
+      employeeSchedules gagal). `sort` hanya diteruskan kalau diisi.
+    """
+    import mongomock
+    from mongomock.collection import BulkOperationBuilder, Collection
+
+    copyOnlyFields = Collection._copy_only_fields
+    if not getattr(copyOnlyFields, "copiesProjection", False):
+        def copyProjection(self, doc, fields, container):
+            return copyOnlyFields(self, doc, dict(fields) if isinstance(fields, dict) else fields, container)
+        copyProjection.copiesProjection = True
+        Collection._copy_only_fields = copyProjection
+
+    def withoutSort(method):
+        if getattr(method, "dropsSort", False):
+            return method
+        def add(self, *args, sort=None, **kwargs):
+            if sort is not None:
+                kwargs["sort"] = sort
+            return method(self, *args, **kwargs)
+        add.dropsSort = True
+        return add
+
+    BulkOperationBuilder.add_replace = withoutSort(BulkOperationBuilder.add_replace)
+    BulkOperationBuilder.add_update = withoutSort(BulkOperationBuilder.add_update)
+    return mongomock.MongoClient(tz_aware=False)
+
+
+class Session:
+    """Satu user benchmark: data employee + token login."""
+
+    def __init__(self, employee):
+        self.employee = employee
+        self.token = None
+
+    @property
+    def id(self):
+        return self.employee["_id"]
+
+    @property
+    def cookie(self):
+        return {"Cookie": f"token={self.token}"} if self.token else {}
+
+
+class Runner:
+    """Jalankan daftar request dari beberapa thread, satu test client per thread."""
+
+    def __init__(self, app, concurrency):
+        self.app = app
+        self.concurrency = concurrency
+        self.local = threading.local()
+
+    def client(self):
+        if getattr(self.local, "client", None) is None:
+            self.local.client = self.app.test_client(use_cookies=False)
+        return self.local.client
+
+    def send(self, method, path, session=None, json=None):
+        headers = session.cookie if session else {}
+        start = time.perf_counter()
+        response = self.client().open(path, method=method, json=json, headers=headers)
+        return response, time.perf_counter() - start
+
+    @staticmethod
+    def failed(response):
+        if response.status_code >= 400:
+            return True
+        body = response.get_json(silent=True)
+        return isinstance(body, dict) and body.get("status") is False
+
+    def run(self, jobs):
+        """
+        Jalankan job secara paralel.
+
+        Args:
+            jobs (list): List callable `job(runner) -> [(response, detik), ...]`;
+                         satu job bisa berisi beberapa request berurutan (satu user)
+
+        Returns:
+            dict: Hasil summarize()
+        """
+        timings, errors = [], 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for measured in pool.map(lambda job: job(self), jobs):
+                for response, duration in measured:
+                    timings.append(duration)
+                    errors += self.failed(response)
+        return summarize(timings, errors, time.perf_counter() - start)
+
+
+def login(runner, session):
+    response, duration = runner.send("POST", "/auth/login", json={"email": session.employee["email"], "password": PASSWORD})
+    cookie = SimpleCookie()
+    for header in response.headers.getlist("Set-Cookie"):
+        cookie.load(header)
+    if "token" in cookie:
+        session.token = cookie["token"].value
+    return response, duration
+
+
+def reset(db, indexes=False):
+    """
+    Kosongkan database benchmark dan cache proses sebelum seeding.
+
+    Args:
+        db: Database benchmark
+        indexes (bool): Buat ulang index repo (MongoDB sungguhan; mongomock
+                        tidak memakai index dan tidak mendukung capped collection)
+    """
+    from repo.shiftsRepo import ShiftsRepo
+    from repo.storeRepo import StoreRepo
+    from utils.historyWriter import historyWriter
+    from utils.indexes import ensureAllIndexes
+    from utils.jwtHandler import sessionCache
+
+    historyWriter.flush()
+    for name in db.list_collection_names():
+        db.drop_collection(name)
+    sessionCache.clear()
+    ShiftsRepo.invalidateCache()
+    StoreRepo.invalidateGeofence()
+    if indexes:
+        ensureAllIndexes()
+
+
+def seed(db, runner, branches, employeesPerBranch):
+    """
+    Isi database benchmark.
+
+    Employee, branch, master shift dan pengajuan cuti (satu per manager dan
+    karyawan) ditulis langsung, password di-hash sekali; jadwal sebulan dibuat
+    lewat API planShifts supaya bentuk dokumennya sama dengan data produksi.
+    Shift "Day" dimulai saat seeding, jadi clock in di skenario clock-in-burst
+    masuk window present.
+
+    Returns:
+        dict: owner, managers, employees (Session), branchIds, shiftIds hari ini, month
+    """
+    import pendulum
+    from service.leaveRequestService import LeaveRequestService
+    from utils.passwords import hashPassword
+
+    now = pendulum.now("Asia/Jakarta")
+    password = hashPassword(PASSWORD)
+    dayStart = now.subtract(minutes=1)
+    db.shifts.insert_many([
+        {"shiftName": "Day", "shiftStartTime": dayStart.format("HH:mm:ss"), "shiftEndTime": dayStart.add(hours=8).format("HH:mm:ss")},
+        {"shiftName": "Night", "shiftStartTime": dayStart.add(hours=12).format("HH:mm:ss"), "shiftEndTime": dayStart.add(hours=20).format("HH:mm:ss")},
+    ])
+
+    def employee(_id, role, branchId, name):
+        return {
+            "_id": _id, "name": name, "email": f"{_id.lower()}@aventra.com", "password": password,
+            "role": role, "status": "active", "branchId": branchId, "salaryPerDay": 50000.0,
+            "annualLeaveBalance": 13, "workDays": 0, "lateDays": 0, "createdAt": now,
+        }
+
+    branchIds = [f"STR_BENCH{n:02d}" for n in range(branches)]
+    db.stores.insert_many([
+        {"_id": branchId, "name": f"Bench Store {branchId[-2:]}", "address": "Benchmark", "status": "active",
+         "geometry": {"type": "Point", "coordinates": STORE_LOCATION}, "createdAt": now}
+        for branchId in branchIds
+    ])
+    people = [employee("EMP_BENCHOWNER", "owner", "", "Bench Owner")]
+    for b, branchId in enumerate(branchIds):
+        people.append(employee(f"EMP_BENCHMGR{b:02d}", "manager", branchId, "Bench Manager"))
+        people += [employee(f"EMP_BENCH{b:02d}{n:03d}", "employee", branchId, "Bench Employee") for n in range(employeesPerBranch)]
+    db.employees.insert_many(people)
+
+    sessions = [Session(person) for person in people]
+    for session in sessions:
+        login(runner, session)
+    owner = sessions[0]
+    managers = [s for s in sessions if s.employee["role"] == "manager"]
+    employees = [s for s in sessions if s.employee["role"] == "employee"]
+
+    month = now.start_of("month")
+    for manager in managers:
+        team = [s.id for s in employees if s.employee["branchId"] == manager.employee["branchId"]]
+        response, _ = runner.send("POST", "/api/attendance/planShifts", manager, json={
+            "startDate": month.to_date_string(),
+            "endDate": month.end_of("month").to_date_string(),
+            "rotation": [{"employeeId": _id, "pattern": ["Day"]} for _id in team],
+        })
+        if runner.failed(response):
+            raise RuntimeError(f"Failed to seed shifts: {response.get_json(silent=True)}")
+    # pengajuan cuti ditulis langsung (lewat createSchema service): _id dari route
+    # hanya timestamp per detik + 2 digit acak, jadi bentrok kalau dibuat beruntun
+    leaveService = LeaveRequestService()
+    leaveStart = now.add(days=30)
+    requests = []
+    for n, session in enumerate(managers + employees):
+        start = leaveStart.add(days=n % 20)
+        requests.append(leaveService.createSchema.load({
+            "_id": f"ANNUAL-BENCH{n:05d}", "employeeId": session.id, "branchId": session.employee["branchId"],
+            "requesterRole": session.employee["role"], "type": "annual", "startDate": start.to_date_string(),
+            "endDate": start.add(days=1).to_date_string(), "days": 2, "reason": "Benchmark leave request",
+            "attachmentUrl": "", "fileName": "",
+        }))
+    db.leaveRequests.insert_many(requests)
+
+    today = datetime.combine(now.date(), dayTime.min)
+    shiftIds = {doc["branchId"]: doc["_id"] for doc in db.attendances.find({"Date": today}, {"branchId": 1})}
+    return {
+        "owner": owner, "managers": managers, "employees": employees,
+        "branchIds": branchIds, "shiftIds": shiftIds, "month": month.format("YYYY-MM"), "today": now.to_date_string(),
+    }
+
+
+def plainDatetimes(db):
+    """
+    Ganti datetime pendulum di semua dokumen dengan datetime biasa.
+
+    MongoDB selalu mengembalikan `datetime.datetime`, sedangkan mongomock
+    mengembalikan objek yang disimpan apa adanya (pendulum DateTime), yang
+    ditolak jsonify (http_date butuh timezone.utc bawaan).
+    """
+    def plain(value):
+        if isinstance(value, dict):
+            return {key: plain(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [plain(item) for item in value]
+        if isinstance(value, datetime) and type(value) is not datetime:
+            return datetime(*value.timetuple()[:6], value.microsecond)
+        return value
+
+    for name in db.list_collection_names():
+        for doc in db[name].find():
+            db[name].replace_one({"_id": doc["_id"]}, plain(doc))
+
+
+def loginStorm(state, rounds):
+    users = (state["managers"] + state["employees"]) * rounds
+    return [lambda runner, session=session: [login(runner, Session(session.employee))] for session in users]
+
+
+def clockInBurst(state, rounds):
+    def clockIn(runner, session):
+        shiftId = state["shiftIds"].get(session.employee["branchId"])
+        payload = {"shiftId": shiftId, "geometry": {"type": "Point", "coordinates": STORE_LOCATION}}
+        return [runner.send("POST", "/api/attendance/clockIn", session, json=payload)]
+    # clock in ulang ditolak (sudah clock in), jadi burst hanya satu putaran
+    return [lambda runner, session=session: clockIn(runner, session) for session in state["employees"]]
+
+
+def ownerDashboard(state, rounds):
+    owner = state["owner"]
+    paths = [
+        "/dashboard",
+        "/auth/current",
+        "/api/branch",
+        "/api/employees/all",
+        "/api/annualRequest/list-manager?status=pending",
+    ]
+    if state["aggregations"]:
+        paths.append(f"/api/attendance/summary?start={state['month']}-01&end={state['today']}")
+    visit = lambda runner: [runner.send("GET", path, owner) for path in paths]
+    return [visit] * (rounds * 5)
+
+
+def monthlyShifts(state, rounds):
+    month = state["month"]
+    jobs = []
+    for manager in state["managers"]:
+        paths = [f"/api/attendance/getMonthlyShifts/{month}"]
+        if state["aggregations"]:
+            paths.append(f"/api/attendance/getMonthlySummary/{month}")
+        jobs.append(lambda runner, manager=manager, paths=paths: [runner.send("GET", path, manager) for path in paths])
+    for session in state["employees"]:
+        jobs.append(lambda runner, session=session: [
+            runner.send("GET", f"/api/attendance/schedule/{session.id}?month={month}", session),
+        ])
+    return jobs * rounds
+
+
+def leaveApprovals(state, rounds):
+    def review(runner, reviewer):
+        response, duration = runner.send("GET", "/api/annualRequest/list-manager?status=pending&limit=100", reviewer)
+        measured = [(response, duration)]
+        for request in (response.get_json(silent=True) or {}).get("data") or []:
+            measured.append(runner.send("PUT", f"/api/annualRequest/approve/{request['_id']}", reviewer, json={"note": "Approved"}))
+        return measured
+    # manager meng-approve cuti karyawan cabangnya, owner meng-approve cuti manager
+    reviewers = state["managers"] + [state["owner"]]
+    return [lambda runner, reviewer=reviewer: review(runner, reviewer) for reviewer in reviewers]
+
+
+SCENARIOS = {
+    "login-storm": loginStorm,
+    "clock-in-burst": clockInBurst,
+    "owner-dashboard": ownerDashboard,
+    "monthly-shifts": monthlyShifts,
+    "leave-approvals": leaveApprovals,
+}
+
+
+def loadBaseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def report(results, out=sys.stdout):
+    out.write(f"{'scenario':<18}{'requests':>9}{'errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}\n")
+    for name, result in results.items():
+        out.write(
+            f"{name:<18}{result['requests']:>9}{result['errorRate']:>9.1%}{result['p50']:>10.2f}"
+            f"{result['p95']:>10.2f}{result['p99']:>10.2f}{result['throughput']:>10.1f}\n"
+        )
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.benchmark", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI"), help="MongoDB lokal; default mongomock in-memory")
+    parser.add_argument("--database", default=BENCH_DATABASE, help="Database benchmark (di-drop sebelum dan sesudah run)")
+    parser.add_argument("--branches", type=int, default=3)
+    parser.add_argument("--employees", type=int, default=20, help="Karyawan per branch")
+    parser.add_argument("--concurrency", type=int, default=8, help="Jumlah thread client")
+    parser.add_argument("--rounds", type=int, default=3, help="Pengulangan skenario yang bisa diulang")
+    parser.add_argument("--clock-burst-mode", action="store_true", help="Clock in lewat write-ahead log (selalu aktif di mongomock)")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah run (database baru tiap run); dilaporkan median")
+    parser.add_argument("--bcrypt-rounds", type=int, default=int(os.getenv("BENCH_BCRYPT_ROUNDS", 4)))
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Hanya jalankan skenario ini (boleh berulang)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Kenaikan relatif yang masih diterima (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Tulis hasil run ini sebagai baseline backend yang dipakai")
+    parser.add_argument("--output", help="Simpan hasil run ke file JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    db = configure(args)
+    from main import app
+
+    if not args.mongo_uri:
+        # mongomock tidak mendukung arrayFilters, jadi event tidak bisa diterapkan ke
+        # attendances; yang diukur jalur request mode burst (cek lokasi + append log)
+        from utils.clockLog import clockEventLog
+        clockEventLog.applyBatch = lambda events: None
+
+    from utils.clockLog import clockEventLog
+    from utils.historyWriter import historyWriter
+
+    backend = "mongodb" if args.mongo_uri else "mongomock"
+    runner = Runner(app, args.concurrency)
+    errorLog = ErrorLog()
+    logging.getLogger().addHandler(errorLog)
+    runs = []
+    try:
+        for _ in range(args.repeat):
+            reset(db, indexes=bool(args.mongo_uri))
+            state = seed(db, runner, args.branches, args.employees)
+            # summary lewat aggregation hanya diukur di MongoDB sungguhan (lihat docstring module)
+            state["aggregations"] = bool(args.mongo_uri)
+            if not args.mongo_uri:
+                plainDatetimes(db)
+            runs.append({name: runner.run(SCENARIOS[name](state, args.rounds)) for name in args.scenario or SCENARIOS})
+            # tulis sisa antrian background sebelum database dikosongkan, supaya error-nya ikut terhitung
+            historyWriter.flush()
+            try:
+                clockEventLog.drain()
+            except Exception as e:
+                clockEventLog.failed += 1
+                errorLog.messages.append(f"utils.clockLog: Failed to apply clock events: {e}")
+    finally:
+        logging.getLogger().removeHandler(errorLog)
+        if args.mongo_uri:
+            db.client.drop_database(args.database)
+    results = combine(runs)
+    settings = {
+        "branches": args.branches, "employees": args.employees, "concurrency": args.concurrency,
+        "rounds": args.rounds, "bcryptRounds": args.bcrypt_rounds,
+        "clockBurstMode": args.clock_burst_mode or not args.mongo_uri,
+    }
+
+    print(f"backend={backend} repeat={args.repeat} " + " ".join(f"{key}={value}" for key, value in settings.items()))
+    report(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"backend": backend, "settings": settings, "scenarios": results}, file, indent=2)
+
+    problems = backgroundErrors(errorLog.messages, {
+        "history writer": historyWriter.failed,
+        "clock event log": clockEventLog.failed,
+    })
+    if problems:
+        print("\nBACKGROUND ERRORS during the run; results are not comparable and the baseline was not checked or written:", file=sys.stderr)
+        for line in problems:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+
+    baseline = loadBaseline(args.baseline)
+    recorded = baseline.get(backend)
+    if args.update_baseline:
+        if recorded is None or recorded["settings"] != settings:
+            recorded = baseline[backend] = {"settings": settings, "scenarios": {}}
+        recorded["scenarios"].update(combine(runs, worst=True))
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2)
+            file.write("\n")
+        print(f"Baseline for {backend} written to {args.baseline}")
+        return 0
+    if recorded is None:
+        print(f"No {backend} baseline in {args.baseline}; run with --update-baseline to create one")
+        return 0
+    if recorded["settings"] != settings:
+        print(f"\nBaseline {backend} in {args.baseline} was recorded with {recorded['settings']}; "
+              f"rerun with those settings or --update-baseline", file=sys.stderr)
+        return 2
+    expected = {name: value for name, value in recorded["scenarios"].items() if name in results}
+    regressions = compare(results, expected, args.tolerance)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION against {args.baseline} ({backend}, tolerance {args.tolerance:.0%}):", file=sys.stderr)
+        for line in regressions:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+    print(f"\nNo regression against {backend} baseline (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
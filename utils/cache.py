@@ -0,0 +1,68 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Cache in-process sederhana (LRU + TTL) yang thread-safe.
+
+    Dipakai untuk data yang sering dibaca tapi jarang berubah, supaya request
+    tidak perlu bolak-balik ke MongoDB. Entry otomatis dianggap basi setelah
+    `ttl` detik, dan entry paling lama tidak dipakai dibuang kalau jumlahnya
+    melewati `maxsize`.
+
+    Usage Example:
+        cache = TTLCache(maxsize=1000, ttl=30)
+        cache.set("key", {"status": True})
+        cache.get("key")        # -> {"status": True}
+        cache.delete("key")
+        cache.clear()
+    """
+    _MISSING = object()
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+            value, expiresAt = entry
+            if expiresAt <= time.monotonic():
+                del self.data[key]
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expiresAt = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.data[key] = (value, expiresAt)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, self._MISSING) is not self._MISSING
+
+    def __len__(self):
+        with self.lock:
+            return len(self.data)
@@ -0,0 +1,203 @@
+from utils.config import Config
+import atexit
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ClockEventLog:
+    """
+    Write-ahead log lokal untuk clock in saat burst (CLOCK_BURST_MODE).
+
+    Saat jam mulai shift, hampir semua karyawan clock in dalam jendela yang
+    sama. Di mode ini request clock in cukup divalidasi, diberi timestamp
+    server saat diterima, lalu ditulis (append + fsync) ke file JSON lines.
+    Response dikirim setelah event tersimpan di disk, jadi latency request
+    bergantung pada biaya append, bukan latency write ke MongoDB.
+
+    Background thread membaca file dari offset terakhir yang sudah diterapkan,
+    menulis event ke collection `attendances` per batch (satu bulk_write),
+    lalu menyimpan offset baru di file `<path>.offset`. Kalau proses mati,
+    event yang belum diterapkan dibaca ulang saat start berikutnya; update
+    clock in hanya berlaku untuk entry yang `clockIn`-nya masih kosong, jadi
+    replay aman (idempotent).
+
+    Notes:
+        - File log hanya boleh dipakai satu proses (gunicorn --workers 1).
+        - Durability sebatas disk tempat `path` berada; di container dengan
+          filesystem sementara, arahkan CLOCK_WAL_PATH ke volume persisten.
+        - Setelah semua event diterapkan, file log dan offset dikosongkan.
+        - `applyBatch(events)` di-set saat aplikasi start (main.py) ke
+          AttendanceService.applyClockEvents.
+    """
+
+    def __init__(self, path=None, applyBatch=None, batchSize=None, flushInterval=None, fsync=None):
+        self.path = path or Config.CLOCK_WAL_PATH
+        self.offsetPath = self.path + ".offset"
+        self.applyBatch = applyBatch
+        self.batchSize = batchSize or Config.CLOCK_WAL_BATCH_SIZE
+        self.flushInterval = flushInterval or Config.CLOCK_WAL_FLUSH_INTERVAL
+        self.fsync = Config.CLOCK_WAL_FSYNC if fsync is None else fsync
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.file = None
+        self.pid = None
+        self.applied = 0
+        self.failed = 0
+
+    def open(self):
+        if self.file is None or self.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, "ab")
+            self.pid = os.getpid()
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive() and self.pid == os.getpid():
+            return
+        with self.lock:
+            self.open()
+            if self.thread is None or not self.thread.is_alive() or self.pid != os.getpid():
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self.run, name="clock-event-log", daemon=True)
+                self.thread.start()
+
+    def append(self, event):
+        """
+        Simpan satu event secara durable lalu bangunkan worker.
+
+        Returns:
+            int: Jumlah byte yang ditulis
+        """
+        self.start()
+        line = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode()
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+        self.wakeup.set()
+        return len(line)
+
+    def readOffset(self):
+        try:
+            with open(self.offsetPath) as f:
+                offset = int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        # offset melewati ukuran log = log sudah dikosongkan/diganti; baca ulang dari awal
+        return offset if offset <= size else 0
+
+    def writeOffset(self, offset):
+        tmp = self.offsetPath + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.offsetPath)
+
+    def readBatch(self, offset):
+        """Baca sampai `batchSize` event lengkap mulai dari `offset`."""
+        events = []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                while len(events) < self.batchSize:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        break  # baris terakhir belum selesai ditulis
+                    offset += len(line)
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        logger.error("Skipping corrupt clock event at offset %s", offset - len(line))
+        except FileNotFoundError:
+            pass
+        return events, offset
+
+    def compact(self, offset):
+        """
+        Kosongkan log kalau semua event sudah diterapkan.
+
+        Offset 0 ditulis dulu baru log dikosongkan: kalau proses mati di
+        antaranya, semua event diterapkan ulang (idempotent), tidak ada yang
+        terlewat karena offset lama menunjuk ke tengah log baru.
+        """
+        with self.lock:
+            if self.file is not None and os.path.getsize(self.path) == offset:
+                self.writeOffset(0)
+                self.file.truncate(0)
+                return True
+        return False
+
+    def drain(self):
+        """
+        Terapkan semua event yang belum diterapkan (synchronous).
+
+        Returns:
+            int: Jumlah event yang diterapkan
+        """
+        total = 0
+        offset = self.readOffset()
+        while True:
+            events, nextOffset = self.readBatch(offset)
+            if nextOffset == offset:
+                break
+            if events:
+                if self.applyBatch is None:
+                    raise Exception("No clock event handler registered")
+                self.applyBatch(events)
+                total += len(events)
+            self.writeOffset(nextOffset)
+            offset = nextOffset
+        if total:
+            self.applied += total
+        self.compact(offset)
+        return total
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.wakeup.wait(self.flushInterval)
+            self.wakeup.clear()
+            try:
+                self.drain()
+            except Exception as e:
+                # event tetap di log (offset tidak maju), dicoba lagi di putaran berikutnya
+                self.failed += 1
+                logger.error("Failed to apply clock events: %s", e)
+                self.stopped.wait(self.flushInterval)
+
+    def pending(self):
+        """Jumlah byte log yang belum diterapkan ke database."""
+        try:
+            return max(os.path.getsize(self.path) - self.readOffset(), 0)
+        except FileNotFoundError:
+            return 0
+
+    def close(self, timeout=5):
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout)
+        if self.file is not None and self.pid == os.getpid():
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error("Failed to drain clock events on exit, replayed on next start: %s", e)
+            self.file.close()
+            self.file = None
+
+
+clockEventLog = ClockEventLog()
+atexit.register(clockEventLog.close)
@@ -0,0 +1,30 @@
+"""
+Helper geospasial (jarak di permukaan bumi).
+
+Koordinat mengikuti urutan GeoJSON: [longitude, latitude].
+"""
+import math
+
+# radius bumi yang sama dengan yang dipakai MongoDB untuk $nearSphere/$maxDistance (meter)
+EARTH_RADIUS_METERS = 6378100
+
+
+def haversine(a, b):
+    """
+    Jarak great-circle antara dua titik dalam meter.
+
+    Args:
+        a (list): [longitude, latitude]
+        b (list): [longitude, latitude]
+
+    Returns:
+        float: Jarak dalam meter
+
+    Example:
+        >>> round(haversine([110.3695, -7.7956], [110.3695, -7.7960]))
+        45
+    """
+    lon1, lat1 = map(math.radians, a)
+    lon2, lat2 = map(math.radians, b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(h)))
@@ -0,0 +1,138 @@
+from repo.historyRepo import HistoryRepo
+from utils.config import Config
+from pymongo.errors import BulkWriteError
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    """
+    Penulis history (audit log) yang berjalan di background thread.
+
+    Entry history yang sudah divalidasi dimasukkan ke antrian in-memory lalu
+    ditulis ke collection `histories` per batch dengan insert_many(ordered=False),
+    jadi request user tidak perlu menunggu insert ke database.
+
+    Aturan flush:
+        - Batch ditulis saat jumlahnya mencapai `batchSize`, atau
+        - `flushInterval` detik setelah entry pertama batch masuk, atau
+        - Saat proses berhenti (atexit) / close() dipanggil.
+
+    Backpressure:
+        Antrian dibatasi `maxQueue`. Kalau penuh, put() menunggu paling lama
+        `putTimeout` detik, lalu entry ditulis langsung (synchronous) supaya
+        tidak ada history yang hilang dan producer otomatis melambat.
+    """
+
+    def __init__(self, repo=None, batchSize=None, flushInterval=None, maxQueue=None, putTimeout=None):
+        self.repo = repo
+        self.batchSize = batchSize or Config.HISTORY_BATCH_SIZE
+        self.flushInterval = flushInterval or Config.HISTORY_FLUSH_INTERVAL
+        self.maxQueue = maxQueue or Config.HISTORY_QUEUE_SIZE
+        self.putTimeout = Config.HISTORY_PUT_TIMEOUT if putTimeout is None else putTimeout
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.queue = queue.Queue(maxsize=self.maxQueue)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.pid = os.getpid()
+        self.written = 0
+        self.failed = 0
+
+    def getRepo(self):
+        if self.repo is None:
+            self.repo = HistoryRepo()
+        return self.repo
+
+    def start(self):
+        # thread tidak ikut ter-copy saat fork, jadi child bikin antrian + thread sendiri
+        if self.pid != os.getpid():
+            self.reset()
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self.run, name="history-writer", daemon=True)
+                self.thread.start()
+
+    def put(self, data):
+        self.start()
+        try:
+            self.queue.put(data, timeout=self.putTimeout)
+        except queue.Full:
+            logger.warning("History queue full, writing entry synchronously")
+            self.write([data])
+
+    def run(self):
+        while not self.stopped.is_set():
+            batch = self.collect()
+            if batch:
+                self.write(batch)
+
+    def collect(self):
+        batch = []
+        deadline = None
+        while len(batch) < self.batchSize:
+            timeout = self.flushInterval if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if deadline is None:
+                deadline = time.monotonic() + self.flushInterval
+            batch.append(item)
+        return batch
+
+    def write(self, batch):
+        # langsung ke collection: BaseRepo.insertData membungkus BulkWriteError jadi
+        # TypeError, padahal detail writeErrors dibutuhkan untuk menghitung yang gagal
+        try:
+            self.getRepo().collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except BulkWriteError as e:
+            # ordered=False: dokumen lain di batch tetap masuk, hanya writeErrors yang gagal
+            failed = len(e.details.get("writeErrors", []))
+            self.written += len(batch) - failed
+            self.failed += failed
+            logger.error("Failed to write %s of %s history entries: %s", failed, len(batch), e)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error("Failed to write %s history entries: %s", len(batch), e)
+
+    def flush(self):
+        """Tulis semua entry yang masih ada di antrian (synchronous)."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batchSize:
+                self.write(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    def close(self, timeout=5):
+        self.stopped.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout)
+        self.flush()
+
+
+historyWriter = HistoryWriter()
+atexit.register(historyWriter.close)
@@ -0,0 +1,101 @@
+"""
+Bootstrap index MongoDB untuk semua repository.
+
+Index tiap collection dideklarasikan di atribut `indexes` masing-masing repo.
+Module ini membuat semuanya secara idempotent (index yang sudah ada dilewati
+oleh MongoDB), dan menyediakan helper untuk mendeteksi query yang jatuh ke
+COLLSCAN lewat explain().
+
+Usage:
+    python -m utils.indexes
+"""
+from repo.EmployeeRepo import EmployeeRepo
+from repo.attendanceRepo import AttendanceRepo
+from repo.employeeScheduleRepo import EmployeeScheduleRepo
+from repo.historyRepo import HistoryRepo
+from repo.leaveRequestRepo import LeaveRequestRepo
+from repo.sessionRepo import SessionRepo
+from repo.shiftsRepo import ShiftsRepo
+from repo.slowQueryRepo import SlowQueryRepo
+from repo.storeRepo import StoreRepo
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+REPOSITORIES = [
+    EmployeeRepo,
+    AttendanceRepo,
+    EmployeeScheduleRepo,
+    HistoryRepo,
+    LeaveRequestRepo,
+    SessionRepo,
+    ShiftsRepo,
+    SlowQueryRepo,
+    StoreRepo,
+]
+
+
+def ensureAllIndexes(repositories=None):
+    """
+    Buat semua index yang dideklarasikan repo.
+
+    Returns:
+        dict: {nama collection: [nama index]}
+    """
+    created = {}
+    for repoClass in repositories or REPOSITORIES:
+        repo = repoClass()
+        created[repo.collection.name] = repo.ensureIndexes()
+        logger.info("Indexes ensured for %s: %s", repo.collection.name, created[repo.collection.name])
+    return created
+
+
+def planStages(explain):
+    """Kumpulkan semua `stage` dari winning plan hasil explain()."""
+    planner = explain.get("queryPlanner", explain)
+    plan = planner.get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)  # format slot-based engine (MongoDB 7+)
+    stages = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "inputStage" in node:
+            nodes.append(node["inputStage"])
+        nodes.extend(node.get("inputStages", []))
+    return stages
+
+
+def isCollscan(explain):
+    return "COLLSCAN" in planStages(explain)
+
+
+def findCollscans(repo, queries):
+    """
+    Jalankan explain() untuk setiap query dan kembalikan yang jatuh ke COLLSCAN.
+
+    Args:
+        repo (BaseRepo): Repository tujuan
+        queries (list): List tuple (query, sort) atau dict query
+
+    Returns:
+        list: Query yang winning plan-nya COLLSCAN
+    """
+    collscans = []
+    for item in queries:
+        query, sort = item if isinstance(item, tuple) else (item, None)
+        if isCollscan(repo.explainData(query, sort=sort)):
+            collscans.append(query)
+    return collscans
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        for collection, names in ensureAllIndexes().items():
+            print(f"{collection}: {', '.join(names) if names else '-'}")
+    except Exception as e:
+        print("Failed to ensure indexes", e)
+        sys.exit(1)
@@ -1,8 +1,21 @@
 import jwt
+from flask import g, request, jsonify, make_response, redirect
+from functools import wraps
 from repo.sessionRepo import SessionRepo
 from datetime import timedelta, datetime
 from utils.config import Config
+from utils.cache import TTLCache
+import hashlib
 import pendulum
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# status session per token (True = aktif, False = sudah logout / tidak ada di DB).
+# Tiap worker punya cache sendiri; revoke dari worker lain paling lambat terlihat
+# setelah SESSION_CACHE_TTL detik.
+sessionCache = TTLCache(maxsize=Config.SESSION_CACHE_SIZE, ttl=Config.SESSION_CACHE_TTL)
 
 
 class SessionService:
@@ -14,6 +27,26 @@ class SessionService:
     def __init__(self):
         """Inisialisasi service dengan repository session untuk koneksi ke database."""
         self.repo = SessionRepo()
+
+    @staticmethod
+    def cacheKey(token, payload=None):
+        """Key cache session: claim `jti` kalau ada, kalau tidak hash sha256 dari token."""
+        if payload and payload.get("jti"):
+            return payload["jti"]
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def isSessionActive(self, token, payload):
+        """
+        Cek apakah session token masih aktif (belum logout).
+
+        Hasil dicek dulu di cache in-process; database hanya di-query saat cache miss.
+        """
+        key = self.cacheKey(token, payload)
+        active = sessionCache.get(key)
+        if active is None:
+            active = self.repo.getData(query={"token": token}, projection={"_id": 1}) is not None
+            sessionCache.set(key, active)
+        return active
         
     def createToken(self, data):
         """
@@ -55,6 +88,7 @@ class SessionService:
                 "name": data["name"],
                 "role": data["role"],
                 "_id": data["_id"],
+                "jti": uuid.uuid4().hex,
                 "iat": now,
                 "exp": now + pendulum.duration(hours=8),
             }
@@ -68,6 +102,7 @@ class SessionService:
                 "name": data["name"],
                 "role": data["role"],
                 "token": token,
+                "jti": payload["jti"],
                 "iat": now,
                 "exp": now + pendulum.duration(hours=8),
             }   
@@ -76,6 +111,7 @@ class SessionService:
             if not insert:
                 raise Exception("Failed to create token")
 
+            sessionCache.set(payload["jti"], True)
             return token
         except Exception as e:
             raise Exception(f"Failed to create token: {e}")
@@ -84,6 +120,9 @@ class SessionService:
         """
         Memvalidasi token JWT dari request (biasanya dari cookie).
 
+        Signature HS256 dan expiry dicek lokal lewat jwt.decode. Status logout
+        (revoke) dicek lewat sessionCache, database hanya di-query saat cache miss.
+
         Args:
             token (str): Token JWT yang akan divalidasi.
 
@@ -111,15 +150,14 @@ class SessionService:
         Exception: Token not valid
         """
         try:
-            token_data = self.repo.getData(query={"token": token})
-            if token_data is None:
+            validate = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"], )
+            if not self.isSessionActive(token, validate):
                 return {"status": False, "message": "Token not found"}
 
-            validate = jwt.decode(token_data["token"], Config.JWT_SECRET_KEY, algorithms=["HS256"], )
             return {"status": True, "message": "Token valid", "data": validate}
         except jwt.ExpiredSignatureError:
             self.deleteToken(token)
-            print("Token expired")
+            logger.debug("Token expired")
             raise jwt.ExpiredSignatureError("Token expired")
         except jwt.InvalidTokenError:
             raise jwt.InvalidTokenError("Invalid token")
@@ -148,6 +186,11 @@ class SessionService:
         Exception: Failed to delete token
         """
         try:
+            try:
+                payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"], options={"verify_exp": False})
+            except jwt.InvalidTokenError:
+                payload = None
+            sessionCache.set(self.cacheKey(token, payload), False)
             delete = self.repo.deleteData(query={"token": token})
             if not delete.acknowledged:
                 raise Exception("Failed to delete token")
@@ -185,14 +228,28 @@ class SessionService:
         Exception: Token expired
         Exception: Invalid token
         """
+        currentUser = self.resolveToken(token)
+        if currentUser["status"] == False:
+            return currentUser
+        if currentUser["data"]["role"] not in accessRole:
+            return {"status": False, "message": "Forbidden"}
+        return currentUser
+
+    def resolveToken(self, token=None):
+        """
+        Validasi token tanpa cek role; dipakai checkAccess dan hook per request.
+
+        Returns:
+            dict: {"status": True, "message": "Success", "data": payload} atau
+                {"status": False, "message": "..."} jika token kosong / tidak valid.
+        """
         try:
             if token is None:
                 return {"status": False, "message": "No token found"}
 
-
             currentUser = self.validateToken(token)
-            if currentUser["data"]["role"] not in accessRole:
-                return {"status": False, "message": "Forbidden"}
+            if currentUser["status"] == False:
+                return currentUser
             response = {
                 "status": True,
                 "message": "Success",
@@ -200,10 +257,79 @@ class SessionService:
             }
             return response
         except jwt.ExpiredSignatureError:
-            self.deleteToken(token)
             return {"status": False, "message": "Token expired"}
         except jwt.InvalidTokenError:
             return {"status": False, "message": "Invalid token"}
         except Exception as e:
-            print("AUTH ERROR:", e)
+            logger.error("AUTH ERROR: %s", e)
             return {"status": False, "message": "Invalid token"}
+
+
+# satu SessionService per proses untuk resolve token per request; dibuat saat
+# pertama dipakai supaya import route tidak langsung membuka koneksi database.
+sessionService = None
+
+
+def getSessionService():
+    global sessionService
+    if sessionService is None:
+        sessionService = SessionService()
+    return sessionService
+
+
+def loadCurrentUser():
+    """
+    Hook `before_request`: resolve cookie `token` sekali per request ke `g.auth`.
+
+    Route (lewat require_roles) dan kode lain di request yang sama membaca
+    hasilnya dari `g`, jadi token hanya divalidasi satu kali per request.
+    """
+    if request.endpoint == "static":
+        return
+    currentAuth()
+
+
+def currentAuth():
+    """
+    Hasil resolve token request saat ini (dimemo di `g.auth`).
+
+    Returns:
+        dict: Sama dengan SessionService.resolveToken
+    """
+    if "auth" not in g:
+        g.auth = getSessionService().resolveToken(request.cookies.get("token"))
+    return g.auth
+
+
+def getCurrentUser():
+    """Payload JWT user yang login di request ini, atau None."""
+    auth = currentAuth()
+    return auth["data"] if auth["status"] else None
+
+
+def require_roles(*roles, redirectTo=None):
+    """
+    Decorator route: tolak request jika user tidak login atau role-nya tidak diizinkan.
+
+    Args:
+        *roles (str): Role yang diizinkan, misal "owner", "manager"
+        redirectTo (str, optional): Untuk halaman HTML, redirect ke URL ini
+            saat ditolak. Default response JSON 403 seperti endpoint API.
+
+    Example:
+        @attendanceBp.route("/clockIn", methods=["POST"])
+        @require_roles("employee", "manager")
+        def attendanceClockIn():
+            currentUser = getCurrentUser()
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            currentUser = getCurrentUser()
+            if currentUser is None or currentUser.get("role") not in roles:
+                if redirectTo:
+                    return redirect(redirectTo)
+                return make_response(jsonify({"status": False, "message": "You don't have access"}), 403)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,161 @@
+"""
+Setup logging aplikasi: level per module, output JSON satu baris untuk
+Cloud Logging, dan penulisan log di luar thread yang melayani request.
+
+Pipeline:
+    logger.debug(...) -> AsyncQueueHandler (root) -> antrian in-memory
+    -> QueueListener (thread sendiri) -> StreamHandler(stdout)
+
+Thread request hanya menyusun pesan dan memasukkannya ke antrian; write ke
+stdout (yang bisa blocking saat Cloud Run menahan pipe log) dilakukan
+listener. Di bawah eventlet listener memakai native thread (bukan green
+thread), jadi write ke stdout juga tidak memblokir hub.
+
+Level:
+    LOG_LEVEL  -> level default (root), misal INFO
+    LOG_LEVELS -> override per module, misal
+                  "service.attendanceService=DEBUG,repo=WARNING"
+
+Pesan selalu pakai argumen gaya %-format:
+
+    logger.debug("shifts = %s", shifts)
+
+Selama DEBUG tidak aktif untuk module tersebut, dokumen tidak pernah
+diubah ke string sama sekali. Kalau aktif, pesan dipotong sampai
+LOG_PAYLOAD_LIMIT karakter.
+"""
+from logging.handlers import QueueHandler, QueueListener
+from utils.config import Config
+import atexit
+import json
+import logging
+import queue
+import sys
+
+listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu baris JSON per log; field `severity` dan `message` dibaca Cloud Logging."""
+
+    def format(self, record):
+        entry = {
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+        }
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler yang memotong pesan panjang dan membuang log saat antrian
+    penuh (tidak pernah memblokir request).
+    """
+
+    def __init__(self, queue, payloadLimit=None):
+        super().__init__(queue)
+        self.payloadLimit = payloadLimit or Config.LOG_PAYLOAD_LIMIT
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if len(record.msg) > self.payloadLimit:
+            record.msg = record.msg[:self.payloadLimit] + f"... ({len(record.msg)} chars)"
+            record.message = record.msg
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Exception:
+            # antrian penuh (class Full beda antara queue asli dan yang di-patch eventlet)
+            self.dropped += 1
+
+
+class ThreadQueueListener(QueueListener):
+    """QueueListener dengan class Thread yang bisa dipilih (native thread di bawah eventlet)."""
+
+    def __init__(self, queue, *handlers, threadClass=None):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.threadClass = threadClass
+
+    def start(self):
+        if self.threadClass is None:
+            return super().start()
+        self._thread = self.threadClass(target=self._monitor, name="log-listener", daemon=True)
+        self._thread.start()
+
+
+def parseLevels(spec):
+    """
+    Parse LOG_LEVELS.
+
+    Example:
+        >>> parseLevels("repo=WARNING, service.attendanceService=debug")
+        {'repo': 'WARNING', 'service.attendanceService': 'DEBUG'}
+    """
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def nativeThreading():
+    """Module threading & queue asli (tidak di-monkey patch eventlet)."""
+    from utils.passwords import isGreen
+    if isGreen():
+        from eventlet import patcher
+        return patcher.original("threading"), patcher.original("queue")
+    return None, queue
+
+
+def setupLogging(level=None, levels=None, stream=None):
+    """
+    Pasang pipeline logging di root logger. Aman dipanggil lebih dari sekali;
+    listener lama dihentikan dulu.
+
+    Args:
+        level (str, optional): Level default, default Config.LOG_LEVEL
+        levels (dict, optional): Level per module, default dari Config.LOG_LEVELS
+        stream (file, optional): Tujuan output, default sys.stdout
+
+    Returns:
+        AsyncQueueHandler: Handler yang dipasang di root logger
+    """
+    global listener
+    stopLogging()
+
+    threading, queueModule = nativeThreading()
+    logQueue = queueModule.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if Config.LOG_FORMAT == "json" else logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    handler = AsyncQueueHandler(logQueue)
+
+    root = logging.getLogger()
+    for old in [h for h in root.handlers if isinstance(h, AsyncQueueHandler)]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+    for name, moduleLevel in (levels if levels is not None else parseLevels(Config.LOG_LEVELS)).items():
+        logging.getLogger(name).setLevel(moduleLevel)
+
+    listener = ThreadQueueListener(logQueue, output, threadClass=threading.Thread if threading else None)
+    listener.start()
+    return handler
+
+
+def stopLogging():
+    """Tulis sisa log di antrian lalu hentikan listener."""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+atexit.register(stopLogging)
@@ -0,0 +1,243 @@
+"""
+Metrics in-process dengan format teks Prometheus (exposition format 0.0.4).
+
+Tidak butuh collector eksternal: nilai disimpan di memori proses dan
+di-render saat GET /metrics (routes/metricsRoutes.py). Biaya per request /
+per command MongoDB hanya satu lock + bisect ke daftar bucket.
+
+Yang dicatat:
+    - http_request_duration_seconds   histogram per endpoint blueprint, method, status
+    - http_requests_in_flight         gauge per endpoint
+    - mongodb_command_duration_seconds histogram per collection, command, outcome
+      (dari pymongo CommandListener yang dipasang di MongoClient bersama)
+    - cache_hits_total / cache_misses_total / cache_entries untuk TTLCache
+    - kedalaman antrian background (history writer, clock event log, log)
+
+Usage:
+    from utils.metrics import initMetrics
+    initMetrics(app)
+"""
+from flask import g, request
+from pymongo import monitoring
+import bisect
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def formatLabels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """Histogram dengan bucket tetap, satu seri per kombinasi label."""
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labelValues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labelValues)
+            if series is None:
+                series = self.series[labelValues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labelValues):
+        with self.lock:
+            series = self.series.get(labelValues)
+            return sum(series[0]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self.series.items()]
+        for labelValues, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{formatLabels(self.labels + ('le',), labelValues + (le,))} {cumulative}")
+            labels = formatLabels(self.labels, labelValues)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge naik/turun per kombinasi label."""
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labelValues, amount=1):
+        with self.lock:
+            self.values[labelValues] = self.values.get(labelValues, 0) + amount
+
+    def dec(self, *labelValues):
+        self.inc(*labelValues, amount=-1)
+
+    def value(self, *labelValues):
+        with self.lock:
+            return self.values.get(labelValues, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self.lock:
+            snapshot = sorted(self.values.items())
+        for labelValues, value in snapshot:
+            lines.append(f"{self.name}{formatLabels(self.labels, labelValues)} {value}")
+        return lines
+
+
+requestLatency = Histogram(
+    "http_request_duration_seconds", "Request latency per endpoint.",
+    labels=("endpoint", "method", "status"),
+)
+requestsInFlight = Gauge("http_requests_in_flight", "Requests being served per endpoint.", labels=("endpoint",))
+mongoLatency = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency per collection and command.",
+    labels=("collection", "command", "outcome"), buckets=MONGO_BUCKETS,
+)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    CommandListener pymongo: durasi tiap command dicatat per collection.
+
+    Nama collection hanya ada di event `started` (command[commandName]),
+    jadi disimpan sementara per request id sampai event succeeded/failed.
+    """
+
+    def __init__(self, histogram=None):
+        self.histogram = histogram or mongoLatency
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(event):
+        return (event.request_id, event.operation_id, event.connection_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = "-"  # command admin (ping, hello, endSessions, ...)
+        with self.lock:
+            self.pending[self.key(event)] = collection
+
+    def finish(self, event, outcome):
+        with self.lock:
+            collection = self.pending.pop(self.key(event), "-")
+        self.histogram.observe(event.duration_micros / 1e6, collection, event.command_name, outcome)
+
+    def succeeded(self, event):
+        self.finish(event, "success")
+
+    def failed(self, event):
+        self.finish(event, "failure")
+
+
+commandMetrics = CommandMetrics()
+
+
+def beforeRequest():
+    g.metricsStart = time.perf_counter()
+    g.metricsEndpoint = request.endpoint or "unmatched"
+    requestsInFlight.inc(g.metricsEndpoint)
+
+
+def afterRequest(response):
+    g.metricsStatus = response.status_code
+    return response
+
+
+def teardownRequest(error=None):
+    start = g.pop("metricsStart", None)
+    if start is None:
+        return
+    endpoint = g.pop("metricsEndpoint")
+    status = g.pop("metricsStatus", 500)
+    requestsInFlight.dec(endpoint)
+    requestLatency.observe(time.perf_counter() - start, endpoint, request.method, str(status))
+
+
+def initMetrics(app):
+    """Pasang hook pengukuran request di app Flask."""
+    app.before_request(beforeRequest)
+    app.after_request(afterRequest)
+    app.teardown_request(teardownRequest)
+
+
+def componentLines():
+    """Cache hit/miss dan kedalaman antrian komponen yang ada di proses ini."""
+    from repo.shiftsRepo import shiftCache
+    from repo.storeRepo import geofenceCache
+    from utils.clockLog import clockEventLog
+    from utils.historyWriter import historyWriter
+    from utils.jwtHandler import sessionCache
+    from utils.logger import AsyncQueueHandler
+    from utils.slowQuery import slowQueryLog
+    import logging
+
+    caches = {"session": sessionCache, "shift": shiftCache, "geofence": geofenceCache}
+    lines = ["# HELP cache_hits_total Cache hits.", "# TYPE cache_hits_total counter"]
+    lines += [f'cache_hits_total{{cache="{name}"}} {cache.hits}' for name, cache in caches.items()]
+    lines += ["# HELP cache_misses_total Cache misses.", "# TYPE cache_misses_total counter"]
+    lines += [f'cache_misses_total{{cache="{name}"}} {cache.misses}' for name, cache in caches.items()]
+    lines += ["# HELP cache_entries Entries currently cached.", "# TYPE cache_entries gauge"]
+    lines += [f'cache_entries{{cache="{name}"}} {len(cache)}' for name, cache in caches.items()]
+
+    logHandlers = [h for h in logging.getLogger().handlers if isinstance(h, AsyncQueueHandler)]
+    lines += [
+        "# HELP history_writer_queue_depth History entries waiting to be written.",
+        "# TYPE history_writer_queue_depth gauge",
+        f"history_writer_queue_depth {historyWriter.qsize()}",
+        "# HELP clock_event_log_pending_bytes Clock event log bytes not yet applied to MongoDB.",
+        "# TYPE clock_event_log_pending_bytes gauge",
+        f"clock_event_log_pending_bytes {clockEventLog.pending()}",
+        "# HELP log_queue_depth Log records waiting for the listener.",
+        "# TYPE log_queue_depth gauge",
+        f"log_queue_depth {sum(h.queue.qsize() for h in logHandlers)}",
+        "# HELP log_records_dropped_total Log records dropped because the queue was full.",
+        "# TYPE log_records_dropped_total counter",
+        f"log_records_dropped_total {sum(h.dropped for h in logHandlers)}",
+        "# HELP slow_queries_recorded_total Commands slower than SLOW_QUERY_MS written to the slow query log.",
+        "# TYPE slow_queries_recorded_total counter",
+        f"slow_queries_recorded_total {slowQueryLog.recorded}",
+        "# HELP slow_queries_dropped_total Slow query records dropped because the queue was full.",
+        "# TYPE slow_queries_dropped_total counter",
+        f"slow_queries_dropped_total {slowQueryLog.dropped}",
+    ]
+    return lines
+
+
+def render():
+    """
+    Semua metrics dalam format teks Prometheus.
+
+    Returns:
+        str: Body response GET /metrics
+    """
+    lines = []
+    for metric in (requestLatency, requestsInFlight, mongoLatency):
+        lines += metric.render()
+    lines += componentLines()
+    return "\n".join(lines) + "\n"
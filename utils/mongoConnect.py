@@ -1,9 +1,30 @@
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
 from utils.config import Config
+from utils.metrics import commandMetrics
+from utils.slowQuery import slowQueryListener
 import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
 
 class mongoConnection :
+    """
+    Wrapper koneksi MongoDB.
+
+    MongoClient cuma dibuat SEKALI per proses (lazy, saat collection pertama diminta)
+    lalu dipakai bareng oleh semua repository. MongoClient sendiri sudah punya
+    connection pool + thread-safe, jadi bikin client baru per repo/request cuma
+    nambah latency (handshake + ping) tanpa manfaat.
+
+    Setelah fork (misal worker gunicorn), client milik parent tidak boleh dipakai
+    di child, jadi client di-reset dan dibuat ulang di proses child.
+    """
+    _client = None
+    _pid = None
+    _lock = threading.Lock()
+
     def __init__(self):
         self.dbName = Config.DATABASE
         self.URI = Config.MONGO_URI
@@ -11,21 +32,68 @@ class mongoConnection :
         self.db = None
         if self.client is None:
             self.connect()
-        
+
+    @classmethod
+    def getClient(cls):
+        pid = os.getpid()
+        if cls._client is None or cls._pid != pid:
+            with cls._lock:
+                if cls._client is None or cls._pid != pid:
+                    cls._client = MongoClient(
+                        Config.MONGO_URI,
+                        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+                        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+                        waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                        serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                        connect=False,
+                        event_listeners=mongoConnection.listeners(),
+                    )
+                    cls._pid = pid
+        return cls._client
+
+    @staticmethod
+    def listeners():
+        # durasi command per collection untuk /metrics, dan slow query log
+        listeners = []
+        if Config.METRICS_ENABLED:
+            listeners.append(commandMetrics)
+        if Config.SLOW_QUERY_MS > 0:
+            listeners.append(slowQueryListener)
+        return listeners
+
+    @classmethod
+    def reset(cls):
+        # dipanggil di child setelah fork: jangan close client parent, cukup dilupakan
+        cls._client = None
+        cls._pid = None
+        cls._lock = threading.Lock()
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            if cls._client is not None:
+                cls._client.close()
+            cls._client = None
+            cls._pid = None
+
     def connect(self):
         try:
-            self.client = MongoClient(self.URI)
-            self.client.admin.command("ping")
+            self.client = mongoConnection.getClient()
             self.db = self.client[self.dbName]
-            
+
         except PyMongoError as e:
-            print("Failed to connect with client", e)
-            logging.error(f"Failed to connect with client {e}")
-        except Exception as e:  
-            print("Something wrong", e)
-            logging.error(f"Something wrong {e}")
-            
-            
+            logger.error("Failed to connect with client %s", e)
+        except Exception as e:
+            logger.error("Something wrong %s", e)
+
+    def ping(self):
+        try:
+            self.client.admin.command("ping")
+            return True
+        except Exception as e:
+            logger.error("Failed to ping database %s", e)
+            return False
+
     def getColleciton(self, collection):
         try:
             if self.db is None:
@@ -33,6 +101,8 @@ class mongoConnection :
             collection = self.db[collection]
             return collection
         except Exception as e:
-            print("Failed to get Collection", e)
-            logging.error(f"Failed to get Collection {e}")
-        
\ No newline at end of file
+            logger.error("Failed to get Collection %s", e)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=mongoConnection.reset)
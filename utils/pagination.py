@@ -0,0 +1,84 @@
+"""
+Helper keyset (cursor) pagination.
+
+Data diurutkan descending berdasarkan (sortField, _id). Cursor menyimpan nilai
+(sortField, _id) dari dokumen terakhir di halaman sebelumnya, jadi halaman
+berikutnya cukup query `sortField < cursor` (atau sama tapi `_id` lebih kecil)
+dan MongoDB bisa langsung lompat lewat index, tanpa skip().
+
+Cursor dikirim ke client sebagai string base64 url-safe yang opaque.
+"""
+from datetime import datetime
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encodeCursor(value, id):
+    """Ubah (nilai sortField, _id) dokumen terakhir menjadi string cursor."""
+    if isinstance(value, datetime):
+        payload = {"t": "dt", "v": value.isoformat(), "id": id}
+    else:
+        payload = {"v": value, "id": id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decodeCursor(cursor):
+    """
+    Kebalikan encodeCursor.
+
+    Raises:
+        InvalidCursor: Jika cursor bukan hasil encodeCursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = payload["v"]
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+        return value, payload["id"]
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+
+
+def keysetFilter(query, sortField, after):
+    """
+    Gabungkan filter `query` dengan kondisi "sesudah cursor" (urutan descending).
+
+    Args:
+        query (dict): Filter dasar
+        sortField (str): Field urutan utama, misal "createdAt"
+        after (tuple|None): (nilai sortField, _id) dari decodeCursor
+
+    Returns:
+        dict: Filter MongoDB
+    """
+    if after is None:
+        return query
+    value, id = after
+    condition = {"$or": [
+        {sortField: {"$lt": value}},
+        {sortField: value, "_id": {"$lt": id}},
+    ]}
+    if not query:
+        return condition
+    return {"$and": [query, condition]}
+
+
+def parseLimit(limit, default, maximum):
+    """
+    Validasi parameter `limit` dari query string.
+
+    Raises:
+        ValueError: Jika limit bukan angka positif
+    """
+    if limit in (None, ""):
+        return default
+    limit = int(limit)
+    if limit < 1:
+        raise ValueError("limit must be a positive number")
+    return min(limit, maximum)
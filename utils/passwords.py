@@ -0,0 +1,149 @@
+"""
+Hash dan cek password bcrypt di luar thread yang melayani request.
+
+bcrypt sengaja mahal (ratusan ms CPU per hash di 12 rounds). Di gunicorn
+dengan worker eventlet, pemanggilan langsung membekukan semua green thread
+lain selama hash berjalan, jadi clock in ikut antri di belakang login.
+bcrypt melepas GIL saat menghitung hash, jadi cukup dijalankan di native
+thread:
+    - Di bawah eventlet (thread sudah di-monkey patch) lewat eventlet.tpool;
+      green thread pemanggil menunggu tanpa memblokir hub.
+    - Di luar eventlet (flask dev server, script, test) lewat
+      ThreadPoolExecutor biasa.
+Jumlah thread dibatasi Config.PASSWORD_HASH_WORKERS.
+
+Cost factor hash baru diatur lewat Config.BCRYPT_ROUNDS. Hash lama tetap
+bisa dicek (rounds tersimpan di hash-nya); needsRehash() menandai hash yang
+rounds-nya berbeda supaya bisa diganti saat login berhasil.
+
+Benchmark:
+    python -m utils.passwords
+"""
+from utils.config import Config
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import sys
+import threading
+
+executor = None
+tpoolReady = False
+lock = threading.Lock()
+
+
+def isGreen():
+    """True jika proses berjalan di bawah eventlet dengan thread di-monkey patch."""
+    if "eventlet" not in sys.modules:
+        return False
+    from eventlet import patcher
+    return patcher.is_monkey_patched("thread")
+
+
+def offload(fn, *args):
+    """Jalankan `fn(*args)` di native thread dan tunggu hasilnya."""
+    global executor, tpoolReady
+    if isGreen():
+        from eventlet import tpool
+        if not tpoolReady:
+            tpool.set_num_threads(Config.PASSWORD_HASH_WORKERS)
+            tpoolReady = True
+        return tpool.execute(fn, *args)
+    if executor is None:
+        with lock:
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return executor.submit(fn, *args).result()
+
+
+def hashPassword(password, rounds=None):
+    """
+    Hash password dengan bcrypt.
+
+    Args:
+        password (str): Password plain text
+        rounds (int, optional): Cost factor, default Config.BCRYPT_ROUNDS
+
+    Returns:
+        bytes: Hash bcrypt
+    """
+    salt = bcrypt.gensalt(rounds=rounds or Config.BCRYPT_ROUNDS)
+    return offload(bcrypt.hashpw, password.encode("utf-8"), salt)
+
+
+def checkPassword(password, hashed):
+    """
+    Cek password terhadap hash bcrypt yang tersimpan.
+
+    Returns:
+        bool: True jika password cocok
+    """
+    if isinstance(hashed, str):
+        hashed = hashed.encode("utf-8")
+    return offload(bcrypt.checkpw, password.encode("utf-8"), hashed)
+
+
+def needsRehash(hashed, rounds=None):
+    """True jika cost factor hash berbeda dari Config.BCRYPT_ROUNDS."""
+    if isinstance(hashed, str):
+        hashed = hashed.encode("utf-8")
+    try:
+        return int(hashed.split(b"$")[2]) != (rounds or Config.BCRYPT_ROUNDS)
+    except (IndexError, ValueError):
+        return False
+
+
+def benchmark(logins=40, concurrency=8, rounds=None):
+    """
+    Throughput login (checkPassword) di bawah eventlet: bcrypt langsung di
+    green thread vs lewat tpool.
+
+    Selain login per detik, sebuah green thread "heartbeat" tidur 10 ms
+    berulang kali; `max_stall_ms` adalah jeda terlama yang dialaminya, yaitu
+    berapa lama request lain (misal clock in) bisa tertahan.
+
+    Returns:
+        dict: {mode: {"logins_per_sec": float, "max_stall_ms": float}}
+    """
+    import eventlet
+    from eventlet import tpool
+    import time
+
+    rounds = rounds or Config.BCRYPT_ROUNDS
+    hashed = bcrypt.hashpw(b"benchmark-password", bcrypt.gensalt(rounds=rounds))
+    tpool.set_num_threads(Config.PASSWORD_HASH_WORKERS)
+    modes = {
+        "inline": lambda: bcrypt.checkpw(b"benchmark-password", hashed),
+        "offload": lambda: tpool.execute(bcrypt.checkpw, b"benchmark-password", hashed),
+    }
+    result = {}
+    for mode, check in modes.items():
+        stalls = []
+        running = [True]
+
+        def heartbeat():
+            last = time.perf_counter()
+            while running[0]:
+                eventlet.sleep(0.01)
+                now = time.perf_counter()
+                stalls.append(now - last - 0.01)
+                last = now
+
+        beat = eventlet.spawn(heartbeat)
+        pool = eventlet.GreenPool(concurrency)
+        start = time.perf_counter()
+        for _ in range(logins):
+            pool.spawn_n(check)
+        pool.waitall()
+        elapsed = time.perf_counter() - start
+        running[0] = False
+        beat.wait()
+        result[mode] = {
+            "logins_per_sec": round(logins / elapsed, 1),
+            "max_stall_ms": round(max(stalls, default=0) * 1000, 1),
+        }
+    return result
+
+
+if __name__ == "__main__":
+    print(f"bcrypt rounds={Config.BCRYPT_ROUNDS}, workers={Config.PASSWORD_HASH_WORKERS}")
+    for mode, stats in benchmark().items():
+        print(f"{mode:<8} {stats['logins_per_sec']:>8} logins/s   max stall {stats['max_stall_ms']:>8} ms")
@@ -0,0 +1,310 @@
+"""
+Slow query log: command MongoDB yang lebih lambat dari SLOW_QUERY_MS dicatat
+otomatis, tanpa profiler di server.
+
+Cara kerja:
+    - SlowQueryListener (pymongo CommandListener, dipasang di MongoClient
+      bersama oleh utils/mongoConnect.py) menyimpan referensi dokumen command
+      saat `started`, lalu saat `succeeded`/`failed` membandingkan durasinya
+      dengan threshold. Command cepat hanya membayar satu dict insert/pop.
+    - Untuk command lambat, listener mencatat method service asal (frame
+      pertama dari package `service`, kalau tidak ada `repo`) dan bentuk
+      filter dengan semua value diganti "?", lalu memasukkan catatan ke
+      antrian.
+    - Background thread menulis catatan ke file JSON lines yang di-rotate
+      (SLOW_QUERY_SINK=file) atau capped collection `slowQueries`
+      (SLOW_QUERY_SINK=collection). Untuk read (find / aggregate / count /
+      distinct) thread yang sama menjalankan explain("executionStats") dan
+      menyimpan winning plan-nya, jadi COLLSCAN langsung kelihatan.
+
+Keduanya opt-in: SLOW_QUERY_MS default 0 (listener tidak dipasang) dan
+explain hanya jalan dengan SLOW_QUERY_EXPLAIN=true, karena explain
+menjalankan ulang query lambat secara penuh di database yang sama.
+Plan untuk bentuk query yang sama di-cache SLOW_QUERY_EXPLAIN_TTL detik,
+supaya query lambat yang berulang tidak di-explain terus-menerus.
+
+Contoh catatan:
+    {"time": "2025-11-01T07:00:02+07:00", "collection": "attendances", "command": "find",
+     "durationMs": 412.5, "origin": "service.attendanceService:AttendanceService.getMonthlyShifts",
+     "filter": {"branchId": "?", "Date": {"$gte": "?", "$lt": "?"}},
+     "plan": {"stages": ["COLLSCAN"], "collscan": true, "docsExamined": 52210, ...}}
+"""
+from logging.handlers import RotatingFileHandler
+from pymongo import monitoring
+from utils.cache import TTLCache
+from utils.config import Config
+import atexit
+import json
+import logging
+import os
+import pendulum
+import queue
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# command yang dipantau -> field yang berisi filter
+FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+    "update": "updates",
+    "delete": "deletes",
+}
+EXPLAINABLE = {"find", "aggregate", "count", "distinct"}
+# field command yang ditambahkan driver dan tidak boleh ikut di explain
+DRIVER_FIELDS = {"$db", "lsid", "$clusterTime", "txnNumber", "$readPreference", "cursor", "apiVersion"}
+ORIGIN_PACKAGES = ("service.", "repo.")
+
+explainCache = TTLCache(maxsize=1000, ttl=Config.SLOW_QUERY_EXPLAIN_TTL)
+
+
+def redact(value):
+    """
+    Bentuk filter tanpa value: key dan operator dipertahankan, value jadi "?".
+
+    Example:
+        >>> redact({"branchId": "STR_001", "Date": {"$gte": d}, "status": {"$in": ["a", "b"]}})
+        {'branchId': '?', 'Date': {'$gte': '?'}, 'status': {'$in': ['?']}}
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = redact(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def filterShape(commandName, command):
+    """Bentuk filter (sudah di-redact) dari dokumen command."""
+    value = command.get(FILTER_FIELDS[commandName])
+    if commandName in ("update", "delete"):
+        value = [item.get("q") for item in value or []]
+    shape = redact(value if value is not None else {})
+    if commandName in ("update", "delete") and len(shape) == 1:
+        shape = shape[0]
+    return shape
+
+
+def findOrigin():
+    """Method service (atau repo) yang memicu command, dari call stack saat ini."""
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(ORIGIN_PACKAGES):
+            # co_qualname (Class.method) baru ada di Python 3.11
+            code = frame.f_code
+            origin = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            if module.startswith("service."):
+                return origin
+            fallback = fallback or origin
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+def explainPlan(explain):
+    """Ringkas hasil explain("executionStats") jadi stage winning plan + statistik."""
+    from utils.indexes import planStages
+    stats = explain.get("executionStats", {})
+    stages = planStages(explain)
+    if not stages and "stages" in explain:
+        # aggregate: plan ada di stage $cursor pertama
+        cursor = explain["stages"][0].get("$cursor", {})
+        stages = planStages(cursor)
+        stats = cursor.get("executionStats", stats)
+    return {
+        "stages": stages,
+        "collscan": "COLLSCAN" in stages,
+        "nReturned": stats.get("nReturned"),
+        "keysExamined": stats.get("totalKeysExamined"),
+        "docsExamined": stats.get("totalDocsExamined"),
+        "executionTimeMillis": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """CommandListener yang meneruskan command lambat ke SlowQueryLog."""
+
+    def __init__(self, log, thresholdMs=None):
+        self.log = log
+        self.thresholdMs = Config.SLOW_QUERY_MS if thresholdMs is None else thresholdMs
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(event):
+        return (event.request_id, event.operation_id, event.connection_id)
+
+    def started(self, event):
+        if event.command_name not in FILTER_FIELDS or self.log.isWorker():
+            return
+        with self.lock:
+            self.pending[self.key(event)] = event.command
+
+    def finish(self, event, failure=None):
+        with self.lock:
+            command = self.pending.pop(self.key(event), None)
+        if command is None:
+            return
+        durationMs = event.duration_micros / 1000
+        if durationMs < self.thresholdMs:
+            return
+        name = event.command_name
+        record = {
+            "time": pendulum.now("Asia/Jakarta").isoformat(),
+            "database": event.database_name,
+            "collection": command.get(name),
+            "command": name,
+            "durationMs": round(durationMs, 1),
+            "origin": findOrigin(),
+            "filter": filterShape(name, command),
+        }
+        if "sort" in command:
+            record["sort"] = dict(command["sort"])
+        if failure is not None:
+            record["failure"] = str(failure)
+        explain = None
+        if name in EXPLAINABLE and failure is None:
+            explain = {key: value for key, value in command.items() if key not in DRIVER_FIELDS}
+        self.log.put(record, explain)
+
+    def succeeded(self, event):
+        self.finish(event)
+
+    def failed(self, event):
+        failure = event.failure
+        if isinstance(failure, dict):
+            failure = failure.get("errmsg", failure)
+        self.finish(event, failure=failure)
+
+
+class SlowQueryLog:
+    """
+    Antrian + background thread yang menjalankan explain dan menulis catatan
+    query lambat. Antrian penuh -> catatan dibuang (tidak pernah menahan request).
+    """
+
+    def __init__(self, sink=None, path=None, explain=None, maxQueue=None, repo=None):
+        self.sink = sink or Config.SLOW_QUERY_SINK
+        self.path = path or Config.SLOW_QUERY_LOG_PATH
+        self.explain = Config.SLOW_QUERY_EXPLAIN if explain is None else explain
+        self.maxQueue = maxQueue or Config.SLOW_QUERY_QUEUE_SIZE
+        self.repo = repo
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.file = None
+        self.reset()
+
+    def reset(self):
+        self.queue = queue.Queue(maxsize=self.maxQueue)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.pid = os.getpid()
+        self.recorded = 0
+        self.dropped = 0
+
+    def getRepo(self):
+        if self.repo is None:
+            from repo.slowQueryRepo import SlowQueryRepo
+            self.repo = SlowQueryRepo()
+        return self.repo
+
+    def isWorker(self):
+        """True di thread worker, supaya explain/insert miliknya tidak ikut dicatat."""
+        return getattr(self.local, "worker", False)
+
+    def start(self):
+        if self.pid != os.getpid():
+            self.reset()
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self.run, name="slow-query-log", daemon=True)
+                self.thread.start()
+
+    def put(self, record, explain=None):
+        self.start()
+        try:
+            self.queue.put_nowait((record, explain))
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        self.local.worker = True
+        while not self.stopped.is_set():
+            try:
+                record, explain = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            self.process(record, explain)
+
+    def process(self, record, explain=None):
+        if explain is not None and self.explain:
+            record["plan"] = self.planFor(record, explain)
+        try:
+            self.write(record)
+            self.recorded += 1
+        except Exception as e:
+            logger.error("Failed to write slow query record: %s", e)
+
+    def planFor(self, record, command):
+        key = json.dumps([record["collection"], record["command"], record["filter"], record.get("sort")], sort_keys=True, default=str)
+        plan = explainCache.get(key)
+        if plan is None:
+            try:
+                plan = explainPlan(self.getRepo().explainCommand(command))
+            except Exception as e:
+                plan = {"error": str(e)}
+            explainCache.set(key, plan)
+        return plan
+
+    def write(self, record):
+        if self.sink == "collection":
+            self.getRepo().insertData(record)
+            return
+        if self.file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = RotatingFileHandler(
+                self.path, maxBytes=Config.SLOW_QUERY_LOG_MAX_BYTES, backupCount=Config.SLOW_QUERY_LOG_BACKUPS
+            )
+            self.file.setFormatter(logging.Formatter("%(message)s"))
+        self.file.handle(logging.makeLogRecord({"msg": json.dumps(record, default=str), "levelno": logging.WARNING}))
+
+    def flush(self):
+        """Proses semua catatan yang masih di antrian (synchronous)."""
+        self.local.worker = True
+        try:
+            while True:
+                try:
+                    record, explain = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.process(record, explain)
+        finally:
+            self.local.worker = False
+
+    def close(self, timeout=5):
+        self.stopped.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout)
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+slowQueryLog = SlowQueryLog()
+slowQueryListener = SlowQueryListener(slowQueryLog)
+atexit.register(slowQueryLog.close)
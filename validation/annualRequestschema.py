@@ -89,6 +89,10 @@ class AnnualRequestSchema(Schema):
             - Required, ID cabang tempat karyawan bekerja
             - Untuk filtering dan approval routing
             
+        requesterRole (str):
+            - Optional, role karyawan saat mengajukan ("employee" / "manager")
+            - Disimpan supaya antrian approval bisa difilter langsung di query
+            
         type (str):
             - Required, tipe permohonan
             - Values: "sick" (sakit), "annual" (cuti tahunan), "permission" (izin)
@@ -231,6 +235,7 @@ class AnnualRequestSchema(Schema):
     _id = fields.Str(required=True)
     employeeId = fields.Str(required=True, load_only=False)
     branchId = fields.Str(required=True, load_only=False)
+    requesterRole = fields.Str(required=False, validate=validate.OneOf(["employee", "manager", "owner"]))
     type = fields.Str(required=True, validate=validate.OneOf(["sick", "annual", "permission" ]))
     startDate = fields.DateTime(required=True)
     endDate = fields.DateTime(required=True)
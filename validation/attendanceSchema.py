@@ -1,6 +1,12 @@
-from marshmallow import Schema, fields, validate, pre_load
+from marshmallow import Schema, fields, validate, pre_load, validates_schema, ValidationError
 import pendulum
 from validation.storeSchema import GeometrySchema
+from utils.config import Config
+
+# penanda hari libur di pola rotasi ShiftPlanSchema
+REST_DAY = "off"
+# shift entry manager di dokumen shift; bukan jadwal kehadiran, tidak ikut dihitung di summary
+MANAGER_SHIFT = "fullday"
     
 
 class EmployeeAttendanceSchema(Schema): #FIX
@@ -254,4 +260,51 @@ class shiftSchema(Schema):
     _id = fields.Str(required=True)
     shiftName = fields.Str(required=True)
     clockIn = fields.DateTime(format="%H:%M",required=False)
-    clockOut = fields.DateTime(format="%H:%M",required=False)
\ No newline at end of file
+    clockOut = fields.DateTime(format="%H:%M",required=False)
+
+class RotationSchema(Schema):
+    employeeId = fields.Str(required=True)
+    pattern = fields.List(fields.Str(), required=True, validate=validate.Length(min=1, max=31))
+
+
+class ShiftPlanSchema(Schema):
+    """
+    Schema untuk perencanaan shift banyak hari sekaligus (bulk planner).
+    
+    Validasi Fields:
+        startDate (date):
+            - Required, hari pertama rencana (YYYY-MM-DD)
+            
+        endDate (date):
+            - Required, hari terakhir rencana (inklusif)
+            - Maksimal Config.SHIFT_PLAN_MAX_DAYS hari dari startDate
+            
+        rotation (list):
+            - Pola shift berulang per karyawan, dihitung mulai startDate
+            - Contoh: {"employeeId": "EMP001", "pattern": ["Day", "Day", "Night", "off"]}
+            - "off" berarti karyawan tidak dijadwalkan hari itu
+            
+        roster (dict):
+            - Jadwal eksplisit per tanggal: {"YYYY-MM-DD": [EmployeeAttendanceSchema]}
+            - Tanggal harus berada di dalam rentang startDate - endDate
+    
+    Notes:
+        - Isi salah satu: rotation atau roster
+        - Nama shift divalidasi di service terhadap master shift
+    """
+    startDate = fields.Date(required=True)
+    endDate = fields.Date(required=True)
+    rotation = fields.List(fields.Nested(RotationSchema), validate=validate.Length(min=1))
+    roster = fields.Dict(keys=fields.Date(), values=fields.List(fields.Nested(EmployeeAttendanceSchema)))
+
+    @validates_schema
+    def validatePlan(self, data, **kwargs):
+        if ("rotation" in data) == ("roster" in data):
+            raise ValidationError("Provide either rotation or roster", "rotation")
+        if data["endDate"] < data["startDate"]:
+            raise ValidationError("endDate must not be before startDate", "endDate")
+        if (data["endDate"] - data["startDate"]).days >= Config.SHIFT_PLAN_MAX_DAYS:
+            raise ValidationError(f"A plan can cover at most {Config.SHIFT_PLAN_MAX_DAYS} days", "endDate")
+        for day in data.get("roster", {}):
+            if not data["startDate"] <= day <= data["endDate"]:
+                raise ValidationError(f"{day} is outside the plan range", "roster")
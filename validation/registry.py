@@ -0,0 +1,133 @@
+"""
+Registry instance schema marshmallow yang dipakai bersama (satu per proses).
+
+Membuat instance Schema tidak gratis: marshmallow menyalin semua field dan
+menyiapkan hook setiap kali `Schema()` dipanggil. Instance di module ini
+dibuat sekali saat import lalu dipakai ulang. Schema tanpa state (tidak ada
+`context`, field tidak diubah setelah dibuat) aman dipakai bersama antar
+thread untuk load() maupun dump().
+
+Untuk jalur baca (response API dari dokumen database yang memang ditulis
+lewat schema), FastDumper melewati mesin per-field marshmallow: daftar
+field yang di-dump dihitung sekali, lalu dump cukup menyalin value,
+mengubah datetime ke ISO string dan men-dump nested schema secara rekursif.
+Hasilnya sama dengan schema.dump() untuk dokumen seperti itu; field bertipe
+lain (Method, Function, dll) tetap diserialisasi oleh field marshmallow.
+
+Usage:
+    from validation.registry import employeeSchema, employeeDumper
+
+    data = employeeSchema.load(payload)        # validasi input
+    response = employeeDumper.dumpMany(docs)   # dokumen dari database
+
+Benchmark:
+    python -m validation.registry
+"""
+from marshmallow import fields
+from validation.annualRequestschema import AnnualRequestSchema, reviewerSchema
+from validation.attendanceSchema import ShiftListSchema
+from validation.employeeSchema import EmployeeSchema, LoginSchema
+from validation.historySchema import HistorySchema
+from validation.storeSchema import GeometrySchema
+from datetime import date, datetime
+
+# field yang nilainya dari database bisa langsung disalin
+PASSTHROUGH = (fields.String, fields.Integer, fields.Float, fields.Boolean, fields.Raw)
+
+COPY, ISO, NESTED, NESTED_LIST, FIELD = range(5)
+
+
+class FastDumper:
+    """Dump dokumen database tepercaya tanpa mesin per-field marshmallow."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.plan = [self.compile(name, field) for name, field in schema.dump_fields.items()]
+
+    def compile(self, name, field):
+        key = field.data_key or name
+        attribute = field.attribute or name
+        if isinstance(field, fields.Nested):
+            return (NESTED_LIST if field.many else NESTED, attribute, key, FastDumper(field.schema))
+        if isinstance(field, fields.List) and isinstance(field.inner, fields.Nested):
+            return (NESTED_LIST, attribute, key, FastDumper(field.inner.schema))
+        if isinstance(field, (fields.DateTime, fields.Date)) and field.format in (None, "iso"):
+            return (ISO, attribute, key, None)
+        if isinstance(field, PASSTHROUGH) or (isinstance(field, fields.List) and isinstance(field.inner, PASSTHROUGH)):
+            return (COPY, attribute, key, None)
+        return (FIELD, attribute, key, field)
+
+    def dump(self, obj):
+        result = {}
+        for kind, attribute, key, extra in self.plan:
+            if attribute not in obj:
+                continue
+            value = obj[attribute]
+            if kind == COPY or value is None:
+                result[key] = value
+            elif kind == ISO:
+                result[key] = value.isoformat() if isinstance(value, (date, datetime)) else value
+            elif kind == NESTED:
+                result[key] = extra.dump(value)
+            elif kind == NESTED_LIST:
+                result[key] = [extra.dump(item) for item in value]
+            else:
+                result[key] = extra.serialize(attribute, obj)
+        return result
+
+    def dumpMany(self, objs):
+        return [self.dump(obj) for obj in objs]
+
+
+employeeSchema = EmployeeSchema()
+loginSchema = LoginSchema()
+historySchema = HistorySchema()
+geometrySchema = GeometrySchema()
+annualRequestSchema = AnnualRequestSchema()
+reviewSchema = reviewerSchema()
+shiftListSchema = ShiftListSchema()
+
+employeeDumper = FastDumper(employeeSchema)
+annualRequestDumper = FastDumper(annualRequestSchema)
+shiftListDumper = FastDumper(shiftListSchema)
+
+
+def benchmark(count=10000, repeat=3):
+    """
+    Bandingkan Schema().dump per dokumen (cara lama), dump dengan instance
+    bersama, dan FastDumper untuk `count` dokumen employee dan shift.
+
+    Returns:
+        dict: {nama: detik terbaik dari `repeat` kali}
+    """
+    import pendulum
+    import timeit
+
+    now = pendulum.now("Asia/Jakarta")
+    employees = [{
+        "_id": f"EMP_{i:05d}", "name": "John Doe", "email": "john@aventra.com", "role": "employee",
+        "salaryPerDay": 150000.0, "annualLeaveBalance": 12, "workDays": 20, "lateDays": 1,
+        "branchId": "STR_001", "status": "active", "createdAt": now,
+    } for i in range(count)]
+    shifts = [{
+        "_id": f"SHF_{i:05d}", "Date": datetime(2025, 11, 1), "branchId": "STR_001", "createdAt": now,
+        "employees": [
+            {"employeeId": "EMP_001", "shift": "Day", "clockIn": "07:05:00", "clockOut": "15:01:00", "status": "present"},
+            {"employeeId": "EMP_002", "shift": "Night", "clockIn": None, "clockOut": None, "status": "absent"},
+        ],
+    } for i in range(count)]
+
+    cases = {
+        "employee: Schema() per document": lambda: [EmployeeSchema().dump(doc) for doc in employees],
+        "employee: shared schema": lambda: employeeSchema.dump(employees, many=True),
+        "employee: FastDumper": lambda: employeeDumper.dumpMany(employees),
+        "shift: Schema() per document": lambda: [ShiftListSchema().dump(doc) for doc in shifts],
+        "shift: shared schema": lambda: shiftListSchema.dump(shifts, many=True),
+        "shift: FastDumper": lambda: shiftListDumper.dumpMany(shifts),
+    }
+    return {name: min(timeit.repeat(case, number=1, repeat=repeat)) for name, case in cases.items()}
+
+
+if __name__ == "__main__":
+    for name, seconds in benchmark().items():
+        print(f"{name:<36} {seconds * 1000:8.1f} ms")
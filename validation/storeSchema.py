@@ -76,6 +76,11 @@ class StoreSchema(Schema):
             - Object nested menggunakan GeometrySchema
             - Menyimpan koordinat lokasi toko
             
+        checkInRadius (float):
+            - Optional
+            - Radius clock in/out dari titik toko dalam meter (1 - 1000)
+            - Jika kosong dipakai Config.CHECKIN_RADIUS (default 50)
+            
         createdAt (str):
             - Optional (Auto-generated)
             - Timestamp pembuatan data
@@ -142,6 +147,7 @@ class StoreSchema(Schema):
         GeometrySchema,
         required=True,
     )
+    checkInRadius = fields.Float(validate=validate.Range(min=1, max=1000))
     createdAt = fields.Str(dump_only=True)
 
 class createStoreSchema(StoreSchema):